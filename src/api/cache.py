@@ -0,0 +1,152 @@
+"""
+Route-level response caching in Redis.
+
+Usage:
+@router.get("/templates/{template_id}", response_model=TemplateSchema)
+@cache_response(
+    expiration_seconds=60,
+    response_model=TemplateSchema,
+    tags=lambda request: ["templates", f"template:{request.path_params['template_id']}"],
+)
+async def get_template(template_id: int, template_service: TemplateService = Depends()) -> Template:
+    ...
+
+Write paths purge dependent entries with `ResponseCacheRedisRepository.invalidate_tags("template:1")`.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import typing
+
+from fastapi import Depends
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core.compression import etag_matches
+from core.constants import RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS
+from core.security import read_access_token
+from db.repositories.response_cache import ResponseCacheRedisRepository
+from schemas.response_cache import CachedResponseSchema
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+def _digest(value: str | bytes) -> str:
+    if isinstance(value, str):
+        value = value.encode()
+
+    return hashlib.blake2b(value, digest_size=16).hexdigest()
+
+
+def get_request_principal(request: Request) -> str:
+    """User of a valid access token, "anonymous" for requests without one.
+
+    Invalid tokens count as anonymous: keying on raw credentials would give every junk token its own entry.
+    """
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    user_id = read_access_token(token) if scheme.lower() == "bearer" and token else None
+    return f"user:{user_id}" if user_id is not None else "anonymous"
+
+
+Tags: typing.TypeAlias = typing.Iterable[str] | typing.Callable[[Request], typing.Iterable[str]]
+
+
+def _make_serializer(response_model: typing.Any) -> typing.Callable[[typing.Any], bytes]:
+    if response_model is None:
+        return lambda result: json.dumps(jsonable_encoder(result)).encode()
+
+    adapter = TypeAdapter(response_model)
+    return lambda result: adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+
+def _resolve_tags(tags: Tags, request: Request) -> typing.Iterable[str]:
+    return tags(request) if callable(tags) else tags
+
+
+def _to_response(request: Request, cached: CachedResponseSchema) -> Response:
+    headers = {"ETag": cached.etag}
+    if etag_matches(request.headers.get("If-None-Match", ""), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=cached.body,
+        status_code=cached.status_code,
+        media_type=cached.media_type,
+        headers=headers,
+    )
+
+
+def _with_cache_parameters(signature: inspect.Signature) -> inspect.Signature:
+    """Let FastAPI inject the request and the repository into the wrapper besides the endpoint parameters."""
+
+    parameters = [
+        parameter for parameter in signature.parameters.values() if parameter.kind is not inspect.Parameter.VAR_KEYWORD
+    ]
+    parameters += [
+        inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        inspect.Parameter(
+            "_cache_repository",
+            inspect.Parameter.KEYWORD_ONLY,
+            annotation=ResponseCacheRedisRepository,
+            default=Depends(),
+        ),
+    ]
+    return signature.replace(parameters=parameters)
+
+
+def cache_response(
+    expiration_seconds: int,
+    response_model: typing.Any = None,
+    tags: Tags = (),
+    principal: typing.Callable[[Request], str] = get_request_principal,
+    lock_timeout_seconds: float = RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS,
+) -> typing.Callable[[typing.Callable[..., typing.Any]], typing.Callable[..., typing.Any]]:
+    """Cache the serialized route response, apply it below the router decorator.
+
+    `response_model` should repeat the route one: the cached body is serialized here, so FastAPI
+    does not filter it again.
+    """
+
+    serialize = _make_serializer(response_model)
+
+    def decorator(endpoint: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Any]:
+        @functools.wraps(endpoint)
+        async def wrapper(
+            *args: typing.Any,
+            _cache_request: Request,
+            _cache_repository: ResponseCacheRedisRepository,
+            **kwargs: typing.Any,
+        ) -> typing.Any:
+            request = _cache_request
+            if request.method not in CACHEABLE_METHODS:
+                return await endpoint(*args, **kwargs)
+
+            async def render() -> CachedResponseSchema:
+                body = serialize(await endpoint(*args, **kwargs))
+                return CachedResponseSchema(body=body.decode(), etag=f'"{_digest(body)}"')
+
+            key = _cache_repository.get_key(
+                request.url.path,
+                _digest(str(sorted(request.query_params.multi_items()))),
+                principal(request),
+            )
+            cached = await _cache_repository.get_or_set(
+                key,
+                render,
+                expiration_seconds=expiration_seconds,
+                tags=_resolve_tags(tags, request),
+                lock_timeout_seconds=lock_timeout_seconds,
+            )
+
+            return _to_response(request, cached)
+
+        wrapper.__signature__ = _with_cache_parameters(inspect.signature(endpoint))  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
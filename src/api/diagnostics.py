@@ -0,0 +1,18 @@
+import asyncio
+
+from fastapi import APIRouter, Query
+from starlette.responses import PlainTextResponse
+
+from core.constants import PROFILER_MAX_SECONDS
+from core.diagnostics import sample_stacks
+from middlewares.rate_limit import concurrency_limit
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/profile", response_class=PlainTextResponse, include_in_schema=False)
+@concurrency_limit(max_requests=1)
+async def get_profile(seconds: float = Query(default=10, gt=0, le=PROFILER_MAX_SECONDS)) -> str:
+    """Stacks of this worker sampled for `seconds`, in the collapsed format of flame graph tools."""
+
+    return await asyncio.to_thread(sample_stacks, seconds)
@@ -0,0 +1,89 @@
+"""
+Streaming exports of large result sets.
+
+Route example:
+@router.get("/export", response_class=StreamingResponse)
+@compression(min_size_bytes=0, encodings=(ContentEncodingEnum.GZIP,))
+async def export_reviews(
+    quarter_id: int,
+    export_format: ExportFormatEnum = ExportFormatEnum.NDJSON,
+    review_repository: ReviewRepository = Depends(),
+) -> StreamingResponse:
+    instances = review_repository.stream(Review.quarter_id == quarter_id, order_by=(Review.id,))
+    return export_response(instances, ReviewSchema, export_format, filename=f"reviews-{quarter_id}")
+
+Compression is negotiated by `CompressionMiddleware`, which compresses the stream chunk by chunk.
+The session dependency is closed after the response is sent, so the server-side cursor
+of `stream()` stays open while the body is being streamed.
+"""
+
+import csv
+import io
+import typing
+
+from starlette.responses import StreamingResponse
+
+from core.constants import EXPORT_CHUNK_SIZE
+from core.enums import ExportFormatEnum
+from schemas.base import BaseOrmSchema
+
+MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv",
+}
+
+
+async def iter_ndjson(
+    instances: typing.AsyncIterable[typing.Any],
+    schema: typing.Type[BaseOrmSchema],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> typing.AsyncIterator[bytes]:
+    chunk: list[bytes] = []
+
+    async for instance in instances:
+        chunk.append(schema.model_validate(instance).model_dump_json().encode())
+
+        if len(chunk) >= chunk_size:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+async def iter_csv(
+    instances: typing.AsyncIterable[typing.Any],
+    schema: typing.Type[BaseOrmSchema],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> typing.AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(schema.model_fields)
+    rows = 0
+
+    async for instance in instances:
+        writer.writerow(schema.model_validate(instance).model_dump(mode="json").values())
+        rows += 1
+
+        if rows % chunk_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    instances: typing.AsyncIterable[typing.Any],
+    schema: typing.Type[BaseOrmSchema],
+    export_format: ExportFormatEnum = ExportFormatEnum.NDJSON,
+    filename: str = "export",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> StreamingResponse:
+    """Serialize `instances` chunk by chunk, so memory does not grow with the number of rows."""
+
+    iter_rows = iter_csv if export_format == ExportFormatEnum.CSV else iter_ndjson
+    content = iter_rows(instances, schema, chunk_size)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    return StreamingResponse(content, media_type=MEDIA_TYPES[export_format], headers=headers)
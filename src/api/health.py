@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
+
+from middlewares.rate_limit import rate_limit_exempt
+from schemas.health import ReadinessSchema
+from services.health import HealthService
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+@rate_limit_exempt
+async def get_liveness() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.get("/ready", responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessSchema}})
+@rate_limit_exempt
+async def get_readiness(
+    request: Request, response: Response, health_service: HealthService = Depends()
+) -> ReadinessSchema:
+    readiness = await health_service.check_readiness(request.app.state.in_flight_requests.accepting)
+    if not readiness.is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return readiness
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from starlette.responses import PlainTextResponse
+
+from middlewares.rate_limit import rate_limit_exempt
+from services.metrics import MetricsService
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+@rate_limit_exempt
+async def get_metrics(metrics_service: MetricsService = Depends()) -> str:
+    return await metrics_service.render()
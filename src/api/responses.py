@@ -0,0 +1,34 @@
+import json
+import typing
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+# Tokens pydantic-core may write for non-finite floats, depending on its version.
+NON_FINITE_TOKENS = (b"NaN", b"Infinity")
+
+
+def _reject_constant(constant: str) -> typing.NoReturn:
+    raise ValueError(f"Out of range float values are not JSON compliant: {constant}")
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core straight to bytes.
+
+    Accepts JSON-compatible data as well as pydantic models, datetimes, enums and UUIDs,
+    which are encoded the same way as `BaseOrmSchema.model_dump_json()` does.
+    As the app default it only renders: FastAPI still validates and serializes the return value of routes
+    with a response model, and runs `jsonable_encoder` for routes without one. Returning
+    `PydanticJSONResponse(models)` from a route skips both passes.
+
+    Like `JSONResponse`, it never sends NaN or Infinity, which are not JSON: the pinned pydantic-core writes
+    non-finite floats as null, and if a version writes them as constants rendering raises ValueError.
+    """
+
+    def render(self, content: typing.Any) -> bytes:
+        body = to_json(content)
+        # Only bodies containing the tokens, usually inside strings, pay for parsing.
+        if any(token in body for token in NON_FINITE_TOKENS):
+            json.loads(body, parse_constant=_reject_constant)
+
+        return body
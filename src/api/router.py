@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
+from api.v1.analytics import router as analytics_router
 from api.v1.auth import router as auth_router
+from api.v1.jobs import router as jobs_router
 from api.v1.quarter import router as quarter_router
 from api.v1.review import router as review_router
 from api.v1.reviewers import router as reviewer_router
@@ -14,6 +16,8 @@ v1_router.include_router(review_router)
 v1_router.include_router(template_router)
 v1_router.include_router(reviewer_router)
 v1_router.include_router(quarter_router)
+v1_router.include_router(jobs_router)
+v1_router.include_router(analytics_router)
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(v1_router)
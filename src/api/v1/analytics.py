@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from schemas.analytics import ReviewSummarySchema
+from services.analytics import AnalyticsService
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/quarters/{quarter_id}/reviews")
+async def get_review_summary(
+    quarter_id: int,
+    department_id: int | None = None,
+    template_id: int | None = None,
+    analytics_service: AnalyticsService = Depends(),
+) -> ReviewSummarySchema:
+    return await analytics_service.get_summary(quarter_id, department_id, template_id)
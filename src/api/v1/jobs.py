@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from schemas.jobs import JobSchema
+from services.jobs import JobService
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, job_service: JobService = Depends()) -> JobSchema:
+    return await job_service.get(job_id)
@@ -0,0 +1,6 @@
+"""
+Directory for performance benchmarks.
+
+Each benchmark - separate module runnable from `src/`:
+python -m benchmarks.redis_repository
+"""
@@ -0,0 +1,165 @@
+"""Compare dashboard reads from incrementally maintained summaries with GROUP BYs over answers on the local Postgres."""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import typing
+
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    String,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from db.repositories.summary import SummaryRepository
+from db.session import get_engine
+
+QUARTERS, DEPARTMENTS, TEMPLATES, QUESTIONS = 8, 50, 5, 20
+
+
+class BenchmarkBase(DeclarativeBase):
+    pass
+
+
+class BenchmarkAnswer(BenchmarkBase):
+    __tablename__ = "benchmark_answers"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    quarter_id: Mapped[int] = mapped_column(Integer)
+    department_id: Mapped[int] = mapped_column(Integer)
+    template_id: Mapped[int] = mapped_column(Integer)
+    question_id: Mapped[int] = mapped_column(Integer)
+
+
+class BenchmarkSummary(BenchmarkBase):
+    __tablename__ = "benchmark_summaries"
+
+    quarter_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    department_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    template_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    metric: Mapped[str] = mapped_column(String(length=255), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger)
+
+
+class BenchmarkSummaryRepository(SummaryRepository[BenchmarkSummary]):
+    model = BenchmarkSummary
+
+
+def answers_by_question() -> typing.Any:
+    dimensions = (BenchmarkAnswer.quarter_id, BenchmarkAnswer.department_id, BenchmarkAnswer.template_id)
+    metric = literal("answers_by_question:") + cast(BenchmarkAnswer.question_id, String)
+    return select(*dimensions, metric, func.count()).group_by(*dimensions, BenchmarkAnswer.question_id)
+
+
+def random_dimensions(*names: str) -> dict[str, int]:
+    sizes = {"quarter_id": QUARTERS, "department_id": DEPARTMENTS, "template_id": TEMPLATES}
+    return {name: random.randrange(sizes[name]) for name in names}
+
+
+async def measure(name: str, rows: int, reads: int, call: typing.Callable[[], typing.Awaitable[typing.Any]]) -> None:
+    timings = []
+    for _ in range(reads):
+        started_at = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    print(f"{name:<36}{rows:>10}{statistics.median(timings):>12.2f}{max(timings):>12.2f}")
+
+
+async def fill(session: AsyncSession, rows: int) -> None:
+    await session.execute(
+        text(
+            "INSERT INTO benchmark_answers (quarter_id, department_id, template_id, question_id) "
+            "SELECT i % :quarters, i / :quarters % :departments, i % :templates, i % :questions "
+            "FROM generate_series(1, :rows) AS i"
+        ),
+        {
+            "quarters": QUARTERS,
+            "departments": DEPARTMENTS,
+            "templates": TEMPLATES,
+            "questions": QUESTIONS,
+            "rows": rows,
+        },
+    )
+    await session.execute(text("CREATE INDEX ON benchmark_answers (quarter_id, department_id)"))
+    await session.commit()
+    await session.execute(text("ANALYZE benchmark_answers"))
+
+
+async def measure_dashboards(
+    session: AsyncSession, repository: BenchmarkSummaryRepository, rows: int, reads: int
+) -> None:
+    for name, dimension_names in (("quarter", ("quarter_id",)), ("department", ("quarter_id", "department_id"))):
+
+        async def aggregate(names: tuple[str, ...] = dimension_names) -> None:
+            query = select(BenchmarkAnswer.question_id, func.count()).filter_by(**random_dimensions(*names))
+            await session.execute(query.group_by(BenchmarkAnswer.question_id))
+
+        async def read_summary(names: tuple[str, ...] = dimension_names) -> None:
+            await repository.get(**random_dimensions(*names))
+
+        await measure(f"{name} dashboard, GROUP BY", rows, reads, aggregate)
+        await measure(f"{name} dashboard, summary", rows, reads, read_summary)
+
+
+async def measure_writes(session: AsyncSession, repository: BenchmarkSummaryRepository, rows: int, reads: int) -> None:
+    async def write_answer(increment: bool) -> None:
+        dimensions = random_dimensions("quarter_id", "department_id", "template_id")
+        question_id = random.randrange(QUESTIONS)
+        await session.execute(insert(BenchmarkAnswer).values(**dimensions, question_id=question_id))
+        if increment:
+            await repository.increment(dimensions, {f"answers_by_question:{question_id}": 1})
+
+        await session.commit()
+
+    await measure("answer write", rows, reads, lambda: write_answer(increment=False))
+    await measure("answer write + summary increment", rows, reads, lambda: write_answer(increment=True))
+
+
+async def run(rows: int, reads: int) -> None:
+    engine = get_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(BenchmarkBase.metadata.drop_all)
+        await connection.run_sync(BenchmarkBase.metadata.create_all)
+
+    print(f"{'operation':<36}{'answers':>10}{'p50, ms':>12}{'max, ms':>12}")
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repository = BenchmarkSummaryRepository(session=session)
+            await fill(session, rows)
+
+            started_at = time.perf_counter()
+            await repository.rebuild([answers_by_question()])
+            await session.commit()
+            print(f"{'full rebuild':<36}{rows:>10}{(time.perf_counter() - started_at) * 1000:>12.2f}")
+
+            await measure_dashboards(session, repository, rows, reads)
+            await measure_writes(session, repository, rows, reads)
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(BenchmarkBase.metadata.drop_all)
+
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.reads))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare latency of the first requests after startup with and without connection warm-up."""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.redis import (
+    AsyncRedis,
+    close_redis,
+    get_redis,
+    get_redis_connection,
+    warm_up_redis,
+)
+from db.session import dispose_engines, get_engine, get_session, warm_up_engine
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/probe")
+    async def probe(session: AsyncSession = Depends(get_session), redis: AsyncRedis = Depends(get_redis)) -> None:
+        await session.execute(text("SELECT 1"))
+        await redis.get("benchmark:probe")
+
+    return app
+
+
+async def burst(client: AsyncClient, concurrency: int) -> list[float]:
+    async def timed_request() -> float:
+        started_at = time.perf_counter()
+        await client.get("/probe")
+        return (time.perf_counter() - started_at) * 1000
+
+    return await asyncio.gather(*(timed_request() for _ in range(concurrency)))
+
+
+async def run(concurrency: int, bursts: int) -> None:
+    print(f"{'startup':<12}{'first burst p50/max, ms':>26}{'steady p50/p99, ms':>24}")
+    for warm_up in (False, True):
+        await dispose_engines()
+        await close_redis()
+
+        if warm_up:
+            await warm_up_engine(get_engine(settings().postgres_dsn), concurrency)
+            await warm_up_redis(get_redis_connection(), concurrency)
+
+        async with AsyncClient(app=make_app(), base_url="http://benchmark") as client:
+            first = await burst(client, concurrency)
+            steady = [timing for _ in range(bursts) for timing in await burst(client, concurrency)]
+
+        first_p99 = max(first)
+        steady_p99 = statistics.quantiles(steady, n=100)[98]
+        print(
+            f"{'warm-up' if warm_up else 'cold':<12}"
+            f"{statistics.median(first):>16.1f} / {first_p99:>7.1f}"
+            f"{statistics.median(steady):>14.1f} / {steady_p99:>7.1f}"
+        )
+
+    await dispose_engines()
+    await close_redis()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=settings().POSTGRES_POOL_SIZE)
+    parser.add_argument("--bursts", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency, args.bursts))
+
+
+if __name__ == "__main__":
+    main()
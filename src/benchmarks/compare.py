@@ -0,0 +1,50 @@
+"""Compare benchmark results with a baseline, exit with 1 on drift past thresholds or missing benchmarks."""
+
+import argparse
+import sys
+
+from benchmarks.results import find_drifts, read_results
+
+
+def compare(
+    baseline_path: str, current_path: str, threshold: float, tail_threshold: float, allow_missing: bool = False
+) -> bool:
+    baseline, current = read_results(baseline_path), read_results(current_path)
+
+    print(f"{'benchmark':<44}{'field':>12}{'baseline':>12}{'current':>12}{'change':>10}")
+    regressed = False
+    for name, result in current.items():
+        if name not in baseline:
+            print(f"{name:<44}{'new':>12}")
+            continue
+
+        for drift in find_drifts(baseline[name], result, threshold, tail_threshold):
+            print(f"{name:<44}{drift.field:>12}{drift.baseline:>12.3f}{drift.current:>12.3f}{drift.change:>+10.1%}")
+            regressed = True
+
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f"{name:<44}{'missing':>12}")
+        # A benchmark that stopped running or crashed must not pass the gate silently.
+        regressed = regressed or not allow_missing
+
+    print("Regressed" if regressed else "No regressions")
+    return not regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 and throughput change, 0.2 is 20%%")
+    parser.add_argument("--tail-threshold", type=float, default=0.5, help="Allowed p99 change, tails are noisier")
+    parser.add_argument(
+        "--allow-missing", action="store_true", help="Pass when baseline benchmarks are missing from the current run"
+    )
+    args = parser.parse_args()
+
+    if not compare(args.baseline, args.current, args.threshold, args.tail_threshold, args.allow_missing):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
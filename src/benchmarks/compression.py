@@ -0,0 +1,58 @@
+"""Report bytes on the wire and CPU per response for each available encoding and level on a large JSON list."""
+
+import argparse
+import time
+import typing
+
+from pydantic import TypeAdapter
+
+from benchmarks.serialization import BenchmarkItemSchema, make_items
+from core.compression import COMPRESSORS, compress, make_etag
+from core.enums import ContentEncodingEnum
+
+LEVELS = {
+    ContentEncodingEnum.GZIP: (1, 3, 5, 6, 9),
+    ContentEncodingEnum.BROTLI: (0, 2, 4, 5, 7, 11),
+    ContentEncodingEnum.ZSTD: (1, 3, 6, 9, 19),
+}
+
+
+def measure_cpu_ms(call: typing.Callable[[], typing.Any], repeats: int) -> float:
+    """CPU time per call, never 0 so that throughput stays finite for tiny bodies."""
+
+    started_at = time.process_time()
+    for _ in range(repeats):
+        call()
+
+    return max((time.process_time() - started_at) / repeats * 1000, 0.001)
+
+
+def run(sizes: list[int], repeats: int) -> None:
+    print(f"{'encoding':<10}{'level':>6}{'items':>8}{'bytes':>12}{'ratio':>8}{'CPU, ms':>10}{'MB/s':>10}")
+    for size in sizes:
+        body = TypeAdapter(list[BenchmarkItemSchema]).dump_json(make_items(size))
+        cpu_ms = measure_cpu_ms(lambda: make_etag(body), repeats)
+        print(f"{'identity':<10}{'-':>6}{size:>8}{len(body):>12}{1:>8.2f}{0:>10.2f}{'-':>10}")
+        print(f"{'etag':<10}{'-':>6}{size:>8}{'-':>12}{'-':>8}{cpu_ms:>10.2f}{len(body) / cpu_ms / 1000:>10.0f}")
+
+        for encoding in COMPRESSORS:
+            for level in LEVELS[encoding]:
+                compressed = compress(encoding, body, level)
+                cpu_ms = measure_cpu_ms(lambda: compress(encoding, body, level), repeats)
+                print(
+                    f"{encoding.value:<10}{level:>6}{size:>8}{len(compressed):>12}{len(body) / len(compressed):>8.2f}"
+                    f"{cpu_ms:>10.2f}{len(body) / cpu_ms / 1000:>10.0f}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
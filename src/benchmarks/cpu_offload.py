@@ -0,0 +1,99 @@
+"""Measure event-loop responsiveness during a login storm, hashing bcrypt inline and through the CPU executor."""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from core.executor import CpuExecutor
+from core.metrics import CPU_EXECUTOR_TASKS, EVENT_LOOP_LAG
+from services.metrics import monitor_event_loop_lag
+
+
+def make_app(executor: CpuExecutor | None, rounds: int) -> FastAPI:
+    app = FastAPI()
+    salt = bcrypt.gensalt(rounds)
+
+    @app.post("/login")
+    async def login() -> None:
+        if executor is None:
+            bcrypt.hashpw(b"password", salt)
+        else:
+            await executor.run(bcrypt.hashpw, b"password", salt)
+
+    @app.get("/ping")
+    async def ping() -> None:
+        pass
+
+    return app
+
+
+async def probe(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    timings = []
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await client.get("/ping")
+        timings.append((time.perf_counter() - started_at) * 1000)
+        await asyncio.sleep(0.01)
+
+    return timings
+
+
+async def storm(client: AsyncClient, logins: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    max_queued = 0
+
+    async def login() -> None:
+        nonlocal max_queued
+        async with semaphore:
+            await client.post("/login")
+            max_queued = max(max_queued, CPU_EXECUTOR_TASKS.samples.get(("queued",), 0))
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return max_queued
+
+
+async def run(logins: int, concurrency: int, rounds: int, workers: int) -> None:
+    print(f"{'hashing':<10}{'logins/s':>10}{'pings':>8}{'ping p50, ms':>14}{'ping max, ms':>14}", end="")
+    print(f"{'lag avg, ms':>13}{'queued':>8}")
+
+    for name, executor in (("inline", None), ("executor", CpuExecutor(max_workers=workers, max_queue=logins))):
+        EVENT_LOOP_LAG.samples.clear()
+        lag_monitor = asyncio.create_task(monitor_event_loop_lag(0.01))
+        stop = asyncio.Event()
+
+        async with AsyncClient(app=make_app(executor, rounds), base_url="http://benchmark") as client:
+            prober = asyncio.create_task(probe(client, stop))
+            started_at = time.perf_counter()
+            max_queued = await storm(client, logins, concurrency)
+            elapsed = time.perf_counter() - started_at
+            stop.set()
+            pings = await prober
+
+        lag_monitor.cancel()
+        lag = EVENT_LOOP_LAG.samples[()]
+        print(
+            f"{name:<10}{logins / elapsed:>10.1f}{len(pings):>8}{statistics.median(pings):>14.1f}{max(pings):>14.1f}"
+            f"{lag.sum / lag.count * 1000:>13.1f}{max_queued:>8.0f}"
+        )
+        if executor is not None:
+            executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.logins, args.concurrency, args.rounds, args.workers))
+
+
+if __name__ == "__main__":
+    main()
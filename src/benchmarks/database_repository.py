@@ -0,0 +1,160 @@
+"""Compare BaseModelDatabaseRepository queries with naive per-row/OFFSET/`.all()` patterns on the local Postgres."""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import typing
+
+from sqlalchemy import Integer, String, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from core.config import settings
+from db.repositories.base import BaseModelDatabaseRepository
+from db.session import get_engine
+
+T = typing.TypeVar("T")
+
+
+class BenchmarkBase(DeclarativeBase):
+    pass
+
+
+class BenchmarkItem(BenchmarkBase):
+    __tablename__ = "benchmark_items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    group_id: Mapped[int] = mapped_column(Integer, index=True)
+    text: Mapped[str] = mapped_column(String(length=255))
+
+
+class BenchmarkItemRepository(BaseModelDatabaseRepository[BenchmarkItem]):
+    model = BenchmarkItem
+
+
+async def measure(name: str, rows: int, coroutine_factory: typing.Callable[[], typing.Awaitable[T]]) -> T:
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    result = await coroutine_factory()
+    elapsed = time.perf_counter() - started_at
+    peak_mib = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    print(f"{name:<28}{rows:>10}{elapsed * 1000:>14.1f}{rows / elapsed:>14.0f}{peak_mib:>14.1f}")
+    return result
+
+
+def make_values(start: int, size: int) -> list[dict[str, typing.Any]]:
+    return [{"group_id": index % 100, "text": f"text {index}"} for index in range(start, start + size)]
+
+
+async def naive_create(session: AsyncSession, rows: int) -> None:
+    for values in make_values(0, rows):
+        session.add(BenchmarkItem(**values))
+        await session.commit()
+
+
+async def bulk_create(
+    session: AsyncSession, repository: BenchmarkItemRepository, start: int, rows: int, batch_size: int
+) -> None:
+    for batch_start in range(start, rows, batch_size):
+        await repository.bulk_create(make_values(batch_start, min(batch_size, rows - batch_start)), returning=False)
+        await session.commit()
+
+
+async def run_create(
+    session: AsyncSession, repository: BenchmarkItemRepository, rows: int, naive_rows: int, batch_size: int
+) -> None:
+    await measure("create, add+commit per row", naive_rows, lambda: naive_create(session, naive_rows))
+    await measure(
+        "create, bulk_create", rows - naive_rows, lambda: bulk_create(session, repository, naive_rows, rows, batch_size)
+    )
+    session.expunge_all()
+
+
+async def fetch_all(session: AsyncSession) -> int:
+    return len((await session.scalars(select(BenchmarkItem))).all())
+
+
+async def stream(repository: BenchmarkItemRepository, batch_size: int) -> int:
+    return sum([1 async for _ in repository.stream(yield_per=batch_size)])
+
+
+async def run_read(session: AsyncSession, repository: BenchmarkItemRepository, rows: int, batch_size: int) -> None:
+    await measure("read, scalars().all()", rows, lambda: fetch_all(session))
+    session.expunge_all()
+    await measure("read, stream", rows, lambda: stream(repository, batch_size))
+    session.expunge_all()
+    await session.commit()
+
+
+async def run_paginate(
+    session: AsyncSession, repository: BenchmarkItemRepository, rows: int, page_size: int, first_id: int
+) -> None:
+    deep_offset = rows - page_size
+    offset_page = select(BenchmarkItem).order_by(BenchmarkItem.id).offset(deep_offset).limit(page_size)
+
+    await measure("last page, OFFSET", page_size, lambda: session.scalars(offset_page))
+    await measure(
+        "last page, keyset",
+        page_size,
+        lambda: repository.paginate(page_size, after=(first_id + deep_offset - 1,)),
+    )
+
+
+async def get_loop(session: AsyncSession, ids: list[int]) -> None:
+    for id_ in ids:
+        (await session.scalars(select(BenchmarkItem).filter(BenchmarkItem.id == id_))).first()
+
+
+async def run_get_and_upsert(session: AsyncSession, repository: BenchmarkItemRepository, ids: list[int]) -> None:
+    await measure("get by id, per row", len(ids), lambda: get_loop(session, ids))
+    await measure("get by id, get_many", len(ids), lambda: repository.get_many(ids))
+
+    upsert_values = [{"id": id_, "group_id": 0, "text": "updated"} for id_ in ids]
+    await measure(
+        "bulk_upsert",
+        len(upsert_values),
+        lambda: repository.bulk_upsert(upsert_values, index_elements=["id"], returning=False),
+    )
+    await session.commit()
+
+
+async def run(rows: int, naive_rows: int, page_size: int, batch_size: int) -> None:
+    engine = get_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(BenchmarkBase.metadata.drop_all)
+        await connection.run_sync(BenchmarkBase.metadata.create_all)
+
+    print(f"{'operation':<28}{'rows':>10}{'time, ms':>14}{'rows/s':>14}{'peak, MiB':>14}")
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repository = BenchmarkItemRepository(session=session)
+            await run_create(session, repository, rows, naive_rows, batch_size)
+            await run_read(session, repository, rows, batch_size)
+
+            first_id = await session.scalar(select(func.min(BenchmarkItem.id)))
+            await run_paginate(session, repository, rows, page_size, first_id)
+            await run_get_and_upsert(session, repository, list(range(first_id, first_id + min(rows, naive_rows))))
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(BenchmarkBase.metadata.drop_all)
+
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--naive-rows", type=int, default=1_000, help="Rows for the slow per-row patterns")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"Database: {settings().POSTGRES_HOST}:{settings().POSTGRES_PORT}/{settings().POSTGRES_DB}")
+    asyncio.run(run(args.rows, args.naive_rows, args.page_size, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
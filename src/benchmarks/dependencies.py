@@ -0,0 +1,139 @@
+"""Measure how much per-request CPU goes to dependency resolution compared with the handler itself."""
+
+import argparse
+import asyncio
+import contextlib
+import time
+import typing
+
+from fastapi import Depends, FastAPI
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.types import Message
+
+from db.redis import AsyncRedis, get_redis
+from db.repositories.base import BaseDatabaseRepository
+from services.container import ServiceContainer, get_service_container
+
+
+class ItemDatabaseRepository(BaseDatabaseRepository):
+    pass
+
+
+class AuditDatabaseRepository(BaseDatabaseRepository):
+    pass
+
+
+class ItemRedisRepository:
+    def __init__(self, session: AsyncRedis = Depends(get_redis)) -> None:
+        self._session = session
+
+
+class ItemService:
+    def __init__(
+        self,
+        item_repository: ItemDatabaseRepository = Depends(),
+        item_cache_repository: ItemRedisRepository = Depends(),
+    ) -> None:
+        self.item_repository = item_repository
+        self.item_cache_repository = item_cache_repository
+
+
+class ReportService:
+    def __init__(
+        self,
+        item_service: ItemService = Depends(),
+        audit_repository: AuditDatabaseRepository = Depends(),
+    ) -> None:
+        self.item_service = item_service
+        self.audit_repository = audit_repository
+
+    def build(self) -> dict[str, list[int]]:
+        return {"items": list(range(20))}
+
+
+def make_app() -> FastAPI:
+    # Sessions and the Redis client connect lazily, nothing here touches the network.
+    app = FastAPI()
+
+    @app.get("/handler")
+    async def handler() -> dict[str, list[int]]:
+        return ReportService.build(typing.cast(ReportService, None))
+
+    @app.get("/depends")
+    async def depends(report_service: ReportService = Depends()) -> dict[str, list[int]]:
+        return report_service.build()
+
+    @app.get("/container")
+    async def container(services: ServiceContainer = Depends(get_service_container)) -> dict[str, list[int]]:
+        return services.get(ReportService).build()
+
+    return app
+
+
+def make_scope(app: FastAPI, path: str) -> dict[str, typing.Any]:
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [],
+        "server": ("benchmark", 80),
+        "client": ("benchmark", 1),
+        "app": app,
+    }
+
+
+async def receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+async def time_requests(app: FastAPI, path: str, requests: int) -> float:
+    started_at = time.process_time()
+    for _ in range(requests):
+        await app(make_scope(app, path), receive, send)
+
+    return (time.process_time() - started_at) / requests
+
+
+async def time_resolution(app: FastAPI, route: APIRoute, requests: int) -> float:
+    started_at = time.process_time()
+    for _ in range(requests):
+        scope = make_scope(app, route.path)
+        async with contextlib.AsyncExitStack() as stack:
+            scope["fastapi_astack"] = stack
+            await solve_dependencies(request=Request(scope, receive), dependant=route.dependant)
+
+    return (time.process_time() - started_at) / requests
+
+
+async def run(requests: int) -> None:
+    app = make_app()
+    routes = {route.path: route for route in app.routes if isinstance(route, APIRoute)}
+
+    print(f"{'route':<14}{'request, us':>14}{'dependencies, us':>20}{'share':>10}")
+    for path in ("/handler", "/depends", "/container"):
+        await time_requests(app, path, requests // 10)
+        total = await time_requests(app, path, requests)
+        resolution = await time_resolution(app, routes[path], requests)
+        print(f"{path:<14}{total * 1e6:>14.1f}{resolution * 1e6:>20.1f}{resolution / total:>10.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Compare peak RSS of streamed exports with building the whole response in memory, per exported row count."""
+
+import argparse
+import asyncio
+import json
+import resource
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.types import Message
+
+from api.export import export_response
+from benchmarks.database_repository import (
+    BenchmarkBase,
+    BenchmarkItem,
+    BenchmarkItemRepository,
+    make_values,
+)
+from core.enums import ContentEncodingEnum, ExportFormatEnum
+from db.session import get_engine
+from middlewares.compression import CompressionMiddleware
+from schemas.base import BaseOrmSchema
+
+PAGE_SIZE = resource.getpagesize()
+
+
+class BenchmarkItemSchema(BaseOrmSchema):
+    id: int
+    group_id: int
+    text: str
+
+
+def rss_mib() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE / 2**20
+
+
+class BodyMeter:
+    """ASGI `send` counting body bytes and the peak RSS while they are sent."""
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.peak_mib = rss_mib()
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.body":
+            self.size += len(message.get("body", b""))
+            self.peak_mib = max(self.peak_mib, rss_mib())
+
+
+async def wait_forever() -> Message:
+    await asyncio.Event().wait()
+    raise AssertionError("unreachable")
+
+
+def report(name: str, rows: int, started_at: float, baseline_mib: float, peak_mib: float, size: int) -> None:
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    print(f"{name:<20}{rows:>10}{elapsed_ms:>14.1f}{size / 2**20:>14.1f}{peak_mib - baseline_mib:>16.1f}")
+
+
+async def export_streaming(
+    session: AsyncSession,
+    rows: int,
+    export_format: ExportFormatEnum,
+    encoding: ContentEncodingEnum | None,
+    chunk_size: int,
+) -> None:
+    repository = BenchmarkItemRepository(session=session)
+    instances = repository.stream(BenchmarkItem.id <= rows, order_by=(BenchmarkItem.id,), yield_per=chunk_size)
+    response = export_response(instances, BenchmarkItemSchema, export_format, chunk_size=chunk_size)
+    # Sent through the middleware compressing route responses, as the export route would be.
+    app = CompressionMiddleware(response, min_size_bytes=0)
+    accept_encoding = encoding.value if encoding is not None else "identity"
+    scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+    meter = BodyMeter()
+    baseline_mib, started_at = meter.peak_mib, time.perf_counter()
+    await app(scope, wait_forever, meter)
+
+    name = f"stream {export_format.value}{f' {encoding.value}' if encoding is not None else ''}"
+    report(name, rows, started_at, baseline_mib, meter.peak_mib, meter.size)
+
+
+async def export_in_memory(session: AsyncSession, rows: int) -> None:
+    baseline_mib = rss_mib()
+    started_at = time.perf_counter()
+
+    instances = (await session.scalars(select(BenchmarkItem).where(BenchmarkItem.id <= rows))).all()
+    body = json.dumps(jsonable_encoder([BenchmarkItemSchema.model_validate(instance) for instance in instances]))
+
+    report("list + JSONResponse", rows, started_at, baseline_mib, rss_mib(), len(body))
+
+
+async def create_rows(engine: AsyncEngine, rows: int, chunk_size: int) -> None:
+    async with AsyncSession(engine) as session:
+        repository = BenchmarkItemRepository(session=session)
+        for start in range(0, rows, chunk_size):
+            await repository.bulk_create(make_values(start, min(chunk_size, rows - start)), returning=False)
+
+        await session.commit()
+
+
+async def run_streaming(
+    engine: AsyncEngine,
+    sizes: list[int],
+    export_format: ExportFormatEnum,
+    encoding: ContentEncodingEnum | None,
+    chunk_size: int,
+) -> None:
+    for rows in sizes:
+        async with AsyncSession(engine) as session:
+            await export_streaming(session, rows, export_format, encoding, chunk_size)
+
+
+async def run_in_memory(engine: AsyncEngine, sizes: list[int]) -> None:
+    for rows in sizes:
+        async with AsyncSession(engine) as session:
+            await export_in_memory(session, rows)
+
+
+async def run(sizes: list[int], chunk_size: int) -> None:
+    engine = get_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(BenchmarkBase.metadata.drop_all)
+        await connection.run_sync(BenchmarkBase.metadata.create_all)
+
+    try:
+        await create_rows(engine, max(sizes), chunk_size)
+
+        print(f"{'export':<20}{'rows':>10}{'time, ms':>14}{'body, MiB':>14}{'peak RSS, MiB':>16}")
+        # Streaming runs first: memory freed by the in-memory runs is not always returned to the OS.
+        await run_streaming(engine, sizes, ExportFormatEnum.NDJSON, None, chunk_size)
+        await run_streaming(engine, sizes, ExportFormatEnum.NDJSON, ContentEncodingEnum.GZIP, chunk_size)
+        await run_streaming(engine, sizes, ExportFormatEnum.CSV, None, chunk_size)
+        await run_in_memory(engine, sizes)
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(BenchmarkBase.metadata.drop_all)
+
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
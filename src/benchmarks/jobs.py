@@ -0,0 +1,106 @@
+"""Measure job worker throughput in rows/s for bulk-insert jobs, per batch size and worker concurrency."""
+
+import argparse
+import asyncio
+import time
+import typing
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.database_repository import (
+    BenchmarkBase,
+    BenchmarkItem,
+    BenchmarkItemRepository,
+    make_values,
+)
+from core.enums import JobStatusEnum
+from db.redis import close_redis, get_redis_connection
+from db.repositories.jobs import JobRedisRepository
+from db.session import dispose_engines, get_engine
+from services.jobs import JobWorker, batched
+
+
+def make_handler(batch_size: int) -> typing.Callable[[AsyncSession, dict[str, typing.Any]], typing.Awaitable[int]]:
+    async def create_items(session: AsyncSession, payload: dict[str, typing.Any]) -> int:
+        repository = BenchmarkItemRepository(session=session)
+        for values in batched(make_values(payload["start"], payload["rows"]), batch_size):
+            await repository.bulk_create(values, returning=False)
+
+        return payload["rows"]
+
+    return create_items
+
+
+async def wait_for_jobs(job_repository: JobRedisRepository, job_ids: list[str], stop: asyncio.Event) -> None:
+    while job_ids:
+        await asyncio.sleep(0.05)
+        jobs = await asyncio.gather(*(job_repository.get(job_id) for job_id in job_ids))
+        job_ids = [job.id for job in jobs if job is not None and job.status != JobStatusEnum.SUCCEEDED]
+
+    stop.set()
+
+
+async def run_jobs(jobs: int, rows_per_job: int, batch_size: int, concurrency: int) -> None:
+    redis = get_redis_connection()
+    job_repository = JobRedisRepository(session=redis)
+    job_ids = [
+        (
+            await job_repository.enqueue(
+                "benchmark.create_items", {"start": index * rows_per_job, "rows": rows_per_job}, 1
+            )
+        ).id
+        for index in range(jobs)
+    ]
+
+    stop = asyncio.Event()
+    worker = JobWorker(redis, concurrency, handlers={"benchmark.create_items": make_handler(batch_size)})
+    started_at = time.perf_counter()
+    await asyncio.gather(worker.run(stop), wait_for_jobs(job_repository, job_ids, stop))
+    elapsed = time.perf_counter() - started_at
+
+    rows = jobs * rows_per_job
+    print(f"{batch_size:>8}{concurrency:>14}{rows:>10}{elapsed * 1000:>12.0f}", end="")
+    print(f"{rows / elapsed:>12.0f}{jobs / elapsed:>10.1f}")
+
+
+async def run(jobs: int, rows_per_job: int, batch_sizes: list[int], concurrencies: list[int]) -> None:
+    engine = get_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(BenchmarkBase.metadata.drop_all)
+        await connection.run_sync(BenchmarkBase.metadata.create_all)
+
+    # Jobs left over by an interrupted run would skew the row count.
+    job_repository = JobRedisRepository(session=get_redis_connection())
+    await get_redis_connection().delete(job_repository.queue_key, job_repository.delayed_key, job_repository.leased_key)
+
+    print(f"{'batch':>8}{'concurrency':>14}{'rows':>10}{'time, ms':>12}{'rows/s':>12}{'jobs/s':>10}")
+    try:
+        for batch_size in batch_sizes:
+            for concurrency in concurrencies:
+                await run_jobs(jobs, rows_per_job, batch_size, concurrency)
+
+        async with AsyncSession(engine) as session:
+            total = await session.scalar(select(func.count()).select_from(BenchmarkItem))
+            assert total == jobs * rows_per_job * len(batch_sizes) * len(concurrencies), total
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(BenchmarkBase.metadata.drop_all)
+
+        await dispose_engines()
+        await close_redis()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--rows-per-job", type=int, default=10_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    asyncio.run(run(args.jobs, args.rows_per_job, args.batch_sizes, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Drive the app in-process with concurrent clients, report latency and throughput per path.
+
+Runs the lifespan of `main.app` against the local stack from `docker-compose.yml`, without a server or network:
+python -m benchmarks.load --concurrency 20 --seconds 10 --output /tmp/load.json
+python -m benchmarks.load --path /api/v1/analytics/quarters/1/reviews --header "Authorization: Bearer <token>"
+"""
+
+import argparse
+import asyncio
+import collections
+import time
+
+from httpx import AsyncClient
+from loguru import logger
+
+from benchmarks.results import (
+    BenchmarkResultSchema,
+    print_results,
+    summarize,
+    write_results,
+)
+from main import app
+
+# Read paths serving every page, extended with `--path`.
+LOAD_PATHS = ("/health/live", "/health/ready", "/api/v1/analytics/quarters/1/reviews")
+
+
+async def drive(client: AsyncClient, path: str, concurrency: int, seconds: float) -> BenchmarkResultSchema:
+    timings: list[float] = []
+    statuses: collections.Counter[int] = collections.Counter()
+    deadline = time.perf_counter() + seconds
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            response = await client.get(path)
+            timings.append(time.perf_counter() - started_at)
+            statuses[response.status_code] += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    if set(statuses) - {200}:
+        logger.warning("GET {} answered with statuses {}", path, dict(statuses))
+
+    return summarize(f"GET {path} c{concurrency}", timings, time.perf_counter() - started_at)
+
+
+async def run(paths: list[str], headers: dict[str, str], concurrency: int, seconds: float, output: str | None) -> None:
+    results = []
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(app=app, base_url="http://benchmark", headers=headers) as client:
+            for path in paths:
+                # Warm up pools and caches of the path, so that its first requests don't skew the tail.
+                await drive(client, path, concurrency, min(seconds, 1))
+                results.append(await drive(client, path, concurrency, seconds))
+
+    print_results(results)
+    if output:
+        write_results(output, results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", action="append", help="Path to GET, repeatable, LOAD_PATHS by default")
+    parser.add_argument("--header", action="append", default=[], help='Request header, e.g. "Authorization: Bearer x"')
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--output", help="Write results as JSON, e.g. a new baseline for `benchmarks.compare`")
+    args = parser.parse_args()
+
+    headers = dict(header.split(":", 1) for header in args.header)
+    headers = {name.strip(): value.strip() for name, value in headers.items()}
+    asyncio.run(run(args.path or list(LOAD_PATHS), headers, args.concurrency, args.seconds, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Measure the per-request overhead of MetricsMiddleware on a trivial route."""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from middlewares.metrics import MetricsMiddleware
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    return app
+
+
+async def run(requests: int, rounds: int) -> None:
+    print(f"{'app':<16}{'requests':>10}{'p50, us':>12}{'p99, us':>12}")
+    for instrumented in (False, True, False, True)[: rounds * 2]:
+        async with AsyncClient(app=make_app(instrumented), base_url="http://benchmark") as client:
+            timings = []
+            for index in range(requests):
+                started_at = time.perf_counter()
+                await client.get(f"/items/{index}")
+                timings.append((time.perf_counter() - started_at) * 1_000_000)
+
+        p50, p99 = statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+        print(f"{'metrics' if instrumented else 'plain':<16}{requests:>10}{p50:>12.0f}{p99:>12.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, choices=(1, 2), default=2)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
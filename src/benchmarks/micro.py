@@ -0,0 +1,115 @@
+"""Micro-benchmarks of hot helpers: schema validation and dumps, Redis keys and repository queries on local Postgres."""
+
+import argparse
+import asyncio
+import datetime
+import types
+import typing
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.database_repository import (
+    BenchmarkBase,
+    BenchmarkItem,
+    BenchmarkItemRepository,
+    make_values,
+)
+from benchmarks.results import (
+    BenchmarkResultSchema,
+    measure,
+    print_results,
+    write_results,
+)
+from benchmarks.serialization import BenchmarkItemSchema, make_items
+from db.session import get_engine
+from schemas.base import RedisKeySchema
+
+# Calls of sync helpers per measured iteration, single calls are too short for the timer.
+SYNC_CALLS = 100
+
+
+def repeat(call: typing.Callable[[], typing.Any]) -> typing.Callable[[], typing.Awaitable[None]]:
+    async def repeated() -> None:
+        for _ in range(SYNC_CALLS):
+            call()
+
+    return repeated
+
+
+async def measure_helpers(iterations: int) -> list[BenchmarkResultSchema]:
+    item = make_items(1)[0]
+    row = types.SimpleNamespace(**item.model_dump())
+    payload = item.model_dump_json()
+    key_schema = RedisKeySchema(prefix="benchmark")
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+    cases = {
+        "schema model_validate from attributes": lambda: BenchmarkItemSchema.model_validate(row),
+        "schema model_validate_json": lambda: BenchmarkItemSchema.model_validate_json(payload),
+        "schema model_dump json mode": lambda: item.model_dump(mode="json"),
+        "schema model_dump_json": item.model_dump_json,
+        "key_schema get_key": lambda: key_schema.get_key(42, "reviews", now.date()),
+    }
+    return [await measure(f"{name} x{SYNC_CALLS}", repeat(call), iterations) for name, call in cases.items()]
+
+
+async def measure_repository(iterations: int, rows: int, page_size: int) -> list[BenchmarkResultSchema]:
+    engine = get_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(BenchmarkBase.metadata.drop_all)
+        await connection.run_sync(BenchmarkBase.metadata.create_all)
+
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repository = BenchmarkItemRepository(session=session)
+            await repository.bulk_create(make_values(0, rows), returning=False)
+            await session.commit()
+
+            first_id = await session.scalar(select(func.min(BenchmarkItem.id)))
+            ids = list(range(first_id, first_id + page_size))
+            middle = (first_id + rows // 2,)
+
+            async def bulk_create() -> None:
+                await repository.bulk_create(make_values(0, page_size))
+                await session.rollback()
+
+            cases = {
+                f"repository get_many {page_size}": lambda: repository.get_many(ids),
+                f"repository paginate {page_size}": lambda: repository.paginate(page_size, after=middle),
+                f"repository bulk_create {page_size}": bulk_create,
+            }
+            results = []
+            for name, call in cases.items():
+                results.append(await measure(name, call, iterations))
+                session.expunge_all()
+
+            return results
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(BenchmarkBase.metadata.drop_all)
+
+        await engine.dispose()
+
+
+async def run(iterations: int, rows: int, page_size: int, output: str | None) -> None:
+    results = [*await measure_helpers(iterations), *await measure_repository(iterations, rows, page_size)]
+    print_results(results)
+
+    if output:
+        write_results(output, results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1_000)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--output", help="Write results as JSON, e.g. a new baseline for `benchmarks.compare`")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.iterations, args.rows, args.page_size, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Measure the latency RateLimitMiddleware adds per request, with Redis and with the local fallback."""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from core.config import settings
+from core.enums import RateLimitAlgorithmEnum
+from db.redis import close_redis
+from middlewares.rate_limit import RateLimitMiddleware, concurrency_limit, rate_limit
+
+LIMIT = 1_000_000_000
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain() -> None:
+        pass
+
+    @app.get("/sliding-window")
+    @rate_limit(limit=LIMIT, period_seconds=60)
+    async def sliding_window() -> None:
+        pass
+
+    @app.get("/token-bucket")
+    @rate_limit(limit=LIMIT, period_seconds=60, algorithm=RateLimitAlgorithmEnum.TOKEN_BUCKET)
+    async def token_bucket() -> None:
+        pass
+
+    @app.get("/concurrency")
+    @concurrency_limit(max_requests=LIMIT)
+    async def concurrency() -> None:
+        pass
+
+    if instrumented:
+        app.add_middleware(RateLimitMiddleware)
+
+    return app
+
+
+async def run(requests: int, redis_dsn: str) -> None:
+    print(f"Redis: {redis_dsn}")
+    print(f"{'route':<28}{'requests':>10}{'p50, us':>12}{'p99, us':>12}")
+    for name, instrumented, path in (
+        ("no middleware", False, "/plain"),
+        ("unlimited route", True, "/plain"),
+        ("sliding window", True, "/sliding-window"),
+        ("token bucket", True, "/token-bucket"),
+        ("concurrency", True, "/concurrency"),
+    ):
+        async with AsyncClient(app=make_app(instrumented), base_url="http://benchmark") as client:
+            timings = []
+            for _ in range(requests):
+                started_at = time.perf_counter()
+                response = await client.get(path)
+                timings.append((time.perf_counter() - started_at) * 1_000_000)
+
+            assert response.status_code == 200, response.text
+
+        p50, p99 = statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+        print(f"{name:<28}{requests:>10}{p50:>12.0f}{p99:>12.0f}")
+
+    await close_redis()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+
+    # Point REDIS_DSN at a closed port to measure the local fallback.
+    asyncio.run(run(args.requests, settings().REDIS_DSN))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compare per-key and batched BaseRedisRepository calls against the local Redis from docker-compose."""
+
+import argparse
+import asyncio
+import time
+import typing
+
+from redis.asyncio import Connection, from_url
+
+from core.config import settings
+from db.redis import AsyncRedis
+from db.repositories.base import BaseRedisRepository
+from schemas.base import BaseOrmSchema, RedisKeySchema
+
+T = typing.TypeVar("T")
+
+
+class BenchmarkSchema(BaseOrmSchema):
+    id: int
+    text: str
+
+
+class BenchmarkRedisRepository(BaseRedisRepository):
+    schema = BenchmarkSchema
+    key_schema = RedisKeySchema(prefix="benchmark")
+
+
+class RoundTripConnection(Connection):
+    """Connection counting every packet sent to the server, optionally sleeping `rtt` seconds on it."""
+
+    round_trips: int = 0
+    rtt: float = 0
+
+    async def send_packed_command(self, *args, **kwargs) -> None:
+        RoundTripConnection.round_trips += 1
+        await asyncio.sleep(RoundTripConnection.rtt)
+        await super().send_packed_command(*args, **kwargs)
+
+
+async def measure(name: str, size: int, coroutine_factory: typing.Callable[[], typing.Awaitable[T]]) -> T:
+    RoundTripConnection.round_trips = 0
+    started_at = time.perf_counter()
+    result = await coroutine_factory()
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    print(f"{name:<16}{size:>6}{RoundTripConnection.round_trips:>12}{elapsed_ms:>14.2f}")
+    return result
+
+
+async def set_loop(
+    repository: BenchmarkRedisRepository, models: list[BenchmarkSchema], expiration_seconds: int
+) -> list[str]:
+    return [await repository.set(model, expiration_seconds) for model in models]
+
+
+async def get_loop(repository: BenchmarkRedisRepository, uuids: list[str]) -> None:
+    for uuid in uuids:
+        await repository.get(uuid)
+
+
+async def delete_loop(repository: BenchmarkRedisRepository, uuids: list[str]) -> None:
+    for uuid in uuids:
+        await repository.delete(uuid)
+
+
+async def run_per_key(
+    repository: BenchmarkRedisRepository, models: list[BenchmarkSchema], expiration_seconds: int
+) -> None:
+    size = len(models)
+    uuids = await measure("set", size, lambda: set_loop(repository, models, expiration_seconds))
+    await measure("get", size, lambda: get_loop(repository, uuids))
+    await measure("delete", size, lambda: delete_loop(repository, uuids))
+
+
+async def run_batched(
+    repository: BenchmarkRedisRepository, models: list[BenchmarkSchema], expiration_seconds: int
+) -> None:
+    size = len(models)
+    uuids = await measure("set_many", size, lambda: repository.set_many(models, expiration_seconds))
+    await measure("get_many", size, lambda: repository.get_many(uuids))
+    await measure("delete_many", size, lambda: repository.delete_many(uuids))
+
+
+async def run(dsn: str, sizes: list[int], expiration_seconds: int) -> None:
+    redis: AsyncRedis = from_url(dsn, decode_responses=True, connection_class=RoundTripConnection)
+    repository = BenchmarkRedisRepository(session=redis)
+
+    print(f"{'operation':<16}{'N':>6}{'round-trips':>12}{'latency, ms':>14}")
+    for size in sizes:
+        models = [BenchmarkSchema(id=index, text=f"text {index}") for index in range(size)]
+        await run_per_key(repository, models, expiration_seconds)
+        await run_batched(repository, models, expiration_seconds)
+
+    await redis.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dsn", default=settings().REDIS_DSN)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--rtt-ms", type=float, default=0, help="Extra simulated network round-trip time")
+    parser.add_argument("--expiration-seconds", type=int, default=60)
+    args = parser.parse_args()
+
+    RoundTripConnection.rtt = args.rtt_ms / 1000
+    asyncio.run(run(args.dsn, args.sizes, args.expiration_seconds))
+
+
+if __name__ == "__main__":
+    main()
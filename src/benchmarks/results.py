@@ -0,0 +1,106 @@
+"""
+Benchmark results stored as JSON baselines and compared against new runs.
+
+Usage:
+python -m benchmarks.micro --output benchmarks/baselines/micro.json
+python -m benchmarks.micro --output /tmp/micro.json
+python -m benchmarks.compare benchmarks/baselines/micro.json /tmp/micro.json --threshold 0.2
+"""
+
+import json
+import pathlib
+import statistics
+import time
+import typing
+
+from pydantic import BaseModel
+
+
+class BenchmarkResultSchema(BaseModel):
+    name: str
+    count: int
+    p50_ms: float
+    p99_ms: float
+    per_second: float
+
+
+class BenchmarkDriftSchema(BaseModel):
+    name: str
+    field: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else 0
+
+
+def summarize(name: str, timings: list[float], seconds: float) -> BenchmarkResultSchema:
+    """Result of `timings` of single calls in seconds, made over `seconds` of wall time."""
+
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return BenchmarkResultSchema(
+        name=name,
+        count=len(timings),
+        p50_ms=quantiles[49] * 1000,
+        p99_ms=quantiles[98] * 1000,
+        per_second=len(timings) / seconds if seconds else 0,
+    )
+
+
+async def measure(
+    name: str, call: typing.Callable[[], typing.Awaitable[typing.Any]], iterations: int, warmup: int = 10
+) -> BenchmarkResultSchema:
+    for _ in range(warmup):
+        await call()
+
+    timings = []
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        call_started_at = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - call_started_at)
+
+    return summarize(name, timings, time.perf_counter() - started_at)
+
+
+def print_results(results: typing.Iterable[BenchmarkResultSchema]) -> None:
+    print(f"{'benchmark':<44}{'count':>10}{'p50, ms':>12}{'p99, ms':>12}{'per second':>14}")
+    for result in results:
+        print(
+            f"{result.name:<44}{result.count:>10}{result.p50_ms:>12.3f}{result.p99_ms:>12.3f}{result.per_second:>14.0f}"
+        )
+
+
+def write_results(path: str, results: list[BenchmarkResultSchema]) -> None:
+    output = pathlib.Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps([result.model_dump() for result in results], indent=2) + "\n")
+
+
+def read_results(path: str) -> dict[str, BenchmarkResultSchema]:
+    results = (BenchmarkResultSchema(**item) for item in json.loads(pathlib.Path(path).read_text()))
+    return {result.name: result for result in results}
+
+
+def find_drifts(
+    baseline: BenchmarkResultSchema, current: BenchmarkResultSchema, threshold: float, tail_threshold: float
+) -> list[BenchmarkDriftSchema]:
+    """Latencies grown, or throughput dropped, by more than a share of the baseline, p99 by `tail_threshold`."""
+
+    drifts = [
+        BenchmarkDriftSchema(
+            name=current.name, field=field, baseline=getattr(baseline, field), current=getattr(current, field)
+        )
+        for field in ("p50_ms", "p99_ms", "per_second")
+    ]
+    p50, p99, per_second = drifts
+    return [
+        drift
+        for drift, drifted in (
+            (p50, p50.change > threshold),
+            (p99, p99.change > tail_threshold),
+            (per_second, per_second.change < -threshold),
+        )
+        if drifted
+    ]
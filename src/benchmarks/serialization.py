@@ -0,0 +1,102 @@
+"""Compare FastAPI's default JSONResponse with PydanticJSONResponse for large list responses."""
+
+import argparse
+import asyncio
+import datetime
+import enum
+import statistics
+import time
+import typing
+import uuid
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette.responses import JSONResponse
+
+from api.responses import PydanticJSONResponse
+from schemas.base import BaseOrmSchema
+
+
+class BenchmarkStatusEnum(str, enum.Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+
+
+class BenchmarkItemSchema(BaseOrmSchema):
+    id: int
+    uuid: uuid.UUID
+    status: BenchmarkStatusEnum
+    text: str
+    created_at: datetime.datetime
+    updated_at: datetime.datetime | None
+
+
+def make_items(size: int) -> list[BenchmarkItemSchema]:
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return [
+        BenchmarkItemSchema(
+            id=index,
+            uuid=uuid.uuid4(),
+            status=list(BenchmarkStatusEnum)[index % 2],
+            text=f"text {index}",
+            created_at=now,
+            updated_at=None,
+        )
+        for index in range(size)
+    ]
+
+
+def make_app(items: list[BenchmarkItemSchema]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=list[BenchmarkItemSchema], response_class=JSONResponse)
+    async def default() -> typing.Any:
+        return items
+
+    @app.get("/default-no-model", response_model=None, response_class=JSONResponse)
+    async def default_no_model() -> typing.Any:
+        return items
+
+    @app.get("/pydantic", response_model=list[BenchmarkItemSchema], response_class=PydanticJSONResponse)
+    async def pydantic() -> typing.Any:
+        return items
+
+    @app.get("/pydantic-direct")
+    async def pydantic_direct() -> PydanticJSONResponse:
+        return PydanticJSONResponse(items)
+
+    return app
+
+
+async def run(sizes: list[int], requests: int) -> None:
+    print(f"{'route':<20}{'items':>8}{'p50, ms':>12}{'p99, ms':>12}{'body, KiB':>12}")
+    for size in sizes:
+        app = make_app(make_items(size))
+
+        async with AsyncClient(app=app, base_url="http://benchmark") as client:
+            bodies = {}
+            for route in ("/default", "/default-no-model", "/pydantic", "/pydantic-direct"):
+                timings = []
+                for _ in range(requests):
+                    started_at = time.perf_counter()
+                    response = await client.get(route)
+                    timings.append((time.perf_counter() - started_at) * 1000)
+
+                bodies[route] = response.json()
+                p50, p99 = statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+                print(f"{route:<20}{size:>8}{p50:>12.2f}{p99:>12.2f}{len(response.content) / 1024:>12.1f}")
+
+            assert all(body == bodies["/default"] for body in bodies.values()), "Responses differ"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes, args.requests))
+
+
+if __name__ == "__main__":
+    main()
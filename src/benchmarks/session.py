@@ -0,0 +1,78 @@
+"""Compare cookie sizes and per-request latency of RedisSessionMiddleware and Starlette's SessionMiddleware."""
+
+import argparse
+import asyncio
+import secrets
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+from starlette.middleware.sessions import SessionMiddleware
+
+from core.config import settings
+from db.redis import close_redis
+from middlewares.session import RedisSessionMiddleware
+
+
+def make_app(redis: bool, payload: dict[str, str]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/untouched")
+    async def untouched() -> None:
+        pass
+
+    @app.get("/read")
+    async def read(request: Request) -> None:
+        assert request.session["user_id"]
+
+    @app.get("/write")
+    async def write(request: Request) -> None:
+        request.session.update(payload)
+
+    if redis:
+        app.add_middleware(RedisSessionMiddleware)
+    else:
+        app.add_middleware(SessionMiddleware, secret_key=secrets.token_hex())
+
+    return app
+
+
+async def measure(client: AsyncClient, path: str, requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        response = await client.get(path)
+        timings.append((time.perf_counter() - started_at) * 1_000_000)
+        assert response.status_code == 200, response.text
+
+    return timings
+
+
+async def run(requests: int, keys: int) -> None:
+    payload = {"user_id": "1", **{f"key-{index}": secrets.token_hex(16) for index in range(keys)}}
+    print(f"Redis: {settings().REDIS_DSN}, session keys: {len(payload)}")
+    print(f"{'middleware':<12}{'route':<12}{'cookie, B':>12}{'p50, us':>12}{'p99, us':>12}")
+
+    for name, redis in (("starlette", False), ("redis", True)):
+        async with AsyncClient(app=make_app(redis, payload), base_url="http://benchmark") as client:
+            set_cookie = (await client.get("/write")).headers["set-cookie"]
+            for path in ("/untouched", "/read", "/write"):
+                timings = await measure(client, path, requests)
+                p50, p99 = statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+                print(f"{name:<12}{path:<12}{len(set_cookie):>12}{p50:>12.0f}{p99:>12.0f}")
+
+    await close_redis()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--keys", type=int, default=20, help="Session values of 32 characters besides user_id")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.keys))
+
+
+if __name__ == "__main__":
+    main()
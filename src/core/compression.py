@@ -0,0 +1,153 @@
+"""
+Content encodings of responses and strong ETags of their bodies.
+
+gzip is always available, brotli and zstd once the `brotli` and `zstandard` packages are installed.
+"""
+
+import hashlib
+import typing
+import zlib
+
+from core.config import settings
+from core.enums import ContentEncodingEnum
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+
+class Compressor(typing.Protocol):
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        """Everything compressed so far, decodable by the client before the stream ends."""
+
+    def finish(self) -> bytes:
+        ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int) -> None:
+        # 16 + 15 window bits: the gzip container around deflate with the largest window.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+COMPRESSORS: dict[ContentEncodingEnum, typing.Callable[[int], Compressor]] = {ContentEncodingEnum.GZIP: GzipCompressor}
+if brotli is not None:
+    COMPRESSORS[ContentEncodingEnum.BROTLI] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS[ContentEncodingEnum.ZSTD] = ZstdCompressor
+
+
+def get_level(encoding: ContentEncodingEnum) -> int:
+    levels = {
+        ContentEncodingEnum.GZIP: settings().COMPRESSION_GZIP_LEVEL,
+        ContentEncodingEnum.BROTLI: settings().COMPRESSION_BROTLI_LEVEL,
+        ContentEncodingEnum.ZSTD: settings().COMPRESSION_ZSTD_LEVEL,
+    }
+    return levels[encoding]
+
+
+def get_compressor(encoding: ContentEncodingEnum, level: int | None = None) -> Compressor:
+    return COMPRESSORS[encoding](get_level(encoding) if level is None else level)
+
+
+def compress(encoding: ContentEncodingEnum, body: bytes, level: int | None = None) -> bytes:
+    compressor = get_compressor(encoding, level)
+    return compressor.compress(body) + compressor.finish()
+
+
+def _parse_q(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0
+
+    return 1
+
+
+def negotiate_encoding(
+    accept_encoding: str, encodings: typing.Sequence[ContentEncodingEnum] = tuple(ContentEncodingEnum)
+) -> ContentEncodingEnum | None:
+    """Available encoding of `encodings` with the highest q-value in Accept-Encoding, on ties the earlier one."""
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        weights[name.strip().lower()] = _parse_q(params)
+
+    candidates = [
+        (weights.get(encoding.value, weights.get("*", 0)), -index, encoding)
+        for index, encoding in enumerate(encodings)
+        if encoding in COMPRESSORS
+    ]
+    weight, _, encoding = max(candidates, default=(0, 0, None))
+    return encoding if weight > 0 else None
+
+
+def encode_etag(etag: str, encoding: ContentEncodingEnum | None) -> str:
+    """ETag of the `encoding` representation, strong ETags differ per content coding while weak ones are shared."""
+
+    if encoding is None or etag.startswith("W/"):
+        return etag
+
+    return etag.removesuffix('"') + f'-{encoding.value}"'
+
+
+def make_etag(body: bytes, encoding: ContentEncodingEnum | None = None) -> str:
+    """Strong ETag of a representation, hashing the body before compression, which is cheaper than after."""
+
+    return encode_etag(f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', encoding)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, W/ prefixes are ignored.
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
@@ -1 +1,54 @@
 """For core constants."""
+
+from uuid import uuid4
+
+# Identifies this worker process, e.g. to skip its own pub/sub broadcasts.
+INSTANCE_ID = uuid4().hex
+
+LOCAL_CACHE_INVALIDATION_CHANNEL = "local-cache:invalidate"
+
+# Background loops losing Redis retry after base * 2^(failures - 1) seconds, capped and jittered.
+REDIS_RECONNECT_BACKOFF_SECONDS = 0.5
+REDIS_RECONNECT_BACKOFF_MAX_SECONDS = 30
+
+RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS = 5
+RESPONSE_CACHE_POLL_INTERVAL_SECONDS = 0.05
+
+LATENCY_BUCKETS_SECONDS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+EXPORT_CHUNK_SIZE = 1000
+
+# Rows per multi-row INSERT without RETURNING, like SQLAlchemy's insertmanyvalues pages,
+# fewer if the rows would exceed the bind parameters Postgres accepts per statement.
+BULK_INSERT_BATCH_SIZE = 1000
+POSTGRES_MAX_BIND_PARAMETERS = 32_767
+
+# Key of the advisory lock held while migrating, so that concurrently started migration jobs run one by one.
+MIGRATION_LOCK_KEY = 4_021_337
+
+# Metrics of workers other than the scraped one are at most this old, keep it below the scrape interval.
+METRICS_PUSH_INTERVAL_SECONDS = 5
+# The event loop is expected to wake up this often, lateness is recorded as lag.
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 0.5
+PROFILER_SAMPLE_INTERVAL_SECONDS = 0.005
+PROFILER_MAX_SECONDS = 60
+SIZE_BUCKETS_BYTES = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Crashed workers never release their concurrency slots, leases expire after this instead.
+CONCURRENCY_LEASE_SECONDS = 60
+# Keys tracked by the in-process rate limiter used while Redis is down.
+LOCAL_RATE_LIMIT_MAX_KEYS = 10_000
+
+# Workers renew leases of running jobs, jobs of a worker that stopped renewing are retried.
+JOB_LEASE_SECONDS = 60
+JOB_POLL_INTERVAL_SECONDS = 0.5
+# Job state and idempotency keys are kept this long after the last update.
+JOB_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Principals are kept per worker in front of Redis, bounding staleness if an invalidation message is lost.
+PRINCIPAL_LOCAL_CACHE_TTL_SECONDS = 5
+PRINCIPAL_LOCAL_CACHE_MAX_SIZE = 10_000
+# Successful bcrypt verifications of API keys are reused per worker for this long.
+SECRET_VERIFICATION_CACHE_TTL_SECONDS = 5 * 60
+SECRET_VERIFICATION_CACHE_MAX_SIZE = 10_000
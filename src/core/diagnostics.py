@@ -0,0 +1,91 @@
+"""
+Opt-in diagnostics for code blocking the event loop, enabled with `DIAGNOSTICS_ENABLED`.
+
+`LoopWatchdog` logs the stack of the event loop thread whenever it stops responding for
+`DIAGNOSTICS_SLOW_CALLBACK_SECONDS`, e.g. on a sync lazy load, bcrypt or validation of a huge payload.
+`sample_stacks` backs `GET /debug/profile?seconds=10`, its output renders with `flamegraph.pl` or speedscope.
+"""
+
+import asyncio
+import collections
+import sys
+import threading
+import time
+import traceback
+import types
+
+from loguru import logger
+
+from core.constants import PROFILER_SAMPLE_INTERVAL_SECONDS
+
+
+class LoopWatchdog(threading.Thread):
+    """Thread pinging the event loop, logging the loop thread stack when a ping waits over `threshold_seconds`.
+
+    Create it from the event loop thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold_seconds: float) -> None:
+        super().__init__(name="loop-watchdog", daemon=True)
+        self.loop = loop
+        self.threshold_seconds = threshold_seconds
+        self.loop_thread_id = threading.get_ident()
+        self._stop_event = threading.Event()
+
+    def _wait_for_loop(self) -> None:
+        answered, started_at = threading.Event(), time.perf_counter()
+        self.loop.call_soon_threadsafe(answered.set)
+        if answered.wait(self.threshold_seconds):
+            return
+
+        # Captured while the loop is still blocked, so the stack shows the blocking call.
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "unavailable\n"
+        while not answered.wait(self.threshold_seconds) and not self._stop_event.is_set():
+            pass
+
+        logger.warning(
+            "Event loop blocked for {:.3f}s, stack after {}s:\n{}",
+            time.perf_counter() - started_at,
+            self.threshold_seconds,
+            stack,
+        )
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.threshold_seconds / 2):
+            try:
+                self._wait_for_loop()
+            except RuntimeError:
+                # The loop was closed.
+                return
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def _collapse(frame: types.FrameType | None, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        labels.append(f"{code.co_qualname} ({code.co_filename}:{frame.f_lineno})".replace(";", ":"))
+        frame = frame.f_back
+
+    return ";".join((thread_name, *reversed(labels)))
+
+
+def sample_stacks(seconds: float, interval_seconds: float = PROFILER_SAMPLE_INTERVAL_SECONDS) -> str:
+    """Sample stacks of every other thread for `seconds`, return them in the collapsed format, root first."""
+
+    counts: collections.Counter[str] = collections.Counter()
+    own_thread_id = threading.get_ident()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id != own_thread_id:
+                counts[_collapse(frame, names.get(thread_id, str(thread_id)))] += 1
+
+        time.sleep(interval_seconds)
+
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
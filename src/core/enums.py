@@ -1,7 +1,41 @@
-# import enum
-
+import enum
 
 # class ReviewStatusEnum(str, enum.Enum):
 #     1 = "First"
 #     2 = "Second"
 #     3 = "Third"
+
+
+class ExportFormatEnum(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class RateLimitAlgorithmEnum(str, enum.Enum):
+    SLIDING_WINDOW = "sliding_window"
+    TOKEN_BUCKET = "token_bucket"
+
+
+class JobStatusEnum(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ExecutorKindEnum(str, enum.Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ReviewSummaryMetricEnum(str, enum.Enum):
+    REVIEWS_BY_STATUS = "reviews_by_status"
+    ANSWERS_BY_QUESTION = "answers_by_question"
+    REVIEWER_LOAD = "reviewer_load"
+
+
+class ContentEncodingEnum(str, enum.Enum):
+    BROTLI = "br"
+    ZSTD = "zstd"
+    GZIP = "gzip"
@@ -1,8 +1,19 @@
-# from fastapi import HTTPException, status
+from fastapi import HTTPException, status
 
 # from core.config import settings
 
 # example_exception = HTTPException(
 #     status_code=status.HTTP_400_BAD_REQUEST,
 #     detail="Reason of exception",
-# )
\ No newline at end of file
+# )
+
+job_not_found_exception = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Job not found",
+)
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
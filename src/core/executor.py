@@ -0,0 +1,103 @@
+"""
+Bounded pool for CPU-bound work, so that it does not block the event loop.
+
+Usage:
+hashed = await run_cpu_bound(hash_password, password)
+summary = await get_cpu_executor().run(aggregate_answers, rows, timeout_seconds=30)
+
+With `CPU_EXECUTOR_KIND=process` functions and arguments are pickled: pass module-level functions.
+A timed out call no longer blocks its caller, but a call already running keeps its worker until it returns.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import typing
+
+from core.config import settings
+from core.enums import ExecutorKindEnum
+from core.metrics import CPU_EXECUTOR_CALLS, CPU_EXECUTOR_TASKS
+
+T = typing.TypeVar("T")
+
+
+class ExecutorOverloadedError(RuntimeError):
+    """Raised instead of queueing a call when the executor queue is full."""
+
+
+class CpuExecutor:
+    def __init__(
+        self,
+        kind: ExecutorKindEnum = ExecutorKindEnum.THREAD,
+        max_workers: int | None = None,
+        max_queue: int = 64,
+        timeout_seconds: float | None = None,
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        # Submitted and not finished yet, including calls whose caller timed out.
+        self.pending = 0
+
+        if kind == ExecutorKindEnum.PROCESS:
+            self._executor: concurrent.futures.Executor = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="cpu")
+
+    @property
+    def queued(self) -> int:
+        return max(self.pending - self.max_workers, 0)
+
+    def _track(self, delta: int) -> None:
+        self.pending += delta
+        CPU_EXECUTOR_TASKS.set(self.pending - self.queued, ("running",))
+        CPU_EXECUTOR_TASKS.set(self.queued, ("queued",))
+
+    async def run(self, func: typing.Callable[..., T], *args: typing.Any, timeout_seconds: float | None = None) -> T:
+        """Run `func(*args)` in the pool, raise `ExecutorOverloadedError` if the queue is full."""
+
+        if self.pending >= self.max_workers + self.max_queue:
+            CPU_EXECUTOR_CALLS.inc(("rejected",))
+            raise ExecutorOverloadedError(f"CPU executor queue is full, {self.pending} calls pending")
+
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(func, *args)
+        self._track(1)
+        # Callbacks run in the worker thread, the counter is only changed on the loop.
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._track, -1))
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout_seconds or self.timeout_seconds)
+        except TimeoutError:
+            CPU_EXECUTOR_CALLS.inc(("timeout",))
+            raise
+        except Exception:
+            CPU_EXECUTOR_CALLS.inc(("failed",))
+            raise
+
+        CPU_EXECUTOR_CALLS.inc(("succeeded",))
+        return result
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@functools.lru_cache
+def get_cpu_executor() -> CpuExecutor:
+    return CpuExecutor(
+        kind=settings().CPU_EXECUTOR_KIND,
+        max_workers=settings().CPU_EXECUTOR_MAX_WORKERS,
+        max_queue=settings().CPU_EXECUTOR_MAX_QUEUE,
+        timeout_seconds=settings().CPU_EXECUTOR_TIMEOUT_SECONDS,
+    )
+
+
+async def run_cpu_bound(func: typing.Callable[..., T], *args: typing.Any) -> T:
+    return await get_cpu_executor().run(func, *args)
+
+
+def shutdown_cpu_executor() -> None:
+    if get_cpu_executor.cache_info().currsize:
+        get_cpu_executor().shutdown()
+        get_cpu_executor.cache_clear()
@@ -0,0 +1,213 @@
+"""For in-process performance metrics."""
+
+import bisect
+import contextvars
+import dataclasses
+import typing
+
+from core.constants import COUNT_BUCKETS, LATENCY_BUCKETS_SECONDS, SIZE_BUCKETS_BYTES
+
+# Snapshot of a metric family: JSON-compatible so that workers can share it through Redis.
+MetricSnapshot: typing.TypeAlias = dict[str, typing.Any]
+Labels: typing.TypeAlias = tuple[str, ...]
+
+
+class Histogram:
+    """Histogram with fixed upper bounds, cumulative like Prometheus ones."""
+
+    def __init__(self, buckets: typing.Sequence[float] = LATENCY_BUCKETS_SECONDS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> dict[str, int]:
+        """Return counts per upper bound, the last one being `+Inf`."""
+
+        result, total = {}, 0
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += count
+            result[bound] = total
+
+        return result
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+
+class Metric:
+    """Metric family, samples are keyed by label values in `label_names` order."""
+
+    type: typing.ClassVar[str]
+
+    def __init__(self, name: str, documentation: str, label_names: Labels = (), register: bool = True) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.samples: dict[Labels, typing.Any] = {}
+
+        if register:
+            REGISTRY.append(self)
+
+    def _snapshot_value(self, value: typing.Any) -> typing.Any:
+        return value
+
+    def snapshot(self) -> MetricSnapshot:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "documentation": self.documentation,
+            "label_names": list(self.label_names),
+            "samples": [[list(labels), self._snapshot_value(value)] for labels, value in self.samples.items()],
+        }
+
+
+class CounterMetric(Metric):
+    type = "counter"
+
+    def inc(self, labels: Labels = (), value: float = 1) -> None:
+        self.samples[labels] = self.samples.get(labels, 0) + value
+
+
+class GaugeMetric(Metric):
+    type = "gauge"
+
+    def inc(self, labels: Labels = (), value: float = 1) -> None:
+        self.samples[labels] = self.samples.get(labels, 0) + value
+
+    def dec(self, labels: Labels = (), value: float = 1) -> None:
+        self.inc(labels, -value)
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self.samples[labels] = value
+
+
+class HistogramMetric(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Labels = (),
+        buckets: typing.Sequence[float] = LATENCY_BUCKETS_SECONDS,
+        register: bool = True,
+    ) -> None:
+        super().__init__(name, documentation, label_names, register)
+        self.buckets = buckets
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        histogram = self.samples.get(labels)
+        if histogram is None:
+            histogram = self.samples[labels] = Histogram(self.buckets)
+
+        histogram.observe(value)
+
+    def _snapshot_value(self, value: Histogram) -> dict[str, typing.Any]:
+        return value.snapshot()
+
+
+REGISTRY: list[Metric] = []
+# Callables returning snapshots of metrics kept elsewhere, e.g. connection pool stats.
+COLLECTORS: list[typing.Callable[[], list[MetricSnapshot]]] = []
+
+
+def collect() -> list[MetricSnapshot]:
+    snapshots = [metric.snapshot() for metric in REGISTRY]
+    for collector in COLLECTORS:
+        snapshots.extend(collector())
+
+    return snapshots
+
+
+def label_workers(worker_snapshots: typing.Mapping[str, list[MetricSnapshot]]) -> list[MetricSnapshot]:
+    """Combine snapshots of several workers into families whose samples carry a `worker` label.
+
+    Sums across workers would drop whenever a worker exits, which `rate()` reads as a counter reset,
+    so aggregation is left to queries, e.g. `sum without (worker) (rate(http_requests_total[5m]))`.
+    """
+
+    families: dict[str, MetricSnapshot] = {}
+    for worker, snapshots in worker_snapshots.items():
+        for snapshot in snapshots:
+            family = families.setdefault(
+                snapshot["name"], {**snapshot, "label_names": [*snapshot["label_names"], "worker"], "samples": []}
+            )
+            family["samples"].extend([[*labels, worker], value] for labels, value in snapshot["samples"])
+
+    return list(families.values())
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: typing.Iterable[str], labels: typing.Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape_label_value(str(value))}"' for name, value in zip(label_names, labels)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_prometheus(snapshots: typing.Iterable[MetricSnapshot]) -> str:
+    """Render snapshots in the Prometheus text exposition format."""
+
+    lines = []
+    for family in snapshots:
+        name, label_names = family["name"], family["label_names"]
+        lines.append(f"# HELP {name} {family['documentation']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+
+        for labels, value in family["samples"]:
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(label_names, labels)} {value}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip((*map(str, value["buckets"]), "+Inf"), value["counts"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels((*label_names, 'le'), (*labels, bound))} {cumulative}")
+
+            lines.append(f"{name}_sum{_format_labels(label_names, labels)} {value['sum']}")
+            lines.append(f"{name}_count{_format_labels(label_names, labels)} {value['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+@dataclasses.dataclass
+class RequestStats:
+    """Work done by the current request, filled by database and Redis instrumentation."""
+
+    db_statements: int = 0
+    db_seconds: float = 0
+    redis_commands: int = 0
+    redis_seconds: float = 0
+
+
+request_stats: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar("request_stats", default=None)
+
+HTTP_REQUESTS = CounterMetric("http_requests_total", "Handled HTTP requests.", ("method", "route", "status"))
+HTTP_REQUEST_DURATION = HistogramMetric("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+HTTP_REQUESTS_IN_PROGRESS = GaugeMetric("http_requests_in_progress", "HTTP requests being handled.", ("method",))
+HTTP_RESPONSE_SIZE = HistogramMetric(
+    "http_response_size_bytes", "HTTP response body size.", ("method", "route"), buckets=SIZE_BUCKETS_BYTES
+)
+HTTP_REQUEST_DB_STATEMENTS = HistogramMetric(
+    "http_request_db_statements", "SQL statements per HTTP request.", ("route",), buckets=COUNT_BUCKETS
+)
+HTTP_REQUEST_DB_DURATION = HistogramMetric(
+    "http_request_db_duration_seconds", "Time spent in SQL per HTTP request.", ("route",)
+)
+HTTP_REQUEST_REDIS_COMMANDS = HistogramMetric(
+    "http_request_redis_commands", "Redis round-trips per HTTP request.", ("route",), buckets=COUNT_BUCKETS
+)
+HTTP_REQUEST_REDIS_DURATION = HistogramMetric(
+    "http_request_redis_duration_seconds", "Time spent in Redis per HTTP request.", ("route",)
+)
+
+CPU_EXECUTOR_TASKS = GaugeMetric("cpu_executor_tasks", "Calls in the CPU executor.", ("state",))
+CPU_EXECUTOR_CALLS = CounterMetric("cpu_executor_calls_total", "Finished CPU executor calls.", ("outcome",))
+EVENT_LOOP_LAG = HistogramMetric("event_loop_lag_seconds", "How late the event loop runs a scheduled wake-up.")
@@ -0,0 +1,68 @@
+"""Access tokens and secret hashing."""
+
+import hashlib
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from passlib.context import CryptContext
+
+from core.config import settings
+from core.constants import (
+    SECRET_VERIFICATION_CACHE_MAX_SIZE,
+    SECRET_VERIFICATION_CACHE_TTL_SECONDS,
+)
+from core.executor import run_cpu_bound
+from db.local_cache import LocalCache
+
+secret_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Keyed by a digest of the secret and its hash, neither is kept in memory. Failures are never cached,
+# so guessing keeps paying for bcrypt.
+verified_secrets = LocalCache(
+    max_size=SECRET_VERIFICATION_CACHE_MAX_SIZE, ttl_seconds=SECRET_VERIFICATION_CACHE_TTL_SECONDS
+)
+
+
+def _get_serializer() -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(settings().AUTH_SECRET_KEY, salt="access-token")
+
+
+def create_access_token(user_id: int) -> str:
+    return _get_serializer().dumps({"sub": user_id})
+
+
+def read_access_token(token: str) -> int | None:
+    """User id of a valid token, None if it is forged, malformed or older than `ACCESS_TOKEN_TTL_SECONDS`."""
+
+    try:
+        claims = _get_serializer().loads(token, max_age=settings().ACCESS_TOKEN_TTL_SECONDS)
+    except BadSignature:
+        return None
+
+    return claims.get("sub") if isinstance(claims, dict) else None
+
+
+# Module-level wrappers: bound methods of `secret_context` do not pickle for `CPU_EXECUTOR_KIND=process`.
+def _hash(secret: str) -> str:
+    return secret_context.hash(secret)
+
+
+def _verify(secret: str, hashed: str) -> bool:
+    return secret_context.verify(secret, hashed)
+
+
+async def hash_secret(secret: str) -> str:
+    return await run_cpu_bound(_hash, secret)
+
+
+async def verify_secret(secret: str, hashed: str) -> bool:
+    """bcrypt check of an API key style secret, reusing recent successes instead of hashing again."""
+
+    key = hashlib.blake2b(f"{hashed}\0{secret}".encode(), digest_size=32).hexdigest()
+    if verified_secrets.get(key):
+        return True
+
+    verified = await run_cpu_bound(_verify, secret, hashed)
+    if verified:
+        verified_secrets.set(key, True)
+
+    return verified
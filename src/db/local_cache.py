@@ -0,0 +1,120 @@
+import asyncio
+import collections
+import time
+import typing
+import weakref
+
+from loguru import logger
+
+from core.constants import INSTANCE_ID, LOCAL_CACHE_INVALIDATION_CHANNEL
+from db.redis import AsyncRedis, get_reconnect_delay
+
+_caches: weakref.WeakSet["LocalCache"] = weakref.WeakSet()
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry TTL, used as L1 in front of Redis."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 5) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: collections.OrderedDict[str, tuple[float, typing.Any]] = collections.OrderedDict()
+
+        _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> typing.Any | None:
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: typing.Any, ttl_seconds: float | None = None) -> None:
+        """Store `value`, never keeping it longer than `ttl_seconds` (the remaining Redis TTL) if given."""
+
+        ttl = self.ttl_seconds if ttl_seconds is None else min(self.ttl_seconds, ttl_seconds)
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def invalidation_message(*keys: str) -> str:
+    """Build a message for `LOCAL_CACHE_INVALIDATION_CHANNEL` dropping `keys` on other workers."""
+
+    return " ".join((INSTANCE_ID, *keys))
+
+
+def clear_local_caches() -> None:
+    for cache in _caches:
+        cache.clear()
+
+
+def _invalidate(data: str) -> None:
+    instance_id, *keys = data.split(" ")
+    if instance_id == INSTANCE_ID:
+        return
+
+    for cache in _caches:
+        cache.invalidate(*keys)
+
+    logger.debug("Local cache invalidated {} keys from {}", len(keys), instance_id)
+
+
+async def listen_invalidations(redis: AsyncRedis) -> None:
+    """Drop keys invalidated by other workers from every local cache of this process.
+
+    The subscription is reopened with backoff whenever it fails. Keys invalidated while it was down are unknown,
+    so local caches are cleared once it is back.
+    """
+
+    failures = 0
+    while True:
+        try:
+            async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(LOCAL_CACHE_INVALIDATION_CHANNEL)
+                if failures:
+                    clear_local_caches()
+                    logger.info("Local cache invalidations resubscribed after {} failures", failures)
+                    failures = 0
+
+                async for message in pubsub.listen():
+                    _invalidate(message["data"])
+        except Exception as exc:
+            failures += 1
+            delay = get_reconnect_delay(failures)
+            logger.warning("Local cache invalidations failed: {!r}, resubscribing in {:.1f}s", exc, delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,71 @@
+"""In-process fallback for rate limits while Redis is unreachable, counting per worker only."""
+
+import collections
+import math
+import time
+import typing
+
+from core.constants import LOCAL_RATE_LIMIT_MAX_KEYS
+from core.enums import RateLimitAlgorithmEnum
+from schemas.rate_limit import RateLimitSchema
+
+
+class LocalRateLimiter:
+    """Same interface as `RateLimitRedisRepository`, keeping the `max_keys` most recently used keys."""
+
+    def __init__(self, max_keys: int = LOCAL_RATE_LIMIT_MAX_KEYS) -> None:
+        self.max_keys = max_keys
+        self._state: collections.OrderedDict[str, typing.Any] = collections.OrderedDict()
+
+    def _get(self, key: str, default: typing.Callable[[], typing.Any]) -> typing.Any:
+        value = self._state.get(key)
+        if value is None:
+            value = self._state[key] = default()
+            if len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+
+        return value
+
+    def _hit_sliding_window(self, key: str, rate_limit: RateLimitSchema, now: float) -> float:
+        window: collections.deque[float] = self._get(key, collections.deque)
+        while window and window[0] <= now - rate_limit.period_seconds:
+            window.popleft()
+
+        if len(window) < rate_limit.limit:
+            window.append(now)
+            return 0
+
+        return window[0] + rate_limit.period_seconds - now
+
+    def _hit_token_bucket(self, key: str, rate_limit: RateLimitSchema, now: float) -> float:
+        bucket = self._get(key, lambda: [float(rate_limit.limit), now])
+        rate = rate_limit.limit / rate_limit.period_seconds
+        bucket[0] = min(rate_limit.limit, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0
+
+        return math.ceil((1 - bucket[0]) / rate * 1000) / 1000
+
+    async def hit(self, key: str, rate_limit: RateLimitSchema) -> float:
+        if rate_limit.algorithm == RateLimitAlgorithmEnum.TOKEN_BUCKET:
+            return self._hit_token_bucket(key, rate_limit, time.monotonic())
+
+        return self._hit_sliding_window(key, rate_limit, time.monotonic())
+
+    async def acquire_slot(self, key: str, max_requests: int, lease_id: str, lease_seconds: float) -> bool:
+        leases: set[str] = self._get(key, set)
+        if len(leases) >= max_requests:
+            return False
+
+        leases.add(lease_id)
+        return True
+
+    async def release_slot(self, key: str, lease_id: str) -> None:
+        leases = self._state.get(key)
+        if leases is not None:
+            leases.discard(lease_id)
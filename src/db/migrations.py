@@ -0,0 +1,152 @@
+"""
+Helpers for migrations of large tables that keep them writable.
+
+Usage in a migration:
+def upgrade() -> None:
+    op.add_column("reviews", sa.Column("score", sa.Integer(), nullable=True))
+    backfill("reviews", {"score": sa.text("0")}, sa.text("score IS NULL"))
+    create_index_concurrently("reviews_reviewer_id_quarter_id_idx", "reviews", ["reviewer_id", "quarter_id"])
+
+
+def downgrade() -> None:
+    drop_index_concurrently("reviews_reviewer_id_quarter_id_idx", "reviews")
+    op.drop_column("reviews", "score")
+"""
+
+import time
+import typing
+
+import sqlalchemy as sa
+from alembic import op
+from loguru import logger
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from core.config import settings
+
+
+def set_timeouts(connection: Connection, lock_timeout_seconds: float, statement_timeout_seconds: float) -> None:
+    """Set timeouts of the session, 0 disables one. They outlive transactions, unlike SET LOCAL."""
+
+    connection.exec_driver_sql(f"SET lock_timeout = {int(lock_timeout_seconds * 1000)}")
+    connection.exec_driver_sql(f"SET statement_timeout = {int(statement_timeout_seconds * 1000)}")
+
+
+def set_default_timeouts(connection: Connection) -> None:
+    set_timeouts(connection, settings().MIGRATION_LOCK_TIMEOUT_SECONDS, settings().MIGRATION_STATEMENT_TIMEOUT_SECONDS)
+
+
+def _index(
+    index_name: str,
+    table_name: str,
+    columns: typing.Sequence[str | sa.TextClause] = (),
+    schema: str | None = None,
+    **kwargs: typing.Any,
+) -> sa.Index:
+    # Built for CreateIndex/DropIndex: `if_not_exists`/`if_exists` of `op.create_index`/`op.drop_index`
+    # need alembic 1.12, the pinned one is older.
+    table = sa.Table(
+        table_name, sa.MetaData(), *(sa.Column(column) for column in columns if isinstance(column, str)), schema=schema
+    )
+    expressions = [table.c[column] if isinstance(column, str) else column for column in columns]
+    return sa.Index(index_name, *expressions, _table=table, postgresql_concurrently=True, **kwargs)
+
+
+def _drop_invalid_index(connection: Connection, index_name: str, table_name: str, schema: str | None) -> None:
+    # An interrupted CREATE INDEX CONCURRENTLY leaves an invalid index behind, IF NOT EXISTS would keep it.
+    qualified_name = f"{schema}.{index_name}" if schema else index_name
+    is_valid = connection.scalar(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": qualified_name}
+    )
+    if is_valid is False:
+        op.execute(DropIndex(_index(index_name, table_name, schema=schema), if_exists=True))
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: typing.Sequence[str | sa.TextClause], **kwargs: typing.Any
+) -> None:
+    """CREATE INDEX CONCURRENTLY outside of the migration transaction, writes to the table go on meanwhile.
+
+    `kwargs` go to `sa.Index`, e.g. `unique=True` or `postgresql_where=sa.text("is_active")`.
+    """
+
+    index = _index(index_name, table_name, columns, **kwargs)
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        _drop_invalid_index(connection, index_name, table_name, kwargs.get("schema"))
+        # Building takes as long as the table is large, only the wait for its lock is limited.
+        set_timeouts(connection, settings().MIGRATION_LOCK_TIMEOUT_SECONDS, 0)
+        try:
+            op.execute(CreateIndex(index, if_not_exists=True))
+        finally:
+            set_default_timeouts(connection)
+
+
+def drop_index_concurrently(index_name: str, table_name: str, schema: str | None = None) -> None:
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        set_timeouts(connection, settings().MIGRATION_LOCK_TIMEOUT_SECONDS, 0)
+        try:
+            op.execute(DropIndex(_index(index_name, table_name, schema=schema), if_exists=True))
+        finally:
+            set_default_timeouts(connection)
+
+
+def _update_batch(
+    connection: Connection,
+    table: sa.TableClause,
+    key: str,
+    values: dict[str, typing.Any],
+    where: sa.ColumnElement[bool] | sa.TextClause | None,
+    after: typing.Any,
+    batch_size: int,
+) -> list[typing.Any]:
+    key_column = table.c[key]
+    batch = sa.select(key_column).order_by(key_column).limit(batch_size)
+    if where is not None:
+        batch = batch.where(where)
+    # Keyset pagination, each batch starts after the last updated key instead of scanning from the start.
+    if after is not None:
+        batch = batch.where(key_column > after)
+
+    stmt = sa.update(table).values(values).where(key_column.in_(batch.scalar_subquery())).returning(key_column)
+    return list(connection.scalars(stmt).all())
+
+
+def backfill(
+    table_name: str,
+    values: dict[str, typing.Any],
+    where: sa.ColumnElement[bool] | sa.TextClause | None = None,
+    key: str = "id",
+    batch_size: int | None = None,
+    sleep_seconds: float | None = None,
+) -> int:
+    """UPDATE rows matching `where` in batches ordered by the unique `key` column, committing each one.
+
+    Every batch locks at most `batch_size` rows for one short transaction, so the statement timeout still applies.
+    `where` should stop matching updated rows, so that a rerun after an interruption skips them.
+    """
+
+    if op.get_context().as_sql:
+        raise RuntimeError("Backfills read their progress from the database, run them online")
+
+    batch_size = batch_size or settings().MIGRATION_BACKFILL_BATCH_SIZE
+    sleep_seconds = settings().MIGRATION_BACKFILL_SLEEP_SECONDS if sleep_seconds is None else sleep_seconds
+    table = sa.table(table_name, sa.column(key), *(sa.column(name) for name in values))
+
+    updated, last_key, started_at = 0, None, time.perf_counter()
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        while keys := _update_batch(connection, table, key, values, where, last_key, batch_size):
+            updated, last_key = updated + len(keys), max(keys)
+            logger.info(
+                "Backfilled {} rows of {} up to {}={}, {:.0f} rows/s",
+                updated,
+                table_name,
+                key,
+                last_key,
+                updated / (time.perf_counter() - started_at),
+            )
+            time.sleep(sleep_seconds)
+
+    return updated
@@ -19,6 +19,7 @@ class SomeModel(BaseModel):
 __all__ = (
     "BaseModel",
     "Review",
+    "ReviewSummary",
     "Quarter",
     "Template",
     "DepartmentTemplate",
@@ -38,5 +39,6 @@ from db.models.department_user import DepartmentUser
 from db.models.quarter import Quarter
 from db.models.question import Question
 from db.models.review import Review
+from db.models.review_summary import ReviewSummary
 from db.models.template import Template
 from db.models.example import User
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.models.base import BaseModel
+
+
+class ReviewSummary(BaseModel):
+    """Review counters of a quarter, department and template, maintained by `AnalyticsService`.
+
+    No foreign keys: counters are written in the transactions of reviews and answers,
+    and must not lock their parent rows. `metric` is `<kind>:<key>`, e.g. `reviews_by_status:done`.
+    """
+
+    quarter_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    department_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    template_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    metric: Mapped[str] = mapped_column(String(length=255), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __str__(self) -> str:
+        return f"Review summary {self.quarter_id}/{self.department_id}/{self.template_id} {self.metric}"
@@ -0,0 +1,63 @@
+import time
+import typing
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from core.metrics import GaugeMetric, Histogram, HistogramMetric, MetricSnapshot
+from schemas.metrics import HistogramSchema, PoolStatsSchema
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long checkouts wait and how long new connections take to open."""
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram()
+        self.connect_seconds = Histogram()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - started_at)
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            self.connect_seconds.observe(time.perf_counter() - started_at)
+
+    def stats(self) -> PoolStatsSchema:
+        return PoolStatsSchema(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=max(self.overflow(), 0),
+            wait_seconds=HistogramSchema.from_histogram(self.wait_seconds),
+            connect_seconds=HistogramSchema.from_histogram(self.connect_seconds),
+        )
+
+    def metrics(self) -> list[MetricSnapshot]:
+        stats = self.stats()
+        snapshots = []
+
+        for name, documentation, value in (
+            ("db_pool_size", "Connections kept open by the pool.", stats.size),
+            ("db_pool_checked_out", "Connections in use.", stats.checked_out),
+            ("db_pool_overflow", "Connections opened above the pool size.", stats.overflow),
+        ):
+            gauge = GaugeMetric(name, documentation, register=False)
+            gauge.set(value)
+            snapshots.append(gauge.snapshot())
+
+        for name, documentation, histogram in (
+            ("db_pool_wait_seconds", "Time to check a connection out.", self.wait_seconds),
+            ("db_pool_connect_seconds", "Time to open a new connection.", self.connect_seconds),
+        ):
+            metric = HistogramMetric(name, documentation, register=False)
+            metric.samples[()] = histogram
+            snapshots.append(metric.snapshot())
+
+        return snapshots
@@ -0,0 +1,98 @@
+"""
+For counting SQL statements of a request and spotting N+1 patterns.
+
+Usage:
+with track_queries(max_queries=3) as tracker:
+    await template_service.get_all()
+
+print(tracker.count, tracker.repeated(threshold=2))
+"""
+
+import collections
+import contextlib
+import contextvars
+import dataclasses
+import re
+import typing
+
+from core.config import settings
+
+# Bind parameters, quoted strings and numbers: statements differing only in them share a shape.
+_VALUE = re.compile(r"\$\d+|%\(\w+\)s|%s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# `IN ($1, $2, ...)` lists of any length.
+_VALUE_LIST = re.compile(r"\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceededError(Exception):
+    pass
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _VALUE.sub("?", statement)
+    statement = _VALUE_LIST.sub("?, ...", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclasses.dataclass
+class QueryTracker:
+    """Statements executed in the current context, also recorded by enclosing trackers."""
+
+    parent: "QueryTracker | None" = None
+    statements: list[str] = dataclasses.field(default_factory=list)
+    # Driver parameters of each statement, e.g. to EXPLAIN it again in tests.
+    parameters: list[typing.Any] = dataclasses.field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str, parameters: typing.Any = None) -> None:
+        tracker: QueryTracker | None = self
+        while tracker is not None:
+            tracker.statements.append(statement)
+            tracker.parameters.append(parameters)
+            tracker = tracker.parent
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Return statement shapes executed at least `threshold` times, the usual sign of N+1 loading."""
+
+        shapes = collections.Counter(map(normalize_statement, self.statements))
+        return {shape: count for shape, count in shapes.most_common() if count >= threshold}
+
+    def problems(self, max_queries: int | None, repeated_threshold: int) -> list[str]:
+        problems = []
+        if max_queries is not None and self.count > max_queries:
+            problems.append(f"{self.count} statements executed, budget is {max_queries}")
+
+        for shape, count in self.repeated(repeated_threshold).items():
+            problems.append(f"N+1 suspected, executed {count} times: {shape}")
+
+        return problems
+
+
+query_tracker: contextvars.ContextVar[QueryTracker | None] = contextvars.ContextVar("query_tracker", default=None)
+
+
+def record_statement(statement: str, parameters: typing.Any = None) -> None:
+    tracker = query_tracker.get()
+    if tracker is not None:
+        tracker.record(statement, parameters)
+
+
+@contextlib.contextmanager
+def track_queries(
+    max_queries: int | None = None, repeated_threshold: int | None = None
+) -> typing.Iterator[QueryTracker]:
+    """Track statements of the block, raise `QueryBudgetExceededError` if it breaks the budget."""
+
+    tracker = QueryTracker(parent=query_tracker.get())
+    token = query_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        query_tracker.reset(token)
+
+    problems = tracker.problems(max_queries, repeated_threshold or settings().SQL_REPEATED_STATEMENT_THRESHOLD)
+    if problems:
+        raise QueryBudgetExceededError("\n".join(problems))
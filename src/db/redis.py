@@ -1,9 +1,19 @@
+import asyncio
 import functools
+import random
+import time
 import typing
 
-from redis.asyncio import Redis, from_url
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
 
 from core.config import settings
+from core.constants import (
+    REDIS_RECONNECT_BACKOFF_MAX_SECONDS,
+    REDIS_RECONNECT_BACKOFF_SECONDS,
+)
+from core.metrics import request_stats
 
 if typing.TYPE_CHECKING:
     AsyncRedis: typing.TypeAlias = Redis[typing.Any]
@@ -11,11 +21,80 @@ else:
     AsyncRedis: typing.TypeAlias = Redis
 
 
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list[typing.Any]:
+        stats = request_stats.get()
+        if stats is None:
+            return await super().execute(raise_on_error)
+
+        started_at = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            stats.redis_commands += 1
+            stats.redis_seconds += time.perf_counter() - started_at
+
+
+class InstrumentedRedis(Redis):
+    """Client adding its round-trips to the stats of the current request."""
+
+    async def execute_command(self, *args: typing.Any, **options: typing.Any) -> typing.Any:
+        stats = request_stats.get()
+        if stats is None:
+            return await super().execute_command(*args, **options)
+
+        started_at = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            stats.redis_commands += 1
+            stats.redis_seconds += time.perf_counter() - started_at
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
 @functools.lru_cache
 def get_redis_connection() -> AsyncRedis:
-    return from_url(settings().REDIS_DSN, encoding="utf-8", decode_responses=True)
+    return InstrumentedRedis.from_url(settings().REDIS_DSN, encoding="utf-8", decode_responses=True)
+
+
+async def get_redis() -> AsyncRedis:
+    # The client is shared by all requests, closing it here would disconnect the pool under others.
+    return get_redis_connection()
+
+
+async def warm_up_redis(redis: AsyncRedis, connections: int) -> None:
+    """Open `connections` pooled connections up front, so first requests skip connecting."""
+
+    pool = redis.connection_pool
+    acquired = await asyncio.gather(*(pool.get_connection("PING") for _ in range(connections)))
+    try:
+        for connection in acquired:
+            await connection.send_command("PING")
+            await connection.read_response()
+    finally:
+        for connection in acquired:
+            await pool.release(connection)
+
+
+def lua_script(source: str) -> AsyncScript:
+    """Script built once at import, run it with `await script(keys=..., args=..., client=redis)`.
+
+    Encoding the source up front lets the SHA be computed without a client. The first call on a server
+    without the script loads it, later ones only send EVALSHA.
+    """
+
+    return AsyncScript(None, source.encode())  # type: ignore[arg-type]
+
+
+def get_reconnect_delay(failures: int) -> float:
+    """Exponential backoff with jitter, so workers losing Redis together do not reconnect together."""
+
+    delay = min(REDIS_RECONNECT_BACKOFF_SECONDS * 2 ** (failures - 1), REDIS_RECONNECT_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1)
 
 
-async def get_redis() -> typing.AsyncGenerator[AsyncRedis, None]:
-    async with get_redis_connection() as redis:
-        yield redis
+async def close_redis() -> None:
+    await get_redis_connection().close()
+    get_redis_connection.cache_clear()
@@ -17,4 +17,14 @@ class SomeModelDatabaseRepository(BaseDatabaseRepository):
 
         return instance
 
+    async def get_all(self) -> list[SomeModel]:
+        # Read-only queries may use `_read_session`, which is served by a replica when configured.
+        return (await self._read_session.scalars(select(SomeModel))).all()
+
+Generic repository example, with get_many/paginate/stream/bulk_create/bulk_upsert:
+from db.repositories.base import BaseModelDatabaseRepository
+
+
+class SomeModelDatabaseRepository(BaseModelDatabaseRepository[SomeModel]):
+    model = SomeModel
 """
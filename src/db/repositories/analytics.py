@@ -0,0 +1,6 @@
+from db.models import ReviewSummary
+from db.repositories.summary import SummaryRepository
+
+
+class ReviewSummaryRepository(SummaryRepository[ReviewSummary]):
+    model = ReviewSummary
@@ -3,23 +3,182 @@ from uuid import uuid4
 
 from fastapi import Depends
 from pydantic import ValidationError
+from redis.asyncio.client import Pipeline
+from sqlalchemy import ColumnElement, Insert, insert, inspect, select, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
 
+from core.constants import (
+    BULK_INSERT_BATCH_SIZE,
+    LOCAL_CACHE_INVALIDATION_CHANNEL,
+    POSTGRES_MAX_BIND_PARAMETERS,
+)
+from db.local_cache import LocalCache, invalidation_message
 from db.redis import AsyncRedis, get_redis
-from db.session import get_session
+from db.session import get_read_session, get_session
 from schemas.base import BaseKeySchema, BaseOrmSchema
 
 
 class BaseDatabaseRepository:
     _session: AsyncSession
+    # Methods opt in to replicas by querying `_read_session`, everything else stays on the primary.
+    _read_session: AsyncSession
 
-    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        read_session: AsyncSession = Depends(get_read_session),
+    ) -> None:
         self._session = session
+        # Repositories built by hand without a read session read from the primary.
+        self._read_session = read_session if isinstance(read_session, AsyncSession) else session
+
+
+ModelT = typing.TypeVar("ModelT", bound=DeclarativeBase)
+
+
+class BaseModelDatabaseRepository(BaseDatabaseRepository, typing.Generic[ModelT]):
+    """Generic queries over `model` that avoid loading whole tables and per-row round-trips."""
+
+    model: typing.Type[ModelT]
+
+    @property
+    def _primary_key(self) -> tuple[InstrumentedAttribute[typing.Any], ...]:
+        return tuple(getattr(self.model, column.key) for column in inspect(self.model).primary_key)
+
+    def _get_identity(self, instance: ModelT) -> typing.Any:
+        identity = tuple(getattr(instance, column.key) for column in self._primary_key)
+        return identity if len(identity) > 1 else identity[0]
+
+    def _primary_key_in(self, ids: typing.Sequence[typing.Any]) -> ColumnElement[bool]:
+        primary_key = self._primary_key
+        if len(primary_key) > 1:
+            return tuple_(*primary_key).in_(ids)
+
+        return primary_key[0].in_(ids)
+
+    async def get_many(self, ids: typing.Sequence[typing.Any]) -> list[ModelT]:
+        """Fetch instances by primary key with one IN query, in the order of `ids`, skipping missing ones.
+
+        Ids of models with a composite primary key are tuples of its columns in the model order.
+        """
+
+        if not ids:
+            return []
+
+        instances = (await self._session.scalars(select(self.model).where(self._primary_key_in(ids)))).all()
+
+        instances_by_id = {self._get_identity(instance): instance for instance in instances}
+        return [instances_by_id[id_] for id_ in ids if id_ in instances_by_id]
+
+    async def paginate(
+        self,
+        limit: int,
+        after: typing.Sequence[typing.Any] | None = None,
+        order_by: typing.Sequence[InstrumentedAttribute[typing.Any]] = (),
+        where: typing.Sequence[ColumnElement[bool]] = (),
+        descending: bool = False,
+    ) -> tuple[list[ModelT], tuple[typing.Any, ...] | None]:
+        """Keyset pagination, return a page and the cursor of the next one (None on the last page).
+
+        `order_by` must be unique and covered by an index, append the primary key to non-unique columns.
+        """
+
+        columns = tuple(order_by) or self._primary_key
+        stmt = (
+            select(self.model)
+            .where(*where)
+            .order_by(*(column.desc() if descending else column for column in columns))
+            .limit(limit)
+        )
+
+        if after is not None:
+            keyset, cursor = tuple_(*columns), tuple_(*after)
+            stmt = stmt.where(keyset < cursor if descending else keyset > cursor)
+
+        instances = list((await self._session.scalars(stmt)).all())
+        if len(instances) < limit:
+            return instances, None
+
+        return instances, tuple(getattr(instances[-1], column.key) for column in columns)
+
+    async def stream(
+        self,
+        *where: ColumnElement[bool],
+        order_by: typing.Sequence[InstrumentedAttribute[typing.Any]] = (),
+        yield_per: int = 1000,
+    ) -> typing.AsyncIterator[ModelT]:
+        """Iterate over a server-side cursor, holding at most `yield_per` rows in memory."""
+
+        stmt = select(self.model).where(*where).order_by(*order_by).execution_options(yield_per=yield_per)
+
+        async for instance in await self._session.stream_scalars(stmt):
+            yield instance
+
+    async def _insert_many(self, stmt: Insert, values: typing.Sequence[dict[str, typing.Any]]) -> None:
+        """Run `stmt` as multi-row INSERTs of `values`, which share their keys.
+
+        Without RETURNING, SQLAlchemy's insertmanyvalues is off for asyncpg and passing `values` as parameters
+        would run an executemany, one INSERT per row.
+        """
+
+        batch_size = max(min(BULK_INSERT_BATCH_SIZE, POSTGRES_MAX_BIND_PARAMETERS // len(values[0])), 1)
+        for start in range(0, len(values), batch_size):
+            end = start + batch_size
+            await self._session.execute(stmt.values(list(values[start:end])))
+
+    async def bulk_create(self, values: typing.Sequence[dict[str, typing.Any]], returning: bool = True) -> list[ModelT]:
+        """Insert rows with multi-row INSERT statements, with or without RETURNING."""
+
+        if not values:
+            return []
+
+        stmt = insert(self.model)
+        if not returning:
+            await self._insert_many(stmt, values)
+            return []
+
+        return list((await self._session.scalars(stmt.returning(self.model), values)).all())
+
+    async def bulk_upsert(
+        self,
+        values: typing.Sequence[dict[str, typing.Any]],
+        index_elements: typing.Sequence[str],
+        update_fields: typing.Sequence[str] | None = None,
+        returning: bool = True,
+    ) -> list[ModelT]:
+        """Multi-row INSERT ... ON CONFLICT (`index_elements`) DO UPDATE, by default of every other passed field."""
+
+        if not values:
+            return []
+
+        stmt = postgresql.insert(self.model)
+        if update_fields is None:
+            update_fields = [field for field in values[0] if field not in index_elements]
+
+        if update_fields:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={field: stmt.excluded[field] for field in update_fields},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+        if not returning:
+            await self._insert_many(stmt, values)
+            return []
+
+        stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+        return list((await self._session.scalars(stmt, values)).all())
 
 
 class BaseRedisRepository:
     schema: typing.Type[BaseOrmSchema]
     key_schema: BaseKeySchema
+    # Optional L1 cache shared by all instances of the repository class, e.g. LocalCache(max_size=1024).
+    # It holds validated models, so callers must not mutate what `get`/`get_many` return.
+    local_cache: LocalCache | None = None
 
     def __init__(self, session: AsyncRedis = Depends(get_redis)) -> None:
         self._session = session
@@ -27,18 +186,72 @@ class BaseRedisRepository:
     def get_key(self, uuid: str):
         return self.key_schema.get_key(uuid)
 
-    async def get(self, uuid: str) -> BaseOrmSchema | None:
-        value = await self._session.get(self.get_key(uuid=uuid))
-
+    def _parse(self, value: str | None) -> BaseOrmSchema | None:
         try:
             return self.schema.model_validate_json(str(value))
         except ValidationError:
             return None
 
-    async def set(self, model: BaseOrmSchema, expiration_seconds: int | None = None) -> str:
+    def _check_model(self, model: BaseOrmSchema) -> None:
         if not isinstance(model, self.schema):
             raise ValueError("Model scheme is not similar with repository scheme")
 
+    async def get(self, uuid: str) -> BaseOrmSchema | None:
+        if self.local_cache is not None:
+            return (await self.get_many([uuid]))[0]
+
+        value = await self._session.get(self.get_key(uuid=uuid))
+        return self._parse(value)
+
+    async def _get_many_cached(self, local_cache: LocalCache, keys: list[str]) -> list[BaseOrmSchema | None]:
+        models = [local_cache.get(key) for key in keys]
+        missed = [index for index, model in enumerate(models) if model is None]
+        if not missed:
+            return models
+
+        # Remaining TTLs come in the same round-trip so that local entries never outlive Redis ones.
+        async with self._session.pipeline(transaction=False) as pipe:
+            pipe.mget([keys[index] for index in missed])
+            for index in missed:
+                pipe.pttl(keys[index])
+
+            values, *ttls = await pipe.execute()
+
+        for index, value, ttl in zip(missed, values, ttls):
+            model = models[index] = self._parse(value)
+            if model is not None:
+                local_cache.set(keys[index], model, ttl / 1000 if ttl > 0 else None)
+
+        return models
+
+    async def get_many(self, uuids: typing.Sequence[str]) -> list[BaseOrmSchema | None]:
+        """Fetch several models with one MGET, keeping the order of `uuids`."""
+
+        if not uuids:
+            return []
+
+        keys = [self.get_key(uuid=uuid) for uuid in uuids]
+        if self.local_cache is None:
+            values = await self._session.mget(keys)
+            return [self._parse(value) for value in values]
+
+        return await self._get_many_cached(self.local_cache, keys)
+
+    @staticmethod
+    def _pipe_set(pipe: Pipeline, key: str, model: BaseOrmSchema, expiration_seconds: int | None) -> None:
+        value = model.model_dump_json()
+        if expiration_seconds:
+            pipe.setex(name=key, time=expiration_seconds, value=value)
+        else:
+            pipe.set(name=key, value=value)
+
+    def _cache_locally(self, key: str, model: BaseOrmSchema, expiration_seconds: int | None) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set(key, model, expiration_seconds)
+
+    async def set(self, model: BaseOrmSchema, expiration_seconds: int | None = None) -> str:
+        self._check_model(model)
+
         uuid = str(uuid4())
         key = self.get_key(uuid=uuid)
         value = model.model_dump_json()
@@ -48,7 +261,51 @@ class BaseRedisRepository:
         else:
             await self._session.set(name=key, value=value)
 
+        # The key is always new, so there is nothing to invalidate on other workers.
+        self._cache_locally(key, model, expiration_seconds)
+
         return uuid
 
+    async def set_many(
+        self,
+        models: typing.Sequence[BaseOrmSchema],
+        expiration_seconds: int | None = None,
+        transaction: bool = True,
+    ) -> list[str]:
+        """Store several models in one pipeline round-trip, return their uuids in input order."""
+
+        for model in models:
+            self._check_model(model)
+
+        uuids = [str(uuid4()) for _ in models]
+        if not uuids:
+            return uuids
+
+        async with self._session.pipeline(transaction=transaction) as pipe:
+            for uuid, model in zip(uuids, models):
+                self._pipe_set(pipe, self.get_key(uuid=uuid), model, expiration_seconds)
+
+            await pipe.execute()
+
+        for uuid, model in zip(uuids, models):
+            self._cache_locally(self.get_key(uuid=uuid), model, expiration_seconds)
+
+        return uuids
+
     async def delete(self, uuid: str) -> None:
-        await self._session.delete(self.get_key(uuid=uuid))
+        await self.delete_many([uuid])
+
+    async def delete_many(self, uuids: typing.Sequence[str]) -> None:
+        if not uuids:
+            return
+
+        keys = [self.get_key(uuid=uuid) for uuid in uuids]
+        if self.local_cache is None:
+            await self._session.delete(*keys)
+            return
+
+        self.local_cache.invalidate(*keys)
+        async with self._session.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            pipe.publish(LOCAL_CACHE_INVALIDATION_CHANNEL, invalidation_message(*keys))
+            await pipe.execute()
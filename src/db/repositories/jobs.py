@@ -0,0 +1,183 @@
+import datetime
+import typing
+from uuid import uuid4
+
+from fastapi import Depends
+
+from core.constants import JOB_TTL_SECONDS
+from core.enums import JobStatusEnum
+from db.redis import AsyncRedis, get_redis, lua_script
+from schemas.base import RedisKeySchema
+from schemas.jobs import JobSchema
+
+# Requeues retries whose backoff passed and jobs whose worker stopped renewing the lease,
+# then pops up to ARGV[1] jobs and leases them for ARGV[2] milliseconds.
+DEQUEUE_SCRIPT = lua_script(
+    """
+local time = redis.call("time")
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+
+for _, key in ipairs({KEYS[2], KEYS[3]}) do
+    local due = redis.call("zrangebyscore", key, "-inf", now, "limit", 0, 1000)
+    if #due > 0 then
+        redis.call("zrem", key, unpack(due))
+        redis.call("lpush", KEYS[1], unpack(due))
+    end
+end
+
+local ids = redis.call("rpop", KEYS[1], ARGV[1])
+if not ids then
+    return {}
+end
+
+for _, id in ipairs(ids) do
+    redis.call("zadd", KEYS[3], now + tonumber(ARGV[2]), id)
+end
+return ids
+"""
+)
+
+# Scores are in Redis time, like the ones compared in DEQUEUE_SCRIPT: ZADD KEYS[1] ARGV[3] (now + ARGV[2]) ARGV[1].
+SCHEDULE_SCRIPT = lua_script(
+    """
+local time = redis.call("time")
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+return redis.call("zadd", KEYS[1], ARGV[3], now + tonumber(ARGV[2]), ARGV[1])
+"""
+)
+
+# Stores job ARGV[1] with state ARGV[2] in KEYS[1] and queues it in KEYS[2], both kept ARGV[3] seconds.
+# With an idempotency key in KEYS[3], the id of a job already stored under it is returned instead,
+# the key is never overwritten.
+ENQUEUE_SCRIPT = lua_script(
+    """
+if KEYS[3] then
+    local existing = redis.call("get", KEYS[3])
+    if existing then
+        return existing
+    end
+    redis.call("set", KEYS[3], ARGV[1], "ex", ARGV[3])
+end
+
+redis.call("set", KEYS[1], ARGV[2], "ex", ARGV[3])
+redis.call("lpush", KEYS[2], ARGV[1])
+return ARGV[1]
+"""
+)
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(tz=datetime.timezone.utc)
+
+
+class JobRedisRepository:
+    """Job queue: a ready list, a sorted set of delayed retries and a sorted set of leased jobs."""
+
+    key_schema = RedisKeySchema(prefix="jobs")
+
+    def __init__(self, session: AsyncRedis = Depends(get_redis)) -> None:
+        self._session = session
+
+    @property
+    def queue_key(self) -> str:
+        return self.key_schema.get_key("queue")
+
+    @property
+    def delayed_key(self) -> str:
+        return self.key_schema.get_key("delayed")
+
+    @property
+    def leased_key(self) -> str:
+        return self.key_schema.get_key("leased")
+
+    def get_job_key(self, job_id: str) -> str:
+        return self.key_schema.get_key("job", job_id)
+
+    def get_idempotency_key(self, name: str, idempotency_key: str) -> str:
+        return self.key_schema.get_key("idempotency", name, idempotency_key)
+
+    async def get(self, job_id: str) -> JobSchema | None:
+        value = await self._session.get(self.get_job_key(job_id))
+        return JobSchema.model_validate_json(value) if value is not None else None
+
+    async def save(self, job: JobSchema) -> None:
+        job.updated_at = _now()
+        await self._session.set(self.get_job_key(job.id), job.model_dump_json(), ex=JOB_TTL_SECONDS)
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict[str, typing.Any],
+        max_attempts: int,
+        idempotency_key: str | None = None,
+    ) -> JobSchema:
+        """Queue a job, or return the job already queued with the same `idempotency_key`."""
+
+        now = _now()
+        job = JobSchema(
+            id=uuid4().hex,
+            name=name,
+            payload=payload,
+            max_attempts=max_attempts,
+            idempotency_key=idempotency_key,
+            created_at=now,
+            updated_at=now,
+        )
+
+        keys = [self.get_job_key(job.id), self.queue_key]
+        if idempotency_key is not None:
+            keys.append(self.get_idempotency_key(name, idempotency_key))
+
+        args = [job.id, job.model_dump_json(), JOB_TTL_SECONDS]
+        job_id = await ENQUEUE_SCRIPT(keys=keys, args=args, client=self._session)
+        if job_id == job.id:
+            return job
+
+        # Saves only extend the TTL of a job, so it outlives the idempotency key stored along with it.
+        existing = await self.get(job_id)
+        if existing is None:
+            raise RuntimeError(f"Job {job_id} of idempotency key {idempotency_key} expired before the key")
+
+        return existing
+
+    async def dequeue(self, count: int, lease_seconds: float) -> list[str]:
+        keys = [self.queue_key, self.delayed_key, self.leased_key]
+        return list(await DEQUEUE_SCRIPT(keys=keys, args=[count, int(lease_seconds * 1000)], client=self._session))
+
+    async def renew_lease(self, job_id: str, lease_seconds: float) -> None:
+        args = [job_id, int(lease_seconds * 1000), "XX"]
+        await SCHEDULE_SCRIPT(keys=[self.leased_key], args=args, client=self._session)
+
+    async def complete(self, job: JobSchema, result: typing.Any) -> None:
+        job.status, job.result, job.error = JobStatusEnum.SUCCEEDED, result, None
+        await self._finish(job)
+
+    async def fail(self, job: JobSchema, error: str, retry_in_seconds: float | None) -> None:
+        """Record the error and retry after `retry_in_seconds`, or give up when it is None."""
+
+        job.error = error
+        if retry_in_seconds is None:
+            job.status = JobStatusEnum.FAILED
+            await self._finish(job)
+            return
+
+        job.status = JobStatusEnum.RETRYING
+        job.updated_at = _now()
+        async with self._session.pipeline(transaction=True) as pipe:
+            pipe.set(self.get_job_key(job.id), job.model_dump_json(), ex=JOB_TTL_SECONDS)
+            pipe.zrem(self.leased_key, job.id)
+            args = [job.id, int(retry_in_seconds * 1000), "CH"]
+            await SCHEDULE_SCRIPT(keys=[self.delayed_key], args=args, client=pipe)
+            await pipe.execute()
+
+    async def _finish(self, job: JobSchema) -> None:
+        job.updated_at = _now()
+        async with self._session.pipeline(transaction=True) as pipe:
+            pipe.set(self.get_job_key(job.id), job.model_dump_json(), ex=JOB_TTL_SECONDS)
+            pipe.zrem(self.leased_key, job.id)
+            await pipe.execute()
+
+    async def forget(self, job_id: str) -> None:
+        """Drop a leased job whose state expired."""
+
+        await self._session.zrem(self.leased_key, job_id)
@@ -0,0 +1,44 @@
+import json
+import time
+
+from fastapi import Depends
+
+from core.constants import INSTANCE_ID
+from core.metrics import MetricSnapshot
+from db.redis import AsyncRedis, get_redis
+from schemas.base import RedisKeySchema
+
+
+class MetricsRedisRepository:
+    """Shares metric snapshots between the workers of the app."""
+
+    key_schema = RedisKeySchema(prefix="metrics")
+
+    def __init__(self, session: AsyncRedis = Depends(get_redis)) -> None:
+        self._session = session
+
+    @property
+    def workers_key(self) -> str:
+        return self.key_schema.get_key("workers")
+
+    async def push(self, snapshots: list[MetricSnapshot]) -> None:
+        value = json.dumps({"pushed_at": time.time(), "metrics": snapshots})
+        await self._session.hset(self.workers_key, INSTANCE_ID, value)
+
+    async def get_all(self, max_age_seconds: float) -> dict[str, list[MetricSnapshot]]:
+        """Return snapshots of live workers by instance id, forgetting ones silent for more than `max_age_seconds`."""
+
+        workers = await self._session.hgetall(self.workers_key)
+        snapshots, stale = {}, []
+
+        for instance_id, value in workers.items():
+            worker = json.loads(value)
+            if time.time() - worker["pushed_at"] > max_age_seconds:
+                stale.append(instance_id)
+            else:
+                snapshots[instance_id] = worker["metrics"]
+
+        if stale:
+            await self._session.hdel(self.workers_key, *stale)
+
+        return snapshots
@@ -0,0 +1,61 @@
+from core.constants import (
+    LOCAL_CACHE_INVALIDATION_CHANNEL,
+    PRINCIPAL_LOCAL_CACHE_MAX_SIZE,
+    PRINCIPAL_LOCAL_CACHE_TTL_SECONDS,
+)
+from db.local_cache import LocalCache, invalidation_message
+from db.redis import lua_script
+from db.repositories.base import BaseRedisRepository
+from schemas.auth import PrincipalSchema
+from schemas.base import RedisKeySchema
+
+# Stores ARGV[2] for ARGV[3] seconds only if the generation KEYS[2] still equals ARGV[1], so a principal
+# loaded before an invalidation is not cached after it.
+SET_IF_GENERATION_SCRIPT = lua_script(
+    """
+if (redis.call("get", KEYS[2]) or "0") ~= ARGV[1] then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[2], "ex", ARGV[3])
+return 1
+"""
+)
+
+
+class PrincipalRedisRepository(BaseRedisRepository):
+    """Principals by user id, in Redis and in a short-lived per-worker cache."""
+
+    schema = PrincipalSchema
+    key_schema = RedisKeySchema(prefix="principal")
+    local_cache = LocalCache(max_size=PRINCIPAL_LOCAL_CACHE_MAX_SIZE, ttl_seconds=PRINCIPAL_LOCAL_CACHE_TTL_SECONDS)
+
+    def get_generation_key(self, user_id: int) -> str:
+        return self.key_schema.get_key("generation", user_id)
+
+    async def get_generation(self, user_id: int) -> str:
+        """Read before loading a principal from the database, then pass to `save`."""
+
+        return await self._session.get(self.get_generation_key(user_id)) or "0"
+
+    async def save(self, principal: PrincipalSchema, generation: str, expiration_seconds: int) -> bool:
+        self._check_model(principal)
+
+        key = self.get_key(str(principal.user_id))
+        keys = [key, self.get_generation_key(principal.user_id)]
+        args = [generation, principal.model_dump_json(), expiration_seconds]
+        if not await SET_IF_GENERATION_SCRIPT(keys=keys, args=args, client=self._session):
+            return False
+
+        self.local_cache.set(key, principal, expiration_seconds)
+        return True
+
+    async def invalidate(self, user_id: int) -> None:
+        """Drop the principal everywhere, including saves of principals loaded before this call."""
+
+        key = self.get_key(str(user_id))
+        self.local_cache.invalidate(key)
+        async with self._session.pipeline(transaction=True) as pipe:
+            pipe.incr(self.get_generation_key(user_id))
+            pipe.delete(key)
+            pipe.publish(LOCAL_CACHE_INVALIDATION_CHANNEL, invalidation_message(key))
+            await pipe.execute()
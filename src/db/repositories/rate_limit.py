@@ -0,0 +1,101 @@
+from uuid import uuid4
+
+from fastapi import Depends
+
+from core.enums import RateLimitAlgorithmEnum
+from db.redis import AsyncRedis, get_redis, lua_script
+from schemas.base import RedisKeySchema
+from schemas.rate_limit import RateLimitSchema
+
+# Scripts read the clock from Redis, so workers with skewed clocks share one timeline.
+# Each returns milliseconds to wait before retrying, 0 when the request is allowed.
+# Exact log of request times: memory grows with the limit, prefer the token bucket for large limits.
+SLIDING_WINDOW_SCRIPT = lua_script(
+    """
+local time = redis.call("time")
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+
+redis.call("zremrangebyscore", KEYS[1], "-inf", now - window)
+if redis.call("zcard", KEYS[1]) < limit then
+    redis.call("zadd", KEYS[1], now, ARGV[3])
+    redis.call("pexpire", KEYS[1], window)
+    return 0
+end
+
+local oldest = redis.call("zrange", KEYS[1], 0, 0, "withscores")
+return math.max(tonumber(oldest[2]) + window - now, 1)
+"""
+)
+
+TOKEN_BUCKET_SCRIPT = lua_script(
+    """
+local time = redis.call("time")
+local now = time[1] * 1000 + time[2] / 1000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+
+local bucket = redis.call("hmget", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - updated_at) * rate)
+
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+
+redis.call("hset", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("pexpire", KEYS[1], math.ceil(capacity / rate))
+return retry_after
+"""
+)
+
+ACQUIRE_SLOT_SCRIPT = lua_script(
+    """
+local time = redis.call("time")
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+
+redis.call("zremrangebyscore", KEYS[1], "-inf", now)
+if redis.call("zcard", KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+
+redis.call("zadd", KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+redis.call("pexpire", KEYS[1], ARGV[2])
+return 1
+"""
+)
+
+
+class RateLimitRedisRepository:
+    """Rate and concurrency limits shared by all workers."""
+
+    key_schema = RedisKeySchema(prefix="rate-limit")
+
+    def __init__(self, session: AsyncRedis = Depends(get_redis)) -> None:
+        self._session = session
+
+    async def hit(self, key: str, rate_limit: RateLimitSchema) -> float:
+        """Count a request against `rate_limit`, return seconds to wait before retrying, 0 if allowed."""
+
+        period_ms = rate_limit.period_seconds * 1000
+
+        if rate_limit.algorithm == RateLimitAlgorithmEnum.TOKEN_BUCKET:
+            args = [rate_limit.limit, rate_limit.limit / period_ms]
+            retry_after_ms = await TOKEN_BUCKET_SCRIPT(keys=[key], args=args, client=self._session)
+        else:
+            args = [rate_limit.limit, int(period_ms), uuid4().hex]
+            retry_after_ms = await SLIDING_WINDOW_SCRIPT(keys=[key], args=args, client=self._session)
+
+        return int(retry_after_ms) / 1000
+
+    async def acquire_slot(self, key: str, max_requests: int, lease_id: str, lease_seconds: float) -> bool:
+        args = [max_requests, int(lease_seconds * 1000), lease_id]
+        return bool(await ACQUIRE_SLOT_SCRIPT(keys=[key], args=args, client=self._session))
+
+    async def release_slot(self, key: str, lease_id: str) -> None:
+        await self._session.zrem(key, lease_id)
@@ -0,0 +1,113 @@
+import asyncio
+import typing
+from uuid import uuid4
+
+from fastapi import Depends
+from pydantic import ValidationError
+
+from core.constants import (
+    RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS,
+    RESPONSE_CACHE_POLL_INTERVAL_SECONDS,
+)
+from db.redis import AsyncRedis, get_redis, lua_script
+from schemas.base import RedisKeySchema
+from schemas.response_cache import CachedResponseSchema
+
+RELEASE_LOCK_SCRIPT = lua_script(
+    """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+)
+
+
+class ResponseCacheRedisRepository:
+    """Stores rendered route responses, grouped by tags for invalidation."""
+
+    key_schema = RedisKeySchema(prefix="response-cache")
+
+    def __init__(self, session: AsyncRedis = Depends(get_redis)) -> None:
+        self._session = session
+
+    def get_key(self, *parts: str) -> str:
+        return self.key_schema.get_key("response", *parts)
+
+    def get_tag_key(self, tag: str) -> str:
+        return self.key_schema.get_key("tag", tag)
+
+    async def get(self, key: str) -> CachedResponseSchema | None:
+        value = await self._session.get(key)
+
+        try:
+            return CachedResponseSchema.model_validate_json(str(value))
+        except ValidationError:
+            return None
+
+    async def set(
+        self, key: str, response: CachedResponseSchema, expiration_seconds: int, tags: typing.Iterable[str] = ()
+    ) -> None:
+        async with self._session.pipeline(transaction=True) as pipe:
+            pipe.setex(name=key, time=expiration_seconds, value=response.model_dump_json())
+
+            for tag in tags:
+                tag_key = self.get_tag_key(tag)
+                pipe.sadd(tag_key, key)
+                # A tag must live as long as its longest-living response.
+                pipe.expire(tag_key, expiration_seconds, nx=True)
+                pipe.expire(tag_key, expiration_seconds, gt=True)
+
+            await pipe.execute()
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: typing.Callable[[], typing.Awaitable[CachedResponseSchema]],
+        expiration_seconds: int,
+        tags: typing.Iterable[str] = (),
+        lock_timeout_seconds: float = RESPONSE_CACHE_LOCK_TIMEOUT_SECONDS,
+    ) -> CachedResponseSchema:
+        """Return the cached response or render it, letting only one caller across workers render a cold key."""
+
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        lock_key = self.key_schema.get_key("lock", key)
+        token = uuid4().hex
+
+        if await self._session.set(lock_key, token, nx=True, px=int(lock_timeout_seconds * 1000)):
+            try:
+                response = await factory()
+                await self.set(key, response, expiration_seconds, tags)
+                return response
+            finally:
+                await RELEASE_LOCK_SCRIPT(keys=[lock_key], args=[token], client=self._session)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + lock_timeout_seconds
+        while loop.time() < deadline:
+            await asyncio.sleep(RESPONSE_CACHE_POLL_INTERVAL_SECONDS)
+
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+
+        # The lock holder is too slow or died, render without waiting any longer.
+        return await factory()
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Purge every response stored with any of `tags`, e.g. after a write to the tagged entity."""
+
+        if not tags:
+            return
+
+        tag_keys = [self.get_tag_key(tag) for tag in tags]
+        async with self._session.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+
+            members = await pipe.execute()
+
+        await self._session.delete(*set().union(*members), *tag_keys)
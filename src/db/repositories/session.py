@@ -0,0 +1,31 @@
+import json
+import typing
+
+from fastapi import Depends
+
+from db.redis import AsyncRedis, get_redis
+from schemas.base import RedisKeySchema
+
+
+class SessionRedisRepository:
+    """Server-side sessions: one JSON value per session id, expiring after `ttl_seconds` without reads."""
+
+    key_schema = RedisKeySchema(prefix="session")
+
+    def __init__(self, session: AsyncRedis = Depends(get_redis)) -> None:
+        self._session = session
+
+    def get_key(self, session_id: str) -> str:
+        return self.key_schema.get_key(session_id)
+
+    async def get(self, session_id: str, ttl_seconds: int) -> dict[str, typing.Any] | None:
+        """Read a session and restart its TTL in the same round-trip."""
+
+        value = await self._session.getex(self.get_key(session_id), ex=ttl_seconds)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, session_id: str, data: dict[str, typing.Any], ttl_seconds: int) -> None:
+        await self._session.set(self.get_key(session_id), json.dumps(data), ex=ttl_seconds)
+
+    async def delete(self, session_id: str) -> None:
+        await self._session.delete(self.get_key(session_id))
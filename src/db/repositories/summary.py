@@ -0,0 +1,88 @@
+import typing
+
+from sqlalchemy import (
+    ColumnElement,
+    FromClause,
+    Select,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+
+from db.repositories.base import BaseModelDatabaseRepository, ModelT
+
+
+class SummaryRepository(BaseModelDatabaseRepository[ModelT]):
+    """Counters maintained incrementally next to the rows they summarize.
+
+    `model` has a primary key of dimension columns plus `metric`, and an integer `value` column.
+    Reads look rows up by dimensions instead of aggregating history, so they cost the same however old the data is.
+    Rebuilds lock out increments by the first primary key column, e.g. per quarter, other values are written meanwhile.
+    """
+
+    @property
+    def _table(self) -> FromClause:
+        return inspect(self.model).local_table
+
+    def _match(self, dimensions: dict[str, typing.Any]) -> list[ColumnElement[bool]]:
+        return [self._table.c[name] == value for name, value in dimensions.items()]
+
+    async def _lock(self, dimensions: dict[str, typing.Any], shared: bool) -> bool:
+        """Transaction-level advisory lock of the value of the first primary key column, False if it is not given."""
+
+        scope = self._primary_key[0].key
+        if scope not in dimensions:
+            return False
+
+        lock = func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+        await self._session.execute(
+            select(lock(func.hashtext(self.model.__tablename__), func.hashtext(str(dimensions[scope]))))
+        )
+        return True
+
+    async def increment(self, dimensions: dict[str, typing.Any], deltas: typing.Mapping[str, int]) -> None:
+        """Add `deltas` to counters of `dimensions` with one upsert, call it in the transaction of the change."""
+
+        # Sorted, so that concurrent transactions lock the same rows in the same order and never deadlock.
+        values = [{**dimensions, "metric": metric, "value": delta} for metric, delta in sorted(deltas.items()) if delta]
+        if not values:
+            return
+
+        # Shared, increments only wait for a rebuild of the same scope and never for each other.
+        await self._lock(dimensions, shared=True)
+        stmt = postgresql.insert(self._table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[column.key for column in self._primary_key],
+            set_={"value": self._table.c.value + stmt.excluded.value},
+        )
+        await self._session.execute(stmt.values(values))
+
+    async def get(self, **dimensions: typing.Any) -> dict[str, int]:
+        """Counters summed over rows matching `dimensions`, e.g. over all departments of a quarter."""
+
+        metric, value = self._table.c.metric, self._table.c.value
+        query = select(metric, func.sum(value)).where(*self._match(dimensions)).group_by(metric)
+        return {name: int(total) for name, total in await self._read_session.execute(query)}
+
+    async def rebuild(self, sources: typing.Iterable[Select[typing.Any]], **dimensions: typing.Any) -> None:
+        """Replace counters matching `dimensions` with the rows `sources` aggregate from scratch.
+
+        Each source selects the columns of `model` in their order, limited to `dimensions`.
+        Concurrent `increment` calls of the rebuilt scope wait for the transaction of the rebuild: otherwise they could
+        insert a row between the delete and the insert, failing it with a unique violation or getting overwritten.
+        Without the first primary key column in `dimensions` the whole table is locked instead.
+        """
+
+        if not await self._lock(dimensions, shared=False):
+            table = postgresql.dialect().identifier_preparer.format_table(self._table)
+            await self._session.execute(text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE"))
+
+        await self._session.execute(delete(self._table).where(*self._match(dimensions)))
+
+        columns = [column.key for column in self._table.columns]
+        for source in sources:
+            await self._session.execute(insert(self._table).from_select(columns, source))
@@ -1,7 +1,13 @@
+import asyncio
+import contextlib
 import functools
+import itertools
+import time
 import typing
 
-from sqlalchemy import URL
+from loguru import logger
+from sqlalchemy import URL, event, make_url, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -10,18 +16,182 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from core.config import settings
+from core.metrics import COLLECTORS, MetricSnapshot, request_stats
+from db.pool import InstrumentedAsyncAdaptedQueuePool
+from db.query_tracker import record_statement
+from schemas.metrics import PoolStatsSchema
+
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def _before_cursor_execute(connection: Connection, *args: typing.Any) -> None:
+    connection.info["statement_started_at"] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    connection: Connection, cursor: typing.Any, statement: str, parameters: typing.Any, *args: typing.Any
+) -> None:
+    record_statement(statement, parameters)
+
+    stats = request_stats.get()
+    if stats is not None:
+        stats.db_statements += 1
+        stats.db_seconds += time.perf_counter() - connection.info.pop("statement_started_at", time.perf_counter())
+
+
+_engines: list[AsyncEngine] = []
 
 
 @functools.lru_cache
 def get_engine(url: str | URL | None = None, **kwargs) -> AsyncEngine:
-    return create_async_engine(url or settings().postgres_dsn, echo=False, future=True, **kwargs)
+    # Pool and asyncpg statement cache settings only apply to the default pool, options passed here win.
+    if "poolclass" not in kwargs:
+        kwargs = {
+            "poolclass": InstrumentedAsyncAdaptedQueuePool,
+            **settings().postgres_pool_options,
+            **kwargs,
+            "connect_args": {**settings().postgres_connect_args, **kwargs.get("connect_args", {})},
+        }
+
+    engine = create_async_engine(url or settings().postgres_dsn, echo=False, future=True, **kwargs)
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _engines.append(engine)
+
+    return engine
+
+
+async def warm_up_engine(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` pooled connections up front, so first requests skip connecting and dialect setup."""
+
+    async with contextlib.AsyncExitStack() as stack:
+        for _ in range(connections):
+            connection = await stack.enter_async_context(engine.connect())
+            await connection.execute(text("SELECT 1"))
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of every engine created by `get_engine`."""
+
+    await asyncio.gather(*(engine.dispose() for engine in _engines))
+    _engines.clear()
+    get_engine.cache_clear()
+    _get_sessionmaker.cache_clear()
+
+
+def get_pool_stats(engine: AsyncEngine | None = None) -> PoolStatsSchema | None:
+    pool = (engine or get_engine(settings().postgres_dsn)).pool
+    return pool.stats() if isinstance(pool, InstrumentedAsyncAdaptedQueuePool) else None
+
+
+def collect_pool_metrics() -> list[MetricSnapshot]:
+    pool = get_engine(settings().postgres_dsn).pool
+    return pool.metrics() if isinstance(pool, InstrumentedAsyncAdaptedQueuePool) else []
+
+
+COLLECTORS.append(collect_pool_metrics)
+
+
+@functools.lru_cache
+def _get_sessionmaker(url: str | URL) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_engine(url), expire_on_commit=False)
 
 
 def get_async_session(url: str | URL | None = None) -> async_sessionmaker[AsyncSession]:
-    return async_sessionmaker(get_engine(url or settings().postgres_dsn), expire_on_commit=False)
+    """Return the session factory of the engine, built once and shared by all requests."""
+
+    return _get_sessionmaker(url or settings().postgres_dsn)
 
 
 async def get_session() -> typing.AsyncGenerator[AsyncSession, None]:
     async_session = get_async_session()
     async with async_session() as session:
         yield session
+
+
+class ReplicaRouter:
+    """Spreads reads over replicas that are up and not lagging, falling back to the primary."""
+
+    def __init__(
+        self,
+        primary_dsn: str,
+        replica_dsns: typing.Sequence[str],
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+    ) -> None:
+        self.primary_dsn = primary_dsn
+        self.replica_dsns = list(replica_dsns)
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.healthy_dsns: list[str] = []
+        self._checked_at: float | None = None
+        self._check_task: asyncio.Task[None] | None = None
+        self._counter = itertools.count()
+
+    async def _is_healthy(self, dsn: str) -> bool:
+        name = make_url(dsn).render_as_string(hide_password=True)
+
+        async def get_lag() -> float:
+            async with get_engine(dsn).connect() as connection:
+                return float(await connection.scalar(REPLICA_LAG_QUERY))
+
+        try:
+            lag = await asyncio.wait_for(get_lag(), timeout=self.check_interval_seconds)
+        except Exception as exc:
+            logger.warning("Replica {} is unavailable: {!r}", name, exc)
+            return False
+
+        if lag > self.max_lag_seconds:
+            logger.warning("Replica {} lags {:.1f}s behind the primary", name, lag)
+            return False
+
+        return True
+
+    async def check(self) -> None:
+        results = await asyncio.gather(*(self._is_healthy(dsn) for dsn in self.replica_dsns))
+        self.healthy_dsns = [dsn for dsn, is_healthy in zip(self.replica_dsns, results) if is_healthy]
+        self._checked_at = time.monotonic()
+
+    async def choose_dsn(self) -> str:
+        """Return the next healthy replica DSN, refreshing health in the background once it gets stale."""
+
+        if not self.replica_dsns:
+            return self.primary_dsn
+
+        is_stale = self._checked_at is None or time.monotonic() - self._checked_at > self.check_interval_seconds
+        if is_stale and (self._check_task is None or self._check_task.done()):
+            self._check_task = asyncio.create_task(self.check())
+
+        # Only the very first check is awaited, later ones never delay requests.
+        if self._checked_at is None and self._check_task is not None:
+            await asyncio.shield(self._check_task)
+
+        if not self.healthy_dsns:
+            return self.primary_dsn
+
+        return self.healthy_dsns[next(self._counter) % len(self.healthy_dsns)]
+
+
+@functools.lru_cache
+def get_replica_router() -> ReplicaRouter:
+    return ReplicaRouter(
+        primary_dsn=settings().postgres_dsn,
+        replica_dsns=settings().POSTGRES_REPLICA_DSNS,
+        max_lag_seconds=settings().POSTGRES_REPLICA_MAX_LAG_SECONDS,
+        check_interval_seconds=settings().POSTGRES_REPLICA_CHECK_INTERVAL_SECONDS,
+    )
+
+
+async def get_read_session() -> typing.AsyncGenerator[AsyncSession, None]:
+    """Session for read-only queries, served by a replica when one is healthy."""
+
+    async_session = get_async_session(await get_replica_router().choose_dsn())
+    async with async_session() as session:
+        yield session
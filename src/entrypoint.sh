@@ -7,6 +7,9 @@ done
 echo "Connected to the db"
 
 cd src/
-alembic upgrade head
+# Containers started next to a separate migration job, e.g. the `migrations` service, set RUN_MIGRATIONS=false.
+if [ "$RUN_MIGRATIONS" != "false" ]; then
+  alembic upgrade head
+fi
 
 exec "$@"
\ No newline at end of file
@@ -1,17 +1,130 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import typing
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
-from starlette.middleware.sessions import SessionMiddleware
 
+from api.diagnostics import router as diagnostics_router
+from api.health import router as health_router
+from api.metrics import router as metrics_router
+from api.responses import PydanticJSONResponse
 from api.router import api_router
 from core.config import settings
+from core.diagnostics import LoopWatchdog
+from core.executor import ExecutorOverloadedError, shutdown_cpu_executor
+from db.local_cache import listen_invalidations
+from db.redis import close_redis, get_redis_connection, warm_up_redis
+from db.session import (
+    dispose_engines,
+    get_async_session,
+    get_engine,
+    get_replica_router,
+    warm_up_engine,
+)
+from middlewares.compression import CompressionMiddleware
+from middlewares.drain import DrainMiddleware, InFlightRequests, drain_on_sigterm
+from middlewares.metrics import MetricsMiddleware
+from middlewares.query_budget import QueryBudgetMiddleware
+from middlewares.rate_limit import RateLimitMiddleware
+from middlewares.session import RedisSessionMiddleware
+from schemas.rate_limit import RateLimitSchema
+from services.health import HealthService
+from services.metrics import monitor_event_loop_lag, push_metrics_periodically
+
+
+async def warm_up() -> None:
+    redis = get_redis_connection()
+    await asyncio.gather(
+        warm_up_engine(get_engine(settings().postgres_dsn), settings().POSTGRES_WARMUP_CONNECTIONS),
+        warm_up_redis(redis, settings().REDIS_WARMUP_CONNECTIONS),
+    )
+    if settings().POSTGRES_REPLICA_DSNS:
+        await get_replica_router().check()
+
+    async with get_async_session()() as session:
+        readiness = await HealthService(session=session, redis=redis).check_readiness(accepting_requests=True)
+
+    logger.info("Warm-up finished, readiness: {}", readiness)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> typing.AsyncIterator[None]:
+    try:
+        await warm_up()
+    except Exception as exc:
+        # Stay up: /health/ready reports the failing dependency until it is reachable.
+        logger.error("Warm-up failed: {!r}", exc)
+
+    redis = get_redis_connection()
+    background_tasks = [
+        asyncio.create_task(listen_invalidations(redis)),
+        asyncio.create_task(push_metrics_periodically(redis)),
+        asyncio.create_task(monitor_event_loop_lag()),
+    ]
+    watchdog = LoopWatchdog(asyncio.get_running_loop(), settings().DIAGNOSTICS_SLOW_CALLBACK_SECONDS)
+    if settings().DIAGNOSTICS_ENABLED:
+        watchdog.start()
+
+    drain_on_sigterm(app.state.in_flight_requests, settings().SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    watchdog.stop()
+    shutdown_cpu_executor()
+    await dispose_engines()
+    await close_redis()
+
 
 app = FastAPI(
     title="Base FastAPI Project",
     openapi_url="/api/openapi.json",
     docs_url="/api/swagger",
+    default_response_class=PydanticJSONResponse,
+    lifespan=lifespan,
 )
+app.state.in_flight_requests = InFlightRequests()
+
+
+@app.exception_handler(ExecutorOverloadedError)
+async def executor_overloaded_handler(request: Request, exc: ExecutorOverloadedError) -> JSONResponse:
+    return JSONResponse(
+        {"detail": "Server is busy"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "1"}
+    )
+
+
 app.include_router(api_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
+if settings().DIAGNOSTICS_ENABLED:
+    app.include_router(diagnostics_router)
+
+
+default_rate_limits = []
+if settings().RATE_LIMIT_PER_PRINCIPAL is not None:
+    default_rate_limits.append(
+        RateLimitSchema(limit=settings().RATE_LIMIT_PER_PRINCIPAL, period_seconds=settings().RATE_LIMIT_PERIOD_SECONDS)
+    )
 
+# Added first to wrap only the response of the route, its CPU time is counted by metrics and query budgets.
+app.add_middleware(
+    CompressionMiddleware,
+    min_size_bytes=settings().COMPRESSION_MIN_SIZE_BYTES,
+    offload_size_bytes=settings().COMPRESSION_OFFLOAD_SIZE_BYTES,
+)
+
+# Added right after compression to run before routing, so 429s still get CORS headers, metrics and draining.
+app.add_middleware(
+    RateLimitMiddleware,
+    default_limits=default_rate_limits,
+    default_concurrency_limit=settings().CONCURRENCY_LIMIT_PER_ROUTE,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,4 +134,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(SessionMiddleware, secret_key=settings().SESSION_MIDDLEWARE_SECRET)
+app.add_middleware(
+    RedisSessionMiddleware,
+    session_cookie=settings().SESSION_COOKIE_NAME,
+    ttl_seconds=settings().SESSION_TTL_SECONDS,
+    https_only=settings().SESSION_COOKIE_SECURE,
+)
+
+app.add_middleware(
+    QueryBudgetMiddleware,
+    max_queries=settings().SQL_QUERY_BUDGET,
+    repeated_threshold=settings().SQL_REPEATED_STATEMENT_THRESHOLD,
+    raise_on_exceeded=settings().SQL_QUERY_BUDGET_RAISE,
+)
+
+app.add_middleware(MetricsMiddleware)
+
+app.add_middleware(DrainMiddleware, in_flight_requests=app.state.in_flight_requests)
@@ -0,0 +1,5 @@
+"""
+Directory for describing ASGI middlewares.
+
+Each middleware - separate file, installed in `main.py`.
+"""
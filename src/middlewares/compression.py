@@ -0,0 +1,203 @@
+"""
+Response compression negotiated from Accept-Encoding, and ETags answering unchanged GETs with 304.
+
+Usage:
+@router.get("/reviews/export")
+@compression(min_size_bytes=0, encodings=(ContentEncodingEnum.GZIP,))
+async def export_reviews(...) -> StreamingResponse:
+    ...
+
+Routes without decorators use `COMPRESSION_MIN_SIZE_BYTES` and every available encoding,
+`@compression_exempt` opts a route out, e.g. for already compressed files.
+Streaming responses are compressed chunk by chunk, each chunk flushed to the client as it is produced.
+Complete bodies of GETs get a strong ETag, so conditional requests skip compression and the transfer.
+"""
+
+import typing
+
+from starlette import status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.compression import (
+    Compressor,
+    compress,
+    encode_etag,
+    etag_matches,
+    get_compressor,
+    make_etag,
+    negotiate_encoding,
+)
+from core.enums import ContentEncodingEnum
+from core.executor import ExecutorOverloadedError, run_cpu_bound
+from schemas.compression import CompressionSchema
+
+COMPRESSION_ATTRIBUTE = "__compression__"
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+# Headers describing the body, left out of 304 responses.
+BODY_HEADERS = ("content-length", "content-type", "content-encoding")
+
+EndpointT = typing.TypeVar("EndpointT", bound=typing.Callable[..., typing.Any])
+
+
+def compression(
+    min_size_bytes: int, encodings: typing.Sequence[ContentEncodingEnum] = tuple(ContentEncodingEnum)
+) -> typing.Callable[[EndpointT], EndpointT]:
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        setattr(endpoint, COMPRESSION_ATTRIBUTE, CompressionSchema(min_size_bytes=min_size_bytes, encodings=encodings))
+        return endpoint
+
+    return decorator
+
+
+def compression_exempt(endpoint: EndpointT) -> EndpointT:
+    setattr(endpoint, COMPRESSION_ATTRIBUTE, None)
+    return endpoint
+
+
+def is_compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "")
+    # Covers `application/problem+json` and the like.
+    is_text = content_type.startswith(COMPRESSIBLE_CONTENT_TYPES) or "+json" in content_type
+    return is_text and "content-encoding" not in headers
+
+
+class CompressionResponder:
+    """Holds the response start until the first body message shows whether the body is complete or streamed."""
+
+    def __init__(self, app: ASGIApp, scope: Scope, default: CompressionSchema, offload_size_bytes: int) -> None:
+        self.app = app
+        self.scope = scope
+        self.request_headers = Headers(scope=scope)
+        self.default = default
+        self.offload_size_bytes = offload_size_bytes
+        self.send: Send
+        self.start_message: Message | None = None
+        self.compressor: Compressor | None = None
+
+    async def __call__(self, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(self.scope, receive, self.send_wrapper)
+
+    def _negotiate(self, start: Message, headers: MutableHeaders, size: int | None) -> ContentEncodingEnum | None:
+        # Routing has filled in the endpoint by the time the response starts.
+        options = getattr(self.scope.get("endpoint"), COMPRESSION_ATTRIBUTE, self.default)
+        if options is None or self.scope["method"] == "HEAD" or start["status"] < status.HTTP_200_OK:
+            return None
+
+        if not is_compressible(headers) or (size is not None and size < options.min_size_bytes):
+            return None
+
+        headers.add_vary_header("Accept-Encoding")
+        return negotiate_encoding(self.request_headers.get("accept-encoding", ""), options.encodings)
+
+    async def _send_not_modified(self, start: Message) -> None:
+        headers = [(name, value) for name, value in start["headers"] if name.decode("latin-1") not in BODY_HEADERS]
+        await self.send({"type": "http.response.start", "status": status.HTTP_304_NOT_MODIFIED, "headers": headers})
+        await self.send({"type": "http.response.body", "body": b""})
+
+    async def _compress(self, encoding: ContentEncodingEnum, body: bytes) -> bytes | None:
+        """Compressed body, None if the CPU executor is overloaded or timed out and the body goes out as it is."""
+
+        if len(body) < self.offload_size_bytes:
+            return compress(encoding, body)
+
+        # Large bodies go to the CPU executor, compressors release the GIL while they work. The response is computed
+        # already, failing it over a busy executor would waste that: it is sent uncompressed instead.
+        try:
+            return await run_cpu_bound(compress, encoding, body)
+        except (ExecutorOverloadedError, TimeoutError):
+            return None
+
+    def _get_etag(
+        self, start: Message, route_etag: str | None, body: bytes, encoding: ContentEncodingEnum | None
+    ) -> str | None:
+        if self.scope["method"] != "GET" or start["status"] != status.HTTP_200_OK:
+            return None
+
+        # ETags set by the route, e.g. by `@cache_response`, are kept apart from other encodings too.
+        return encode_etag(route_etag, encoding) if route_etag is not None else make_etag(body, encoding)
+
+    async def _send_complete(self, start: Message, body: bytes) -> None:
+        headers = MutableHeaders(scope=start)
+        encoding = self._negotiate(start, headers, len(body))
+        route_etag = headers.get("etag")
+
+        etag = self._get_etag(start, route_etag, body, encoding)
+        if etag is not None:
+            headers["ETag"] = etag
+            if etag_matches(self.request_headers.get("if-none-match", ""), etag):
+                await self._send_not_modified(start)
+                return
+
+        compressed = await self._compress(encoding, body) if encoding is not None else None
+        if compressed is not None:
+            body = compressed
+            headers["Content-Encoding"] = typing.cast(ContentEncodingEnum, encoding).value
+            headers["Content-Length"] = str(len(body))
+        elif etag is not None and encoding is not None:
+            # Sent uncompressed after all, the ETag has to be the one of the identity body.
+            headers["ETag"] = typing.cast(str, self._get_etag(start, route_etag, body, None))
+
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": body})
+
+    async def _start_stream(self, start: Message) -> None:
+        headers = MutableHeaders(scope=start)
+        encoding = self._negotiate(start, headers, None)
+        if encoding is not None:
+            self.compressor = get_compressor(encoding)
+            headers["Content-Encoding"] = encoding.value
+            del headers["Content-Length"]
+
+        await self.send(start)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body:
+                await self._send_complete(start, message.get("body", b""))
+                return
+
+            await self._start_stream(start)
+
+        if self.compressor is not None:
+            body = self.compressor.compress(message.get("body", b""))
+            body += self.compressor.flush() if more_body else self.compressor.finish()
+            message = {**message, "body": body}
+
+        await self.send(message)
+
+
+class CompressionMiddleware:
+    """Compress responses of routes by their `@compression` options, others by the defaults passed here."""
+
+    def __init__(self, app: ASGIApp, min_size_bytes: int, offload_size_bytes: int = 1024 * 1024) -> None:
+        self.app = app
+        self.default = CompressionSchema(min_size_bytes=min_size_bytes)
+        self.offload_size_bytes = offload_size_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self.app, scope, self.default, self.offload_size_bytes)
+        await responder(receive, send)
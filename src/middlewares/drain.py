@@ -0,0 +1,109 @@
+import asyncio
+import os
+import signal
+import threading
+
+from loguru import logger
+from starlette import status
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class InFlightRequests:
+    """Requests being handled, so shutdown can wait for them before closing connections."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def accepting(self) -> bool:
+        # The server listens only once the lifespan has started, so the only state left to report is draining.
+        return not self.draining
+
+    def enter(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def exit(self) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._idle.set()
+
+    async def drain(self, timeout_seconds: float) -> bool:
+        """Turn new requests away and wait for in-flight ones, return whether all of them finished."""
+
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
+
+
+_drain_tasks: set[asyncio.Task[None]] = set()
+
+
+def _exit_server() -> None:
+    os.kill(os.getpid(), signal.SIGINT)
+
+
+async def _drain_and_exit(in_flight_requests: InFlightRequests, timeout_seconds: float) -> None:
+    logger.info("SIGTERM received, draining {} in-flight requests", in_flight_requests.count)
+    if not await in_flight_requests.drain(timeout_seconds):
+        logger.warning("{} requests still in flight on shutdown", in_flight_requests.count)
+
+    _exit_server()
+
+
+def _handle_sigterm(in_flight_requests: InFlightRequests, timeout_seconds: float) -> None:
+    if in_flight_requests.draining:
+        _exit_server()
+        return
+
+    task = asyncio.get_running_loop().create_task(_drain_and_exit(in_flight_requests, timeout_seconds))
+    _drain_tasks.add(task)
+    task.add_done_callback(_drain_tasks.discard)
+
+
+def drain_on_sigterm(in_flight_requests: InFlightRequests, timeout_seconds: float) -> None:
+    """Drain on SIGTERM while the server still listens, then start its graceful shutdown with SIGINT.
+
+    Uvicorn stops listening as soon as it handles SIGTERM, draining afterwards would not see new requests.
+    A second SIGTERM skips the rest of the drain.
+    """
+
+    # Signal handlers can only be installed from the main thread, e.g. not under Starlette's TestClient.
+    if threading.current_thread() is threading.main_thread():
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, _handle_sigterm, in_flight_requests, timeout_seconds)
+
+
+class DrainMiddleware:
+    """Count in-flight requests, reject new ones once shutdown started."""
+
+    def __init__(self, app: ASGIApp, in_flight_requests: InFlightRequests) -> None:
+        self.app = app
+        self.in_flight_requests = in_flight_requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Load balancers keep sending requests until they see /health/ready fail, those are turned away.
+        if self.in_flight_requests.draining:
+            response = PlainTextResponse(
+                "Shutting down", status_code=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Connection": "close"}
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight_requests.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight_requests.exit()
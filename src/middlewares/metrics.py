@@ -0,0 +1,69 @@
+import time
+import typing
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_STATEMENTS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_REDIS_COMMANDS,
+    HTTP_REQUEST_REDIS_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    HTTP_RESPONSE_SIZE,
+    RequestStats,
+    request_stats,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency, response size and SQL/Redis work per route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+
+            await send(message)
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        HTTP_REQUESTS_IN_PROGRESS.inc((method,))
+        started_at = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            HTTP_REQUESTS_IN_PROGRESS.dec((method,))
+            request_stats.reset(token)
+
+            # The template keeps label cardinality bounded, unlike the raw path.
+            route: typing.Any = scope.get("route")
+            template = getattr(route, "path", UNMATCHED_ROUTE)
+
+            HTTP_REQUESTS.inc((method, template, str(status_code)))
+            HTTP_REQUEST_DURATION.observe(elapsed, (method, template))
+            HTTP_RESPONSE_SIZE.observe(response_size, (method, template))
+            HTTP_REQUEST_DB_STATEMENTS.observe(stats.db_statements, (template,))
+            HTTP_REQUEST_DB_DURATION.observe(stats.db_seconds, (template,))
+            HTTP_REQUEST_REDIS_COMMANDS.observe(stats.redis_commands, (template,))
+            HTTP_REQUEST_REDIS_DURATION.observe(stats.redis_seconds, (template,))
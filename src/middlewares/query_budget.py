@@ -0,0 +1,82 @@
+"""
+Per-request SQL budget.
+
+Usage:
+@router.get("/templates", response_model=list[TemplateSchema])
+@query_budget(max_queries=2)
+async def get_templates(template_service: TemplateService = Depends()) -> list[Template]:
+    ...
+
+Routes without `@query_budget` use `SQL_QUERY_BUDGET`, repeated statements are reported for every route.
+With `raise_on_exceeded`, requests over budget fail with 500 before their response starts, statements of
+streamed bodies run after it and are only logged.
+"""
+
+import typing
+
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from db.query_tracker import QueryBudgetExceededError, QueryTracker, query_tracker
+
+QUERY_BUDGET_ATTRIBUTE = "__query_budget__"
+
+EndpointT = typing.TypeVar("EndpointT", bound=typing.Callable[..., typing.Any])
+
+
+def query_budget(max_queries: int) -> typing.Callable[[EndpointT], EndpointT]:
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        setattr(endpoint, QUERY_BUDGET_ATTRIBUTE, max_queries)
+        return endpoint
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """Report requests exceeding their SQL budget or repeating a statement shape."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_queries: int | None = None,
+        repeated_threshold: int = 10,
+        raise_on_exceeded: bool = False,
+    ) -> None:
+        self.app = app
+        self.max_queries = max_queries
+        self.repeated_threshold = repeated_threshold
+        self.raise_on_exceeded = raise_on_exceeded
+
+    def _problems(self, scope: Scope, tracker: QueryTracker) -> str | None:
+        route = scope.get("route")
+        max_queries = getattr(getattr(route, "endpoint", None), QUERY_BUDGET_ATTRIBUTE, self.max_queries)
+        problems = tracker.problems(max_queries, self.repeated_threshold)
+        if not problems:
+            return None
+
+        return f"{scope['method']} {getattr(route, 'path', scope['path'])}: " + "; ".join(problems)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = QueryTracker(parent=query_tracker.get())
+
+        async def send_wrapper(message: Message) -> None:
+            # Nothing has reached the client yet, so the error still turns the response into a 500.
+            if message["type"] == "http.response.start" and (problems := self._problems(scope, tracker)):
+                raise QueryBudgetExceededError(problems)
+
+            await send(message)
+
+        token = query_tracker.set(tracker)
+        try:
+            await self.app(scope, receive, send_wrapper if self.raise_on_exceeded else send)
+        finally:
+            query_tracker.reset(token)
+
+        # Statements run while streaming the body come after the response has started, they can only be logged.
+        problems = self._problems(scope, tracker)
+        if problems:
+            logger.warning(problems)
@@ -0,0 +1,202 @@
+"""
+Rate and concurrency limits shared by all workers through Redis.
+
+Usage:
+@router.get("/reviews", response_model=list[ReviewSchema])
+@rate_limit(limit=100, period_seconds=60)
+@rate_limit(limit=1000, period_seconds=60, per_principal=False)
+@concurrency_limit(max_requests=20)
+async def get_reviews(review_service: ReviewService = Depends()) -> list[Review]:
+    ...
+
+Routes without decorators use `RATE_LIMIT_PER_PRINCIPAL` and `CONCURRENCY_LIMIT_PER_ROUTE`,
+`@rate_limit_exempt` opts a route out of both.
+"""
+
+import asyncio
+import math
+import time
+import typing
+from uuid import uuid4
+
+from loguru import logger
+from redis.exceptions import RedisError
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.cache import get_request_principal
+from core.config import settings
+from core.constants import CONCURRENCY_LEASE_SECONDS
+from core.enums import RateLimitAlgorithmEnum
+from db.local_rate_limit import LocalRateLimiter
+from db.redis import get_redis_connection
+from db.repositories.rate_limit import RateLimitRedisRepository
+from schemas.rate_limit import RateLimitSchema
+
+RATE_LIMITS_ATTRIBUTE = "__rate_limits__"
+CONCURRENCY_LIMIT_ATTRIBUTE = "__concurrency_limit__"
+
+EndpointT = typing.TypeVar("EndpointT", bound=typing.Callable[..., typing.Any])
+
+
+def rate_limit(
+    limit: int,
+    period_seconds: float,
+    algorithm: RateLimitAlgorithmEnum = RateLimitAlgorithmEnum.SLIDING_WINDOW,
+    per_principal: bool = True,
+) -> typing.Callable[[EndpointT], EndpointT]:
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        limit_schema = RateLimitSchema(
+            limit=limit, period_seconds=period_seconds, algorithm=algorithm, per_principal=per_principal
+        )
+        setattr(endpoint, RATE_LIMITS_ATTRIBUTE, (*getattr(endpoint, RATE_LIMITS_ATTRIBUTE, ()), limit_schema))
+        return endpoint
+
+    return decorator
+
+
+def concurrency_limit(max_requests: int) -> typing.Callable[[EndpointT], EndpointT]:
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        setattr(endpoint, CONCURRENCY_LIMIT_ATTRIBUTE, max_requests)
+        return endpoint
+
+    return decorator
+
+
+def rate_limit_exempt(endpoint: EndpointT) -> EndpointT:
+    setattr(endpoint, RATE_LIMITS_ATTRIBUTE, ())
+    setattr(endpoint, CONCURRENCY_LIMIT_ATTRIBUTE, None)
+    return endpoint
+
+
+def get_rate_limit_principal(request: Request) -> str:
+    """User of a valid access token, or the client address for other requests.
+
+    Behind a proxy the address is only the client one with uvicorn `--proxy-headers`, see docker-compose.dev.yml.
+    """
+
+    principal = get_request_principal(request)
+    if principal == "anonymous" and request.client is not None:
+        return f"ip:{request.client.host}"
+
+    return principal
+
+
+def _too_many_requests(retry_after_seconds: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": "Too Many Requests"},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(max(math.ceil(retry_after_seconds), 1))},
+    )
+
+
+class RateLimitMiddleware:
+    """Reject requests over their route limits with 429, failing open to per-worker limits without Redis."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_limits: typing.Sequence[RateLimitSchema] = (),
+        default_concurrency_limit: int | None = None,
+        principal: typing.Callable[[Request], str] = get_rate_limit_principal,
+    ) -> None:
+        self.app = app
+        self.default_limits = tuple(default_limits)
+        self.default_concurrency_limit = default_concurrency_limit
+        self.principal = principal
+        self.local_limiter = LocalRateLimiter()
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def _match_route(scope: Scope) -> BaseRoute | None:
+        # Middlewares run before routing, match the same way the router will.
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+
+        return None
+
+    @property
+    def _redis_up(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    async def _call(self, method: str, *args: typing.Any) -> typing.Any:
+        """Run a limiter method on Redis, or on the local limiter while Redis is down."""
+
+        if self._redis_up:
+            try:
+                async with asyncio.timeout(settings().RATE_LIMIT_REDIS_TIMEOUT_SECONDS):
+                    return await getattr(RateLimitRedisRepository(session=get_redis_connection()), method)(*args)
+            except (RedisError, OSError, TimeoutError) as exc:
+                logger.warning("Rate limits fall back to per-worker counters, Redis failed: {!r}", exc)
+                self._redis_down_until = time.monotonic() + settings().RATE_LIMIT_REDIS_RETRY_SECONDS
+
+        return await getattr(self.local_limiter, method)(*args)
+
+    async def _check_rate_limits(self, limits: typing.Sequence[RateLimitSchema], route_key: str, scope: Scope) -> float:
+        principal = self.principal(Request(scope)) if any(limit.per_principal for limit in limits) else "*"
+
+        for limit in limits:
+            key = RateLimitRedisRepository.key_schema.get_key(
+                limit.algorithm.value,
+                limit.limit,
+                limit.period_seconds,
+                route_key,
+                principal if limit.per_principal else "*",
+            )
+            retry_after = await self._call("hit", key, limit)
+            if retry_after:
+                return retry_after
+
+        return 0
+
+    async def _call_with_slot(
+        self, route_key: str, max_requests: int, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        slot_key, lease_id = RateLimitRedisRepository.key_schema.get_key("concurrency", route_key), uuid4().hex
+        on_redis = self._redis_up
+        try:
+            if not await self._call("acquire_slot", slot_key, max_requests, lease_id, CONCURRENCY_LEASE_SECONDS):
+                await _too_many_requests(1)(scope, receive, send)
+                return
+
+            await self.app(scope, receive, send)
+        finally:
+            await self._release_slot(slot_key, lease_id, on_redis)
+
+    async def _release_slot(self, slot_key: str, lease_id: str, on_redis: bool) -> None:
+        # The slot may have been taken locally while Redis was down, releasing a missing lease is a no-op.
+        await self.local_limiter.release_slot(slot_key, lease_id)
+        if not on_redis:
+            return
+
+        # An acquire cut off by the timeout may still have run in Redis, so its lease is released
+        # even after falling back. Should this fail too, the lease expires after CONCURRENCY_LEASE_SECONDS.
+        try:
+            async with asyncio.timeout(settings().RATE_LIMIT_REDIS_TIMEOUT_SECONDS):
+                await RateLimitRedisRepository(session=get_redis_connection()).release_slot(slot_key, lease_id)
+        except (RedisError, OSError, TimeoutError) as exc:
+            logger.warning("Concurrency lease {} kept until it expires, Redis failed: {!r}", slot_key, exc)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = self._match_route(scope) if scope["type"] == "http" else None
+        endpoint = getattr(route, "endpoint", None)
+        limits = getattr(endpoint, RATE_LIMITS_ATTRIBUTE, self.default_limits)
+        max_requests = getattr(endpoint, CONCURRENCY_LIMIT_ATTRIBUTE, self.default_concurrency_limit)
+
+        if route is None or (not limits and max_requests is None):
+            await self.app(scope, receive, send)
+            return
+
+        route_key = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+        retry_after = await self._check_rate_limits(limits, route_key, scope)
+        if retry_after:
+            await _too_many_requests(retry_after)(scope, receive, send)
+        elif max_requests is None:
+            await self.app(scope, receive, send)
+        else:
+            await self._call_with_slot(route_key, max_requests, scope, receive, send)
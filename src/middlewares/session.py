@@ -0,0 +1,187 @@
+"""
+Server-side sessions in Redis, the cookie only holds an opaque session id.
+
+Usage:
+@router.post("/cart", response_model=CartSchema)
+async def add_to_cart(request: Request, item: CartItemSchema) -> CartSchema:
+    request.session["cart"] = [*request.session.get("cart", []), item.model_dump()]
+    ...
+
+@router.post("/login")
+async def login(request: Request, ...) -> ...:
+    request.session.regenerate()
+    request.session["user_id"] = user.id
+
+The session is read once per request carrying the cookie, before the app runs, so `request.session` works
+anywhere (authlib's OAuth state included); requests without the cookie never touch Redis. A read restarts the TTL
+in Redis, while the cookie is only renewed when the session is written. The session is written back only after
+`session[...] = ...`, `del session[...]`, `session.clear()` or `session.regenerate()`: mutating a nested value
+in place needs `session.modified = True`.
+Call `regenerate()` on login and privilege changes, so an id planted before authentication is not reused after it.
+While Redis is unavailable requests get an empty session that is not saved, and the cookie is left as it is.
+"""
+
+import collections.abc
+import secrets
+import typing
+
+from loguru import logger
+from redis.exceptions import RedisError
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from db.redis import get_redis_connection
+from db.repositories.session import SessionRedisRepository
+
+
+class RedisSession(collections.abc.MutableMapping[str, typing.Any]):
+    """Session data loaded from Redis on `load()`, tracking whether it has to be written back."""
+
+    def __init__(self, session_id: str | None, ttl_seconds: int) -> None:
+        self.session_id = session_id
+        self.ttl_seconds = ttl_seconds
+        # A request without a cookie starts with an empty session, there is nothing to read.
+        self.loaded = session_id is None
+        self.modified = False
+        self._data: dict[str, typing.Any] = {}
+        self._rotated_id: str | None = None
+
+    @property
+    def repository(self) -> SessionRedisRepository:
+        return SessionRedisRepository(session=get_redis_connection())
+
+    @property
+    def data(self) -> dict[str, typing.Any]:
+        if not self.loaded:
+            raise RuntimeError("Session is not loaded, add `RedisSessionMiddleware` or await `session.load()` first")
+
+        return self._data
+
+    async def load(self) -> "RedisSession":
+        if not self.loaded:
+            data = await self.repository.get(typing.cast(str, self.session_id), self.ttl_seconds)
+            if data is None:
+                # Expired or unknown id: a new id is issued when the session is saved.
+                self.session_id = None
+
+            self._data, self.loaded = data or {}, True
+
+        return self
+
+    def regenerate(self) -> None:
+        """Keep the data under a new session id, the old one is deleted when the session is saved."""
+
+        if self.session_id is not None:
+            self._rotated_id, self.session_id = self._rotated_id or self.session_id, None
+
+        self.modified = True
+
+    async def save(self) -> None:
+        if not self.modified:
+            return
+
+        if self._data:
+            self.session_id = self.session_id or secrets.token_urlsafe(32)
+            await self.repository.set(self.session_id, self._data, self.ttl_seconds)
+        elif self.session_id is not None:
+            await self.repository.delete(self.session_id)
+            self.session_id = None
+
+        # Deleted after the new id is stored, a failed write keeps the old session usable.
+        if self._rotated_id is not None:
+            await self.repository.delete(self._rotated_id)
+            self._rotated_id = None
+
+        self.modified = False
+
+    def __getitem__(self, key: str) -> typing.Any:
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: typing.Any) -> None:
+        self.data[key] = value
+        self.modified = True
+
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        self.modified = True
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def clear(self) -> None:
+        self.data.clear()
+        self.modified = True
+
+
+async def load_session(request: Request) -> RedisSession:
+    """Dependency kept for routes that want the session as a parameter, the middleware has already loaded it."""
+
+    return await request.scope["session"].load()
+
+
+class RedisSessionMiddleware:
+    """Drop-in replacement of Starlette's `SessionMiddleware`, keeping the data in Redis instead of the cookie."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        session_cookie: str = "session",
+        ttl_seconds: int = 14 * 24 * 60 * 60,
+        path: str = "/",
+        same_site: typing.Literal["lax", "strict", "none"] = "lax",
+        https_only: bool = False,
+    ) -> None:
+        self.app = app
+        self.session_cookie = session_cookie
+        self.ttl_seconds = ttl_seconds
+        self.cookie_flags = f"path={path}; httponly; samesite={same_site}" + ("; secure" if https_only else "")
+
+    def _set_cookie(self, message: Message, session_id: str | None) -> None:
+        value = (
+            f"{session_id}; Max-Age={self.ttl_seconds}"
+            if session_id is not None
+            else "null; expires=Thu, 01 Jan 1970 00:00:00 GMT"
+        )
+        MutableHeaders(scope=message).append("Set-Cookie", f"{self.session_cookie}={value}; {self.cookie_flags}")
+
+    async def _load(self, initial_id: str | None) -> tuple[RedisSession, bool]:
+        """Session of the cookie and whether it can be saved, an empty unsaved one if Redis failed."""
+
+        try:
+            return await RedisSession(initial_id, self.ttl_seconds).load(), True
+        except (RedisError, OSError) as exc:
+            logger.warning("Session not loaded, the request goes on with an empty one, Redis failed: {!r}", exc)
+            return RedisSession(None, self.ttl_seconds), False
+
+    async def _save(self, message: Message, initial_id: str | None, session: RedisSession) -> None:
+        written = session.modified
+        try:
+            await session.save()
+        except (RedisError, OSError) as exc:
+            logger.warning("Session not saved, the cookie is left as it is, Redis failed: {!r}", exc)
+            return
+
+        # Unmodified sessions keep their cookie, unless their id was unknown or expired.
+        if written or session.session_id != initial_id:
+            self._set_cookie(message, session.session_id)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        initial_id = HTTPConnection(scope).cookies.get(self.session_cookie) or None
+        session, saved = await self._load(initial_id)
+        scope["session"] = session
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and saved:
+                await self._save(message, initial_id, session)
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -2,17 +2,20 @@ import asyncio
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, func, pool, select
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from core.config import settings
+from core.constants import MIGRATION_LOCK_KEY
+from db.migrations import set_default_timeouts
 from db.models import BaseModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option("sqlalchemy.url", settings().postgres_dsn)
+# Callers may target another database, e.g. tests migrate their template database.
+config.set_main_option("sqlalchemy.url", config.get_main_option("sqlalchemy.url") or settings().postgres_dsn)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -49,6 +52,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -56,7 +60,14 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # Migration jobs started together wait for each other instead of racing through the same revisions.
+    connection.execute(select(func.pg_advisory_lock(MIGRATION_LOCK_KEY)))
+    # Session-level, so they apply to every revision and helpers from `db.migrations` can lift them per step.
+    set_default_timeouts(connection)
+    connection.commit()
+
+    # Each revision commits on its own, and steps like CREATE INDEX CONCURRENTLY run between transactions.
+    context.configure(connection=connection, target_metadata=target_metadata, transaction_per_migration=True)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,33 @@
+"""Add review summaries
+
+Revision ID: 5f67b41edaf4
+Revises:
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str | None = "5f67b41edaf4"
+down_revision: str | None = None
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "review_summaries",
+        sa.Column("quarter_id", sa.Integer(), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("template_id", sa.Integer(), nullable=False),
+        sa.Column("metric", sa.String(length=255), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "quarter_id", "department_id", "template_id", "metric", name=op.f("review_summaries_pkey")
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("review_summaries")
@@ -0,0 +1,45 @@
+"""
+Recount review analytics from scratch, e.g. after a bug in incremental updates.
+
+Usage: cd src && python rebuild_analytics.py --quarter-id 1
+"""
+
+import argparse
+import asyncio
+import importlib
+
+from loguru import logger
+
+from db.repositories.analytics import ReviewSummaryRepository
+from db.session import dispose_engines, get_async_session
+from services.analytics import SUMMARY_SOURCES, AnalyticsService
+
+# Modules defining `@summary_source` functions, imported to register them.
+SOURCE_MODULES: tuple[str, ...] = ()
+
+
+async def run(quarter_id: int | None) -> None:
+    for module in SOURCE_MODULES:
+        importlib.import_module(module)
+
+    try:
+        async with get_async_session()() as session:
+            analytics_service = AnalyticsService(summary_repository=ReviewSummaryRepository(session=session))
+            await analytics_service.rebuild(quarter_id)
+            await session.commit()
+    finally:
+        await dispose_engines()
+
+    logger.info("Rebuilt review analytics of {} from {} sources", quarter_id or "all quarters", len(SUMMARY_SOURCES))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quarter-id", type=int, default=None, help="Rebuild one quarter, all of them by default")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.quarter_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,12 @@
 Directory for describing pydantic schemas.
 
 Schema example:
-from pydantic import BaseModel
+from schemas.base import BaseOrmSchema
 
-from schemas.mixins import OrjsonConfigMixin
 
-class SomeSchema(BaseModel):
+class SomeSchema(BaseOrmSchema):
     some_field: str
 
-    class Config(OrjsonConfigMixin):
-        pass
+Responses are rendered by `api.responses.PydanticJSONResponse`, the app default,
+so schemas need no JSON config of their own.
 """
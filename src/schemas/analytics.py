@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class ReviewSummarySchema(BaseModel):
+    quarter_id: int
+    department_id: int | None = None
+    template_id: int | None = None
+    reviews_by_status: dict[str, int] = {}
+    answers_by_question: dict[int, int] = {}
+    reviewer_load: dict[int, int] = {}
@@ -0,0 +1,9 @@
+from schemas.base import BaseOrmSchema
+
+
+class PrincipalSchema(BaseOrmSchema):
+    """Authenticated user with what authorization checks need, cached between requests."""
+
+    user_id: int
+    roles: list[str] = []
+    department_ids: list[int] = []
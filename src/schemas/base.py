@@ -2,6 +2,8 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict
 
+from core.config import settings
+
 
 class BaseOrmSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -16,4 +18,7 @@ class BaseKeySchema(BaseModel):
 
 
 class RedisKeySchema(BaseKeySchema):
-    delimiter: str = ":"
\ No newline at end of file
+    delimiter: str = ":"
+
+    def get_key(self, *args: Any) -> str:
+        return f"{settings().REDIS_KEY_PREFIX}{super().get_key(*args)}"
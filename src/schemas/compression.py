@@ -0,0 +1,10 @@
+from pydantic import BaseModel, NonNegativeInt
+
+from core.enums import ContentEncodingEnum
+
+
+class CompressionSchema(BaseModel):
+    """Bodies from `min_size_bytes` are compressed with the best of `encodings` the client accepts."""
+
+    min_size_bytes: NonNegativeInt
+    encodings: tuple[ContentEncodingEnum, ...] = tuple(ContentEncodingEnum)
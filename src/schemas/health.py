@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class ReadinessSchema(BaseModel):
+    accepting_requests: bool
+    postgres: bool
+    redis: bool
+
+    @property
+    def is_ready(self) -> bool:
+        return self.accepting_requests and self.postgres and self.redis
@@ -0,0 +1,20 @@
+import datetime
+import typing
+
+from pydantic import BaseModel, Field
+
+from core.enums import JobStatusEnum
+
+
+class JobSchema(BaseModel):
+    id: str
+    name: str
+    payload: dict[str, typing.Any] = Field(default_factory=dict)
+    status: JobStatusEnum = JobStatusEnum.QUEUED
+    attempts: int = 0
+    max_attempts: int
+    idempotency_key: str | None = None
+    result: typing.Any = None
+    error: str | None = None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+from core.metrics import Histogram
+
+
+class HistogramSchema(BaseModel):
+    buckets: dict[str, int]
+    sum: float
+    count: int
+
+    @classmethod
+    def from_histogram(cls, histogram: Histogram) -> "HistogramSchema":
+        return cls(buckets=histogram.cumulative_counts(), sum=histogram.sum, count=histogram.count)
+
+
+class PoolStatsSchema(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    wait_seconds: HistogramSchema
+    connect_seconds: HistogramSchema
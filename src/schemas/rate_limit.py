@@ -0,0 +1,12 @@
+from pydantic import BaseModel, PositiveFloat, PositiveInt
+
+from core.enums import RateLimitAlgorithmEnum
+
+
+class RateLimitSchema(BaseModel):
+    """`limit` requests per `period_seconds`, for the token bucket also its capacity."""
+
+    limit: PositiveInt
+    period_seconds: PositiveFloat
+    algorithm: RateLimitAlgorithmEnum = RateLimitAlgorithmEnum.SLIDING_WINDOW
+    per_principal: bool = True
@@ -0,0 +1,8 @@
+from schemas.base import BaseOrmSchema
+
+
+class CachedResponseSchema(BaseOrmSchema):
+    body: str
+    etag: str
+    media_type: str = "application/json"
+    status_code: int = 200
@@ -6,7 +6,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.repositories.some_model_repository import SomeModelRepository
-from db.session import get_session
+from db.session import get_read_session, get_session
 from db.redis import get_redis, AsyncRedis
 from schemas.some_model import SomeModelSchema
 
@@ -15,10 +15,11 @@ class SomeService:
     def __init__(
         self,
         session: AsyncSession = Depends(get_session),
+        read_session: AsyncSession = Depends(get_read_session),
         redis: AsyncRedis = Depends(get_redis),
     ) -> None:
         self.redis = redis
-        self.some_model_repository = SomeModelRepository(session=session)
+        self.some_model_repository = SomeModelRepository(session=session, read_session=read_session)
 
     async def get_instances() -> list[SomeModel]:
         return await self.some_model_repository.get_instances()
@@ -26,4 +27,15 @@ class SomeService:
     async def get_cached_instance(instance_id: int) -> SomeModelSchema:
         raw_instance = await self.redis.get(f"some-model-key:{instance_id}")
         return SomeModelSchema.parse_raw(raw_instance)
+
+Request-scoped container example, one async dependency instead of a `Depends` tree per service:
+from fastapi import Depends
+
+from services.container import ServiceContainer, get_service_container
+
+
+@router.get("/some-models")
+async def get_some_models(services: ServiceContainer = Depends(get_service_container)) -> list[SomeModelSchema]:
+    # SomeService and its repositories are built on first `get` and shared for the rest of the request.
+    return await services.get(SomeService).get_instances()
 """
@@ -0,0 +1,104 @@
+"""
+Review analytics served from counters in `review_summaries` instead of GROUP BYs over reviews and answers.
+
+Services writing reviews and answers keep the counters current in the same transaction:
+await analytics_service.record_review_status(quarter_id, department_id, template_id, "draft", "completed")
+await analytics_service.record_answers(quarter_id, department_id, template_id, [question.id for question in questions])
+
+Source example for `rebuild_analytics.py`, registered on import of its module from `SOURCE_MODULES` there:
+@summary_source
+def reviews_by_status(quarter_id: int | None) -> Select[typing.Any]:
+    query = select(
+        Review.quarter_id,
+        Review.department_id,
+        Review.template_id,
+        literal("reviews_by_status:") + cast(Review.status, String),
+        func.count(),
+    ).group_by(Review.quarter_id, Review.department_id, Review.template_id, Review.status)
+    return query.where(Review.quarter_id == quarter_id) if quarter_id is not None else query
+"""
+
+import collections
+import typing
+
+from fastapi import Depends
+from sqlalchemy import Select
+
+from core.enums import ReviewSummaryMetricEnum
+from db.repositories.analytics import ReviewSummaryRepository
+from schemas.analytics import ReviewSummarySchema
+
+SummarySource: typing.TypeAlias = typing.Callable[[int | None], Select[typing.Any]]
+
+SUMMARY_SOURCES: list[SummarySource] = []
+
+
+def summary_source(source: SummarySource) -> SummarySource:
+    SUMMARY_SOURCES.append(source)
+    return source
+
+
+def get_metric(kind: ReviewSummaryMetricEnum, key: typing.Any) -> str:
+    return f"{kind.value}:{key}"
+
+
+class AnalyticsService:
+    def __init__(self, summary_repository: ReviewSummaryRepository = Depends()) -> None:
+        self.summary_repository = summary_repository
+
+    async def _increment(self, quarter_id: int, department_id: int, template_id: int, deltas: dict[str, int]) -> None:
+        dimensions = {"quarter_id": quarter_id, "department_id": department_id, "template_id": template_id}
+        await self.summary_repository.increment(dimensions, deltas)
+
+    async def record_review_status(
+        self, quarter_id: int, department_id: int, template_id: int, old_status: str | None, new_status: str | None
+    ) -> None:
+        """Move a review between status counters, None for a created or deleted review."""
+
+        deltas: collections.Counter[str] = collections.Counter()
+        if old_status is not None:
+            deltas[get_metric(ReviewSummaryMetricEnum.REVIEWS_BY_STATUS, old_status)] -= 1
+        if new_status is not None:
+            deltas[get_metric(ReviewSummaryMetricEnum.REVIEWS_BY_STATUS, new_status)] += 1
+
+        await self._increment(quarter_id, department_id, template_id, deltas)
+
+    async def record_answers(
+        self, quarter_id: int, department_id: int, template_id: int, question_ids: typing.Iterable[int], delta: int = 1
+    ) -> None:
+        deltas = collections.Counter(
+            get_metric(ReviewSummaryMetricEnum.ANSWERS_BY_QUESTION, question_id) for question_id in question_ids
+        )
+        await self._increment(
+            quarter_id, department_id, template_id, {key: count * delta for key, count in deltas.items()}
+        )
+
+    async def record_reviewer_load(
+        self, quarter_id: int, department_id: int, template_id: int, reviewer_id: int, delta: int
+    ) -> None:
+        deltas = {get_metric(ReviewSummaryMetricEnum.REVIEWER_LOAD, reviewer_id): delta}
+        await self._increment(quarter_id, department_id, template_id, deltas)
+
+    async def get_summary(
+        self, quarter_id: int, department_id: int | None = None, template_id: int | None = None
+    ) -> ReviewSummarySchema:
+        dimensions = {"quarter_id": quarter_id, "department_id": department_id, "template_id": template_id}
+        counters = await self.summary_repository.get(
+            **{key: value for key, value in dimensions.items() if value is not None}
+        )
+
+        groups: dict[str, dict[str, int]] = collections.defaultdict(dict)
+        for metric, value in counters.items():
+            kind, key = metric.split(":", 1)
+            groups[kind][key] = value
+
+        return ReviewSummarySchema(**dimensions, **groups)
+
+    async def rebuild(self, quarter_id: int | None = None) -> None:
+        """Recount everything, or one quarter, from `SUMMARY_SOURCES`."""
+
+        if not SUMMARY_SOURCES:
+            raise RuntimeError("No summary sources registered, rebuilding would only delete counters")
+
+        sources = [source(quarter_id) for source in SUMMARY_SOURCES]
+        await self.summary_repository.rebuild(sources, **({"quarter_id": quarter_id} if quarter_id is not None else {}))
@@ -0,0 +1,83 @@
+"""
+Current principal of a request, resolved from the database once and cached between requests.
+
+Loader example, registered on import of its module:
+@principal_loader
+async def load_principal(session: AsyncSession, user_id: int) -> PrincipalSchema | None:
+    query = select(User).options(selectinload(User.department_users)).filter_by(id=user_id)
+    user = await session.scalar(query)
+    if user is None:
+        return None
+
+    return PrincipalSchema(
+        user_id=user.id,
+        roles=[department_user.role for department_user in user.department_users],
+        department_ids=[department_user.department_id for department_user in user.department_users],
+    )
+
+Routes depend on `get_current_principal`, write paths changing roles or departments of a user
+call `await auth_service.invalidate_principal(user_id)` after their commit.
+"""
+
+import typing
+
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.exceptions import credentials_exception
+from core.security import read_access_token
+from db.repositories.principal import PrincipalRedisRepository
+from db.session import get_session
+from schemas.auth import PrincipalSchema
+
+PrincipalLoader: typing.TypeAlias = typing.Callable[[AsyncSession, int], typing.Awaitable[PrincipalSchema | None]]
+
+
+def principal_loader(loader: PrincipalLoader) -> PrincipalLoader:
+    AuthService.loader = staticmethod(loader)
+    return loader
+
+
+class AuthService:
+    loader: typing.ClassVar[PrincipalLoader | None] = None
+
+    def __init__(
+        self,
+        # Not a replica: a lagging one would put the roles just invalidated back into the cache.
+        session: AsyncSession = Depends(get_session),
+        principal_repository: PrincipalRedisRepository = Depends(),
+    ) -> None:
+        self.session = session
+        self.principal_repository = principal_repository
+
+    async def get_principal(self, user_id: int) -> PrincipalSchema:
+        principal = await self.principal_repository.get(str(user_id))
+        if principal is not None:
+            return principal
+
+        if self.loader is None:
+            raise RuntimeError("No principal loader registered, decorate one with `@principal_loader`")
+
+        generation = await self.principal_repository.get_generation(user_id)
+        principal = await self.loader(self.session, user_id)
+        if principal is None:
+            raise credentials_exception
+
+        await self.principal_repository.save(principal, generation, settings().PRINCIPAL_CACHE_TTL_SECONDS)
+        return principal
+
+    async def invalidate_principal(self, user_id: int) -> None:
+        await self.principal_repository.invalidate(user_id)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
+    auth_service: AuthService = Depends(),
+) -> PrincipalSchema:
+    user_id = read_access_token(credentials.credentials) if credentials is not None else None
+    if user_id is None:
+        raise credentials_exception
+
+    return await auth_service.get_principal(user_id)
@@ -0,0 +1,67 @@
+import functools
+import inspect
+import typing
+
+from fastapi import Depends
+from fastapi.params import Depends as DependsParam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.redis import AsyncRedis, get_redis
+from db.session import get_read_session, get_session
+
+T = typing.TypeVar("T")
+
+# Constructor parameter names with the resource or class each of them is built from.
+_Plan: typing.TypeAlias = tuple[tuple[str, typing.Callable[..., typing.Any]], ...]
+
+RESOURCES = (get_session, get_read_session, get_redis)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_plan(cls: type) -> _Plan:
+    """Read which `Depends` a class constructor declares, once per class instead of once per request."""
+
+    plan = []
+    for name, parameter in inspect.signature(cls).parameters.items():
+        if not isinstance(parameter.default, DependsParam):
+            continue
+
+        dependency = parameter.default.dependency or parameter.annotation
+        if dependency not in RESOURCES and not inspect.isclass(dependency):
+            raise TypeError(f"{cls.__name__}.{name}: the container only resolves classes and {RESOURCES}")
+
+        plan.append((name, dependency))
+
+    return tuple(plan)
+
+
+class ServiceContainer:
+    """Request-scoped services and repositories, built on first use and shared within the request.
+
+    FastAPI solves the whole `Depends` tree of an endpoint on every call and runs sync dependencies, class
+    constructors included, in the threadpool. The container is one async dependency and builds only what
+    the handler actually touches, with constructor signatures read once per class.
+    """
+
+    def __init__(self, session: AsyncSession, read_session: AsyncSession, redis: AsyncRedis) -> None:
+        self._instances: dict[typing.Callable[..., typing.Any], typing.Any] = {
+            get_session: session,
+            get_read_session: read_session,
+            get_redis: redis,
+        }
+
+    def get(self, cls: typing.Callable[..., T]) -> T:
+        instance = self._instances.get(cls)
+        if instance is None:
+            kwargs = {name: self.get(dependency) for name, dependency in _get_plan(cls)}
+            instance = self._instances[cls] = cls(**kwargs)
+
+        return instance
+
+
+async def get_service_container(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
+    redis: AsyncRedis = Depends(get_redis),
+) -> ServiceContainer:
+    return ServiceContainer(session=session, read_session=read_session, redis=redis)
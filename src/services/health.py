@@ -0,0 +1,35 @@
+import asyncio
+import typing
+
+from fastapi import Depends
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.redis import AsyncRedis, get_redis
+from db.session import get_session
+from schemas.health import ReadinessSchema
+
+
+class HealthService:
+    def __init__(self, session: AsyncSession = Depends(get_session), redis: AsyncRedis = Depends(get_redis)) -> None:
+        self.session = session
+        self.redis = redis
+
+    @staticmethod
+    async def _probe(name: str, check: typing.Callable[[], typing.Awaitable[typing.Any]]) -> bool:
+        try:
+            await asyncio.wait_for(check(), timeout=settings().HEALTH_CHECK_TIMEOUT_SECONDS)
+        except Exception as exc:
+            logger.warning("Readiness check of {} failed: {!r}", name, exc)
+            return False
+
+        return True
+
+    async def check_readiness(self, accepting_requests: bool) -> ReadinessSchema:
+        postgres, redis = await asyncio.gather(
+            self._probe("postgres", lambda: self.session.execute(text("SELECT 1"))),
+            self._probe("redis", self.redis.ping),
+        )
+        return ReadinessSchema(accepting_requests=accepting_requests, postgres=postgres, redis=redis)
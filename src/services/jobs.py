@@ -0,0 +1,208 @@
+"""
+Background jobs on Redis, run by `worker.py`.
+
+Handler example, registered on import of its module from `worker.HANDLER_MODULES`:
+@job_handler("reviews.create_for_quarter")
+async def create_reviews_for_quarter(session: AsyncSession, payload: dict[str, typing.Any]) -> dict[str, int]:
+    repository = ReviewDatabaseRepository(session=session)
+    rows = 0
+    for values in batched(iter_review_values(payload["quarter_id"]), settings().JOB_BATCH_SIZE):
+        await repository.bulk_create(values, returning=False)
+        rows += len(values)
+
+    return {"rows": rows}
+
+The worker commits the session after the handler returns, so a retried job never sees half of its writes.
+Enqueue from services with `JobService.enqueue("reviews.create_for_quarter", {"quarter_id": 1}, idempotency_key="1")`.
+"""
+
+import asyncio
+import itertools
+import random
+import typing
+
+from fastapi import Depends
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.constants import JOB_LEASE_SECONDS, JOB_POLL_INTERVAL_SECONDS
+from core.enums import JobStatusEnum
+from core.exceptions import job_not_found_exception
+from db.redis import AsyncRedis, get_reconnect_delay
+from db.repositories.jobs import JobRedisRepository
+from db.session import get_async_session
+from schemas.jobs import JobSchema
+
+T = typing.TypeVar("T")
+
+JobHandler: typing.TypeAlias = typing.Callable[[AsyncSession, dict[str, typing.Any]], typing.Awaitable[typing.Any]]
+
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(name: str) -> typing.Callable[[JobHandler], JobHandler]:
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[name] = handler
+        return handler
+
+    return decorator
+
+
+def batched(iterable: typing.Iterable[T], size: int) -> typing.Iterator[list[T]]:
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def get_retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, so jobs failing together do not retry together."""
+
+    delay = min(settings().JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1), settings().JOB_RETRY_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1)
+
+
+class JobService:
+    def __init__(self, job_repository: JobRedisRepository = Depends()) -> None:
+        self.job_repository = job_repository
+
+    async def enqueue(self, name: str, payload: dict[str, typing.Any], idempotency_key: str | None = None) -> JobSchema:
+        return await self.job_repository.enqueue(name, payload, settings().JOB_MAX_ATTEMPTS, idempotency_key)
+
+    async def get(self, job_id: str) -> JobSchema:
+        job = await self.job_repository.get(job_id)
+        if job is None:
+            raise job_not_found_exception
+
+        return job
+
+
+class JobWorker:
+    """Runs up to `concurrency` jobs at once, each handler in its own session and transaction."""
+
+    def __init__(
+        self,
+        redis: AsyncRedis,
+        concurrency: int,
+        handlers: dict[str, JobHandler] = JOB_HANDLERS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        shutdown_timeout_seconds: float | None = None,
+    ) -> None:
+        self.job_repository = JobRedisRepository(session=redis)
+        self.concurrency = concurrency
+        self.handlers = handlers
+        self.lease_seconds = lease_seconds
+        self.shutdown_timeout_seconds = (
+            settings().JOB_SHUTDOWN_TIMEOUT_SECONDS if shutdown_timeout_seconds is None else shutdown_timeout_seconds
+        )
+        self.running: set[asyncio.Task[None]] = set()
+
+    async def _renew_lease(self, job_id: str) -> None:
+        # Failed renewals are retried well within the rest of the lease, another worker would run the job otherwise.
+        failures = 0
+        while True:
+            await asyncio.sleep(get_reconnect_delay(failures) if failures else self.lease_seconds / 3)
+            try:
+                await self.job_repository.renew_lease(job_id, self.lease_seconds)
+            except (RedisError, OSError) as exc:
+                failures += 1
+                logger.warning("Lease of job {} not renewed, attempt {}: {!r}", job_id, failures, exc)
+            else:
+                failures = 0
+
+    async def _run_handler(self, job: JobSchema) -> typing.Any:
+        handler = self.handlers[job.name]
+        async with get_async_session()() as session:
+            result = await handler(session, job.payload)
+            await session.commit()
+
+        return result
+
+    async def process(self, job_id: str) -> None:
+        try:
+            await self._process(job_id)
+        except (RedisError, OSError) as exc:
+            # The job stays leased, once the lease lapses it is queued again and runs at least once more.
+            logger.warning("Bookkeeping of job {} failed, it is retried after its lease: {!r}", job_id, exc)
+
+    async def _process(self, job_id: str) -> None:
+        job = await self.job_repository.get(job_id)
+        if job is None:
+            await self.job_repository.forget(job_id)
+            return
+
+        if job.name not in self.handlers or job.attempts >= job.max_attempts:
+            reason = "no handler registered" if job.name not in self.handlers else "attempts exhausted"
+            await self.job_repository.fail(job, reason, retry_in_seconds=None)
+            return
+
+        job.status, job.attempts = JobStatusEnum.RUNNING, job.attempts + 1
+        await self.job_repository.save(job)
+
+        lease_renewal = asyncio.create_task(self._renew_lease(job.id))
+        try:
+            result = await self._run_handler(job)
+        except Exception as exc:
+            logger.exception("Job {} {} failed, attempt {}", job.name, job.id, job.attempts)
+            retry_in_seconds = get_retry_delay(job.attempts) if job.attempts < job.max_attempts else None
+            await self.job_repository.fail(job, repr(exc), retry_in_seconds)
+        else:
+            await self.job_repository.complete(job, result)
+        finally:
+            lease_renewal.cancel()
+
+    async def _wait(self, timeout_seconds: float, stop: asyncio.Event) -> None:
+        """Wait until a job finishes, `stop` is set or the timeout passes."""
+
+        stop_task = asyncio.create_task(stop.wait())
+        await asyncio.wait([*self.running, stop_task], timeout=timeout_seconds, return_when=asyncio.FIRST_COMPLETED)
+        stop_task.cancel()
+
+    def _finish(self, task: asyncio.Task[None]) -> None:
+        self.running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error("Job task failed")
+
+    def _start(self, job_id: str) -> None:
+        task = asyncio.create_task(self.process(job_id))
+        self.running.add(task)
+        task.add_done_callback(self._finish)
+
+    async def _shutdown(self) -> None:
+        if not self.running:
+            return
+
+        _, pending = await asyncio.wait(self.running, timeout=self.shutdown_timeout_seconds)
+        for task in pending:
+            task.cancel()
+
+        # Exceptions are logged by `_finish`, a failed or hung job must not keep the worker from exiting.
+        await asyncio.gather(*pending, return_exceptions=True)
+        if pending:
+            logger.warning("{} jobs cancelled on shutdown, they are retried once their leases lapse", len(pending))
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process jobs until `stop` is set, then wait up to `shutdown_timeout_seconds` for the running ones."""
+
+        failures = 0
+        while not stop.is_set():
+            free_slots = self.concurrency - len(self.running)
+            try:
+                job_ids = await self.job_repository.dequeue(free_slots, self.lease_seconds) if free_slots else []
+            except (RedisError, OSError) as exc:
+                # Running jobs go on meanwhile, they only need Redis to renew leases and store results.
+                failures += 1
+                delay = get_reconnect_delay(failures)
+                logger.warning("Dequeueing failed, retrying in {:.1f}s: {!r}", delay, exc)
+                await self._wait(delay, stop)
+                continue
+
+            failures = 0
+            for job_id in job_ids:
+                self._start(job_id)
+
+            if not job_ids:
+                await self._wait(JOB_POLL_INTERVAL_SECONDS if free_slots else self.lease_seconds, stop)
+
+        await self._shutdown()
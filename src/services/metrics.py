@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from fastapi import Depends
+from loguru import logger
+
+from core.constants import (
+    EVENT_LOOP_LAG_INTERVAL_SECONDS,
+    METRICS_PUSH_INTERVAL_SECONDS,
+)
+from core.metrics import EVENT_LOOP_LAG, collect, label_workers, render_prometheus
+from db.redis import AsyncRedis
+from db.repositories.metrics import MetricsRedisRepository
+
+
+class MetricsService:
+    def __init__(self, metrics_repository: MetricsRedisRepository = Depends()) -> None:
+        self.metrics_repository = metrics_repository
+
+    async def render(self) -> str:
+        """Render metrics of every worker that pushed recently, this one fresh, as series labelled by worker."""
+
+        await self.metrics_repository.push(collect())
+        workers = await self.metrics_repository.get_all(max_age_seconds=METRICS_PUSH_INTERVAL_SECONDS * 3)
+        return render_prometheus(label_workers(workers))
+
+
+async def push_metrics_periodically(redis: AsyncRedis) -> None:
+    metrics_repository = MetricsRedisRepository(session=redis)
+
+    while True:
+        try:
+            await metrics_repository.push(collect())
+        except Exception as exc:
+            logger.warning("Failed to push metrics: {!r}", exc)
+
+        await asyncio.sleep(METRICS_PUSH_INTERVAL_SECONDS)
+
+
+async def monitor_event_loop_lag(interval_seconds: float = EVENT_LOOP_LAG_INTERVAL_SECONDS) -> None:
+    """Record how much later than scheduled the loop wakes up, i.e. how long callbacks block it."""
+
+    while True:
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval_seconds)
+        EVENT_LOOP_LAG.observe(max(time.perf_counter() - started_at - interval_seconds, 0))
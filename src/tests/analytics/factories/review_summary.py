@@ -0,0 +1,17 @@
+import factory
+from factory.fuzzy import FuzzyChoice, FuzzyInteger
+
+from core.enums import ReviewSummaryMetricEnum
+from db.models import ReviewSummary
+from tests.auth.factories.base import BaseFactory
+
+
+class ReviewSummaryFactory(BaseFactory):
+    class Meta:
+        model = ReviewSummary
+
+    quarter_id = factory.Sequence(lambda n: n)
+    department_id = FuzzyInteger(1, 100)
+    template_id = FuzzyInteger(1, 10)
+    metric = FuzzyChoice([f"{kind.value}:1" for kind in ReviewSummaryMetricEnum])
+    value = FuzzyInteger(0, 1000)
@@ -0,0 +1,47 @@
+import typing
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.query_tracker import QueryTracker
+from db.repositories.analytics import ReviewSummaryRepository
+
+HOT_SUMMARY_READS = (
+    {"quarter_id": 1},
+    {"quarter_id": 1, "department_id": 2},
+    {"quarter_id": 1, "template_id": 3},
+    {"quarter_id": 1, "department_id": 2, "template_id": 3},
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dimensions", HOT_SUMMARY_READS)
+async def test__review_summary_reads__use_indexes(
+    async_db_session: AsyncSession,
+    max_queries: typing.Callable[..., typing.ContextManager[QueryTracker]],
+    assert_indexed: typing.Callable[[QueryTracker], typing.Awaitable[None]],
+    dimensions: dict[str, int],
+) -> None:
+    repository = ReviewSummaryRepository(session=async_db_session)
+
+    with max_queries(1) as tracker:
+        await repository.get(**dimensions)
+
+    await assert_indexed(tracker)
+
+
+@pytest.mark.asyncio
+async def test__review_summary_increment__uses_indexes(
+    async_db_session: AsyncSession,
+    max_queries: typing.Callable[..., typing.ContextManager[QueryTracker]],
+    assert_indexed: typing.Callable[[QueryTracker], typing.Awaitable[None]],
+) -> None:
+    repository = ReviewSummaryRepository(session=async_db_session)
+    dimensions = {"quarter_id": 1, "department_id": 2, "template_id": 3}
+
+    # An advisory lock of the quarter each, then the upsert and the delete.
+    with max_queries(4) as tracker:
+        await repository.increment(dimensions, {"reviews_by_status:done": 1})
+        await repository.rebuild([], quarter_id=1)
+
+    await assert_indexed(tracker)
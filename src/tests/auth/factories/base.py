@@ -1,10 +1,14 @@
 import typing
 
-from factory import Factory
+from factory import Factory, SubFactory
+from sqlalchemy import inspect, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models.base import BaseModel
 
+# Objects added per flush, SQLAlchemy sends each flush as multi-row INSERT ... RETURNING statements.
+FACTORY_BATCH_SIZE = 1000
+
 
 class BaseFactory(Factory):
     @classmethod
@@ -20,5 +24,51 @@ class BaseFactory(Factory):
         return create_coroutine(*args, **kwargs)
 
     @classmethod
-    async def create_batch(cls, size, **kwargs) -> list[typing.Any]:
-        return [await cls.create(**kwargs) for _ in range(size)]
+    async def _create_related(
+        cls, size: int, session: AsyncSession, refresh: bool, kwargs: dict[str, typing.Any]
+    ) -> dict[str, list[typing.Any]]:
+        related = {}
+        for name, declaration in cls._meta.declarations.items():
+            if not isinstance(declaration, SubFactory) or name in kwargs:
+                continue
+
+            # `department__name="Sales"` overrides `name` of every related department.
+            prefix = f"{name}__"
+            overrides = {key.removeprefix(prefix): kwargs.pop(key) for key in list(kwargs) if key.startswith(prefix)}
+            related[name] = await declaration.get_factory().create_batch(
+                size, session=session, refresh=refresh, **{**declaration._defaults, **overrides}
+            )
+
+        return related
+
+    @classmethod
+    async def _refresh_batch(cls, session: AsyncSession, models: list[BaseModel]) -> None:
+        model_class = cls._meta.get_model_class()
+        primary_key = tuple_(*inspect(model_class).primary_key)
+        identities = [inspect(model).identity for model in models]
+        # Loading objects already in the session only fills their expired attributes, e.g. server defaults.
+        await session.execute(select(model_class).where(primary_key.in_(identities)))
+
+    @classmethod
+    async def create_batch(
+        cls, size: int, session: AsyncSession, refresh: bool = True, batch_size: int = FACTORY_BATCH_SIZE, **kwargs
+    ) -> list[typing.Any]:
+        """Create `size` objects with a flush per `batch_size` of them and one commit.
+
+        SubFactories not overridden in `kwargs` are created in bulk first, one related object per object.
+        `refresh=False` skips reloading server-generated columns, e.g. when seeding rows only queries will read.
+        """
+
+        related = await cls._create_related(size, session, refresh, kwargs)
+        models = [cls.build(**kwargs, **{name: objects[i] for name, objects in related.items()}) for i in range(size)]
+
+        for start in range(0, size, batch_size):
+            end = start + batch_size
+            batch = models[start:end]
+            session.add_all(batch)
+            await session.flush()
+            if refresh:
+                await cls._refresh_batch(session, batch)
+
+        await session.commit()
+        return models
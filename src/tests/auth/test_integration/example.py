@@ -6,12 +6,17 @@
 #
 # @pytest.mark.asyncio
 # async def test__ticket_auth__success_case(
-#     async_db_session: AsyncSession, api_client: AsyncClient, async_redis_client: AsyncRedis, auth_token: str | None
+#     async_db_session: AsyncSession,
+#     api_client: AsyncClient,
+#     async_redis_client: AsyncRedis,
+#     auth_token: str | None,
+#     max_queries: typing.Callable[..., typing.ContextManager[QueryTracker]],
 # ) -> None:
 #     example_model = await ExampleFactory(session=async_db_session, auth_token=auth_token)
 #     # some logic
 #
-#     response = await api_client.post(f"/api/v1/example/")
+#     with max_queries(3):
+#         response = await api_client.post(f"/api/v1/example/")
 #     response_data = response.json()
 #
 #     assert response.status_code == status.HTTP_200_OK
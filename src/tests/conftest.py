@@ -1,28 +1,91 @@
 import asyncio
+import functools
 import os
+import time
 import typing
 
 import alembic.command
 import pytest
 import pytest_asyncio
 from alembic.config import Config
+from alembic.script import ScriptDirectory
 from httpx import AsyncClient
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from core.config import settings
 from db import session
+from db.query_tracker import QueryTracker, track_queries
 from db.redis import AsyncRedis, get_redis, get_redis_connection
 from db.session import get_engine
 from main import app
-from tests.utils import create_database, database_exists, drop_database
+from tests.seed import seed as seed_database
+from tests.utils import (
+    TEMPLATE_LOCK_KEY,
+    assert_no_full_scans,
+    clone_database,
+    create_database,
+    database_exists,
+    database_lock,
+    drop_database,
+    get_database_revision,
+    get_worker_redis_dsn,
+    get_worker_redis_key_prefix,
+)
 
 pytestmark = pytest.mark.asyncio
 
+SESSION_STARTED_AT = pytest.StashKey[float]()
+
+# Set by pytest-xdist in its workers, e.g. "gw0", tests run in a single process otherwise.
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--recreate-template-db",
+        action="store_true",
+        help="Migrate the template test database again even if it is at the latest revision.",
+    )
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    session.config.stash[SESSION_STARTED_AT] = time.perf_counter()
+
+
+def pytest_terminal_summary(terminalreporter: typing.Any, config: pytest.Config) -> None:
+    if WORKER_ID != "master" or SESSION_STARTED_AT not in config.stash:
+        return
+
+    wall_seconds = time.perf_counter() - config.stash[SESSION_STARTED_AT]
+    # With xdist the controller holds reports of all workers, setup and teardown included.
+    reports = (report for reports in terminalreporter.stats.values() for report in reports)
+    test_seconds = sum(getattr(report, "duration", 0) for report in reports)
+    workers = getattr(config.option, "numprocesses", None) or 1
+    terminalreporter.write_sep("-", "timing")
+    terminalreporter.write_line(
+        f"{workers} worker(s): {wall_seconds:.2f}s wall, {test_seconds:.2f}s in tests, "
+        f"speedup {test_seconds / wall_seconds if wall_seconds else 0:.2f}x over running them serially"
+    )
+
 
 @pytest.fixture(scope="session")
-def mock_settings() -> None:
+def template_dsn() -> str:
+    """Migrated database the database of every worker is cloned from, kept between runs."""
+
     settings.cache_clear()
     os.environ["ENVIRONMENT"] = "test"
+    url = make_url(settings().postgres_dsn)
+    return url.set(database=f"{url.database}_template").render_as_string(hide_password=False)
+
+
+@pytest.fixture(scope="session")
+def mock_settings(template_dsn: str) -> None:
+    # Every xdist worker gets its own database and Redis key prefix, so that workers never share state.
+    os.environ["POSTGRES_DB"] = f"{settings().POSTGRES_DB}_{WORKER_ID}"
+    os.environ["REDIS_DSN"] = get_worker_redis_dsn(settings().REDIS_DSN, WORKER_ID)
+    os.environ["REDIS_KEY_PREFIX"] = get_worker_redis_key_prefix(WORKER_ID)
+    settings.cache_clear()
 
 
 @pytest.fixture(scope="session")
@@ -32,12 +95,40 @@ def event_loop() -> typing.Generator[asyncio.AbstractEventLoop, None, None]:
     loop.close()
 
 
+def get_alembic_config(dsn: str) -> Config:
+    config = Config(os.path.join(settings().BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(settings().BASE_DIR, "migrations"))
+    config.set_main_option("sqlalchemy.url", dsn)
+    return config
+
+
+async def prepare_template_database(dsn: str, recreate: bool) -> None:
+    config = get_alembic_config(dsn)
+    heads = ScriptDirectory.from_config(config).get_heads()
+
+    exists = await database_exists(dsn)
+    if exists and (recreate or await get_database_revision(dsn) not in heads):
+        await drop_database(dsn)
+        exists = False
+
+    if not exists:
+        await create_database(dsn)
+        # Alembic runs its own event loop.
+        await asyncio.to_thread(alembic.command.upgrade, config, "head")
+
+
 @pytest_asyncio.fixture(scope="session")
-async def async_db_engine(mock_settings) -> typing.AsyncGenerator[AsyncEngine, None]:
-    if await database_exists(settings().postgres_dsn):
-        await drop_database(settings().postgres_dsn)
+async def async_db_engine(
+    request: pytest.FixtureRequest, template_dsn: str, mock_settings
+) -> typing.AsyncGenerator[AsyncEngine, None]:
+    # Workers take turns, the first one migrates the template, others only clone it.
+    async with database_lock(template_dsn, TEMPLATE_LOCK_KEY):
+        await prepare_template_database(template_dsn, recreate=request.config.getoption("recreate_template_db"))
+
+        if await database_exists(settings().postgres_dsn):
+            await drop_database(settings().postgres_dsn)
 
-    await create_database(settings().postgres_dsn)
+        await clone_database(settings().postgres_dsn, template_dsn)
 
     engine = get_engine()
     await engine.dispose()
@@ -48,20 +139,12 @@ async def async_db_engine(mock_settings) -> typing.AsyncGenerator[AsyncEngine, N
     await drop_database(settings().postgres_dsn)
 
 
-@pytest.fixture(scope="session")
-def apply_migrations() -> typing.Generator[None, None, None]:
-    config = Config(os.path.join(settings().BASE_DIR, "alembic.ini"))
-    config.set_main_option("script_location", os.path.join(settings().BASE_DIR, "migrations"))
-    alembic.command.upgrade(config, "head")
-    yield
-    alembic.command.downgrade(config, "base")
-
-
 @pytest_asyncio.fixture(scope="function")
-async def async_db_session(async_db_engine: AsyncEngine, apply_migrations) -> typing.AsyncGenerator[AsyncSession, None]:
+async def async_db_session(async_db_engine: AsyncEngine) -> typing.AsyncGenerator[AsyncSession, None]:
     async with async_db_engine.connect() as conn:
         async with conn.begin() as transaction:
-            session = AsyncSession(bind=conn, expire_on_commit=False)
+            # Commits of tested code only release a SAVEPOINT, the test transaction is rolled back as a whole.
+            session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
 
             yield session
 
@@ -70,9 +153,12 @@ async def async_db_session(async_db_engine: AsyncEngine, apply_migrations) -> ty
 
 @pytest_asyncio.fixture(scope="function")
 async def async_redis_client() -> typing.AsyncGenerator[AsyncRedis, None]:
-    async with get_redis_connection() as redis:
-        yield redis
-        await redis.flushdb()
+    redis = get_redis_connection()
+    yield redis
+    # Workers beyond the number of Redis dbs share one, only keys of this worker are dropped.
+    keys = [key async for key in redis.scan_iter(f"{settings().REDIS_KEY_PREFIX}*", count=1000)]
+    if keys:
+        await redis.delete(*keys)
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -80,10 +166,40 @@ async def api_client(
     async_db_session: AsyncSession, async_redis_client: AsyncRedis
 ) -> typing.AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides[session.get_session] = lambda: async_db_session
+    app.dependency_overrides[session.get_read_session] = lambda: async_db_session
     app.dependency_overrides[get_redis] = lambda: async_redis_client
 
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
 
 
+@pytest.fixture(scope="function")
+def max_queries() -> typing.Callable[..., typing.ContextManager[QueryTracker]]:
+    """Fail the block if it runs more statements or repeats a statement shape.
+
+    Usage: `with max_queries(2): await api_client.get("/api/v1/templates")`.
+    """
+
+    return track_queries
+
+
+@pytest.fixture(scope="function")
+def assert_indexed(
+    async_db_session: AsyncSession,
+) -> typing.Callable[[QueryTracker], typing.Coroutine[typing.Any, typing.Any, None]]:
+    """Fail if a tracked statement falls back to scanning a whole table or index.
+
+    Usage: `with max_queries() as tracker: await repository.get(quarter_id=1)`, then `await assert_indexed(tracker)`.
+    """
+
+    return functools.partial(assert_no_full_scans, async_db_session)
+
+
+@pytest.fixture(scope="function")
+def seed(async_db_session: AsyncSession) -> typing.Callable[..., typing.Awaitable[dict[str, int]]]:
+    """Fill the test database with the dataset of `tests.seed`, e.g. `await seed(scale=1)` for pagination tests."""
+
+    return functools.partial(seed_database, async_db_session)
+
+
 # TODO Add db user creation where scope="session"
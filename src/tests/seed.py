@@ -0,0 +1,91 @@
+"""
+Realistic dataset for load tests and benchmarks, created in bulk by factories.
+
+Usage: cd src && python -m tests.seed --scale 10
+In tests: `counts = await seed(scale=1)` with the `seed` fixture.
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+import typing
+
+import factory
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.enums import ReviewSummaryMetricEnum
+from db.session import dispose_engines, get_engine
+from services.analytics import get_metric
+from tests.analytics.factories.review_summary import ReviewSummaryFactory
+
+# Sizes at scale 1, departments grow with the scale.
+QUARTERS, DEPARTMENTS, TEMPLATES, QUESTIONS, REVIEWERS = 4, 20, 3, 10, 5
+REVIEW_STATUSES = ("draft", "pending", "completed")
+
+Seeder: typing.TypeAlias = typing.Callable[[AsyncSession, int], typing.Awaitable[int]]
+
+SEEDERS: list[Seeder] = []
+
+
+def seeder(func: Seeder) -> Seeder:
+    """Register a function creating rows of one table for `scale` and returning their number, run in order."""
+
+    SEEDERS.append(func)
+    return func
+
+
+@seeder
+async def seed_review_summaries(session: AsyncSession, scale: int) -> int:
+    metrics = [
+        *(get_metric(ReviewSummaryMetricEnum.REVIEWS_BY_STATUS, status) for status in REVIEW_STATUSES),
+        *(get_metric(ReviewSummaryMetricEnum.ANSWERS_BY_QUESTION, question) for question in range(QUESTIONS)),
+        *(get_metric(ReviewSummaryMetricEnum.REVIEWER_LOAD, reviewer) for reviewer in range(REVIEWERS)),
+    ]
+    rows = list(itertools.product(range(QUARTERS), range(DEPARTMENTS * scale), range(TEMPLATES), metrics))
+
+    await ReviewSummaryFactory.create_batch(
+        len(rows),
+        session=session,
+        refresh=False,
+        **{
+            name: factory.Iterator(rows, getter=lambda row, index=index: row[index])
+            for index, name in enumerate(("quarter_id", "department_id", "template_id", "metric"))
+        },
+    )
+    return len(rows)
+
+
+async def seed(session: AsyncSession, scale: int = 1) -> dict[str, int]:
+    """Run every seeder, return numbers of created rows by seeder name."""
+
+    counts = {}
+    for func in SEEDERS:
+        started_at = time.perf_counter()
+        counts[func.__name__] = await func(session, scale)
+        logger.info(
+            "{} created {} rows in {:.2f}s", func.__name__, counts[func.__name__], time.perf_counter() - started_at
+        )
+
+    return counts
+
+
+async def run(scale: int) -> None:
+    try:
+        async with AsyncSession(get_engine(), expire_on_commit=False) as session:
+            await seed(session, scale)
+    finally:
+        await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier of the number of departments")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.scale))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,37 @@
-from sqlalchemy import select, text
+import contextlib
+import re
+import typing
+import urllib.parse
+
+from sqlalchemy import func, select, text
 from sqlalchemy.engine import make_url
 from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.query_tracker import QueryTracker
 from db.session import get_engine
 
+# Redis dbs of a default server, xdist workers beyond it share dbs and are told apart by key prefixes.
+REDIS_DATABASES = 16
+
+# Key of the advisory lock serializing template database setup between xdist workers.
+TEMPLATE_LOCK_KEY = 7_402_931
+
+# Index scans bounded only by a condition on the leading column of the index, others read the whole index:
+# Postgres lists conditions on any index column as Index Cond, e.g. for a predicate on a non-leading column.
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+# Statements worth planning, inserts of new rows never scan.
+EXPLAINED_STATEMENTS = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+LEADING_COLUMNS_QUERY = text(
+    "SELECT index_class.relname, attribute.attname FROM pg_index "
+    "JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid "
+    "LEFT JOIN pg_attribute AS attribute "
+    "ON attribute.attrelid = pg_index.indrelid AND attribute.attnum = pg_index.indkey[0] "
+    "WHERE index_class.relname = ANY(:names)"
+)
+
 
 async def create_database(url: str) -> None:
     url_object = make_url(url)
@@ -58,3 +85,131 @@ async def drop_database(url: str) -> None:
 
     await engine.dispose()
 
+
+async def clone_database(url: str, template_url: str) -> None:
+    """Create the database of `url` as a copy of `template_url`, nothing may be connected to the template."""
+
+    url_object = make_url(url)
+    database, template = url_object.database, make_url(template_url).database
+    url_object = url_object.set(database="postgres")
+
+    engine = get_engine(url=url_object, isolation_level="AUTOCOMMIT")
+    async with engine.begin() as conn:
+        await conn.execute(text(f'CREATE DATABASE "{database}" TEMPLATE "{template}"'))
+
+    await engine.dispose()
+
+
+async def get_database_revision(url: str) -> str | None:
+    engine = get_engine(url=url)
+    try:
+        async with engine.connect() as conn:
+            return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+
+    except ProgrammingError:
+        return None
+
+    finally:
+        await engine.dispose()
+
+
+@contextlib.asynccontextmanager
+async def database_lock(url: str, key: int) -> typing.AsyncGenerator[None, None]:
+    """Hold a session advisory lock on the server of `url`, e.g. so one xdist worker at a time sets up databases."""
+
+    engine = get_engine(url=make_url(url).set(database="postgres"), isolation_level="AUTOCOMMIT")
+    async with engine.connect() as conn:
+        await conn.execute(select(func.pg_advisory_lock(key)))
+        try:
+            yield
+        finally:
+            await conn.execute(select(func.pg_advisory_unlock(key)))
+
+    await engine.dispose()
+
+
+def get_worker_redis_dsn(dsn: str, worker_id: str) -> str:
+    """DSN of the Redis db of an xdist worker, `gw3` gets db 3 and `gw19` shares db 3 with it."""
+
+    if not worker_id.startswith("gw"):
+        return dsn
+
+    return urllib.parse.urlsplit(dsn)._replace(path=f"/{int(worker_id[2:]) % REDIS_DATABASES}").geturl()
+
+
+def get_worker_redis_key_prefix(worker_id: str) -> str:
+    """Prefix of the Redis keys of an xdist worker, so that workers sharing a db never touch each other's keys."""
+
+    return f"{worker_id}:" if worker_id.startswith("gw") else ""
+
+
+def find_index_names(plan: dict[str, typing.Any]) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for subplan in plan.get("Plans", ()):
+        names |= find_index_names(subplan)
+
+    return names
+
+
+async def get_leading_columns(session: AsyncSession, index_names: typing.Iterable[str]) -> dict[str, str | None]:
+    """First key column of each index, None for an expression."""
+
+    connection = await session.connection()
+    result = await connection.execute(LEADING_COLUMNS_QUERY, {"names": list(index_names)})
+    return {name: column for name, column in result.all()}
+
+
+def is_full_index_scan(plan: dict[str, typing.Any], leading_columns: dict[str, str | None], limited: bool) -> bool:
+    condition = plan.get("Index Cond")
+    if condition is None:
+        # Reading an index in order stops early under LIMIT, e.g. on the first page of a keyset pagination.
+        return not limited
+
+    column = leading_columns.get(plan["Index Name"])
+    return column is not None and re.search(rf"\b{re.escape(column)}\b", condition) is None
+
+
+def find_full_scans(
+    plan: dict[str, typing.Any], leading_columns: dict[str, str | None], limited: bool = False
+) -> list[str]:
+    """Nodes of `plan` reading a whole table or index, e.g. `Seq Scan on reviews`."""
+
+    node_type = plan["Node Type"]
+    scans = []
+    if node_type == "Seq Scan":
+        scans.append(f"{node_type} on {plan['Relation Name']}")
+    elif node_type in INDEX_SCANS and is_full_index_scan(plan, leading_columns, limited):
+        scans.append(f"{node_type} using {plan['Index Name']}")
+
+    for subplan in plan.get("Plans", ()):
+        scans.extend(find_full_scans(subplan, leading_columns, limited=node_type == "Limit"))
+
+    return scans
+
+
+async def explain(session: AsyncSession, statement: str, parameters: typing.Any = None) -> dict[str, typing.Any]:
+    """Plan of a statement recorded by `track_queries`, as JSON."""
+
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    return result.scalar_one()[0]["Plan"]
+
+
+async def assert_no_full_scans(session: AsyncSession, tracker: QueryTracker) -> None:
+    """Fail if any statement of `tracker` has to scan a whole table or index.
+
+    Sequential scans are disabled for the transaction, so that the planner picks an index whenever one can
+    serve the statement, whatever the size of test tables. Without a usable index it falls back to a sequential
+    scan or to reading a whole index, both fail.
+    """
+
+    connection = await session.connection()
+    await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+    for statement, parameters in zip(tracker.statements, tracker.parameters):
+        if not statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+            continue
+
+        plan = await explain(session, statement, parameters)
+        scans = find_full_scans(plan, await get_leading_columns(session, find_index_names(plan)))
+        assert not scans, f"Full scans {scans} in:\n{statement}\n{plan}"
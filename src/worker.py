@@ -0,0 +1,65 @@
+"""
+Background job worker.
+
+Usage: cd src && python worker.py --concurrency 4
+"""
+
+import argparse
+import asyncio
+import importlib
+import signal
+
+from loguru import logger
+
+from core.config import settings
+from core.diagnostics import LoopWatchdog
+from core.executor import shutdown_cpu_executor
+from db.redis import close_redis, get_redis_connection, warm_up_redis
+from db.session import dispose_engines, get_engine, warm_up_engine
+from services.jobs import JOB_HANDLERS, JobWorker
+
+# Modules defining `@job_handler` functions, imported to register them.
+HANDLER_MODULES: tuple[str, ...] = ()
+
+
+async def run(concurrency: int) -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop.set)
+
+    redis = get_redis_connection()
+    await asyncio.gather(
+        warm_up_engine(get_engine(settings().postgres_dsn), min(concurrency, settings().POSTGRES_POOL_SIZE)),
+        warm_up_redis(redis, settings().REDIS_WARMUP_CONNECTIONS),
+    )
+    logger.info("Worker started with concurrency {}, handlers: {}", concurrency, sorted(JOB_HANDLERS))
+
+    watchdog = LoopWatchdog(loop, settings().DIAGNOSTICS_SLOW_CALLBACK_SECONDS)
+    if settings().DIAGNOSTICS_ENABLED:
+        watchdog.start()
+
+    try:
+        await JobWorker(redis, concurrency).run(stop)
+    finally:
+        watchdog.stop()
+        shutdown_cpu_executor()
+        await dispose_engines()
+        await close_redis()
+
+    logger.info("Worker stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=settings().JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()